@@ -1,6 +1,280 @@
 import pygame
 import os
+from collections import OrderedDict
 from config import Config as C
+from atlas import Atlas
+from scalecache import ScaleCache
+from loader import AssetLoader
+
+class FrameCache:
+    """
+    A process-wide, reference-counted cache of animation frames.
+
+    Frames are keyed by (base_path, state, width, height), so every Animation
+    that plays the same state at the same size shares one list of surfaces.
+    Entries stay resident when their reference count drops to zero, so
+    short-lived sprites (sparks, enemies) never reload from disk; call purge()
+    to drop unreferenced entries explicitly.
+
+    Each entry also holds the horizontally mirrored frames, built lazily the
+    first time a left-facing frame is requested and shared from then on.
+
+    With placeholders enabled (headless runs) no image is decoded: every
+    state gets blank frames of the right size and count, so animation
+    timing and rect sizes match a normal run.
+    """
+    # Class attribute to store all cached frame sets
+    entries = {}
+    placeholders = False
+
+    @classmethod
+    def acquire(cls, base_path, state, width, height):
+        """
+        Get the frames for an animation state, loading them on first use.
+
+        Args:
+            base_path: Path to animation folder
+            state: Name of the animation state (sub-folder)
+            width: Target frame width
+            height: Target frame height
+
+        Returns:
+            list: Shared list of scaled frames (do not modify)
+        """
+        key = (base_path, state, width, height)
+        entry = cls.entries.get(key)
+        if entry is None:
+            frames = cls.__load_frames(base_path, state, width, height)
+            entry = {'frames': frames,
+                     'mirrored': [None] * len(frames),
+                     'refs': 0}
+            cls.entries[key] = entry
+        entry['refs'] += 1
+        return entry['frames']
+
+    @classmethod
+    def mirrored(cls, base_path, state, width, height):
+        """
+        Get the shared list of mirrored frames for an animation state.
+
+        The list is filled lazily by get_mirrored_frame(); unbuilt frames are None.
+        """
+        return cls.entries[(base_path, state, width, height)]['mirrored']
+
+    @staticmethod
+    def get_mirrored_frame(frames, mirrored, index):
+        """Get a horizontally flipped frame, flipping it only on first request"""
+        frame = mirrored[index]
+        if frame is None:
+            frame = pygame.transform.flip(frames[index], True, False)
+            mirrored[index] = frame
+        return frame
+
+    @classmethod
+    def preload(cls, base_path, state, width, height):
+        """
+        Load a frame set and its mirrored frames without taking a reference.
+
+        Used to warm the cache ahead of the first spawn of an entity.
+        """
+        frames = cls.acquire(base_path, state, width, height)
+        cls.release(base_path, state, width, height)
+        mirrored = cls.mirrored(base_path, state, width, height)
+        for index in range(len(frames)):
+            cls.get_mirrored_frame(frames, mirrored, index)
+
+    @classmethod
+    def is_resident(cls, base_path, state, width, height):
+        """Check if a frame set is already loaded"""
+        return (base_path, state, width, height) in cls.entries
+
+    @classmethod
+    def release(cls, base_path, state, width, height):
+        """Drop one reference to a cached frame set."""
+        entry = cls.entries.get((base_path, state, width, height))
+        if entry is not None and entry['refs'] > 0:
+            entry['refs'] -= 1
+
+    @classmethod
+    def purge(cls):
+        """Remove every cached frame set that is no longer referenced."""
+        for key in [key for key, entry in cls.entries.items() if entry['refs'] <= 0]:
+            del cls.entries[key]
+
+    @classmethod
+    def clear(cls):
+        """Remove all cached frame sets, referenced or not."""
+        cls.entries.clear()
+
+    @staticmethod
+    def __default_frame(width, height):
+        """Red semi-transparent frame used when a state has no frames"""
+        default_frame = pygame.Surface((width, height), pygame.SRCALPHA)
+        default_frame.fill((255, 0, 0, 128))  # Red semi-transparent default for visibility
+        return default_frame
+
+    @staticmethod
+    def __frame_sources(base_path, state):
+        """
+        Find the files the frames of one animation state are made from.
+
+        The state's folder is only listed when the atlas does not pack it.
+
+        Returns:
+            tuple: (frame count, PNG frame files, scale cache sources); no PNG files if the state is packed
+        """
+        frame_count = Atlas.frame_count(base_path, state)
+        if frame_count:
+            # Packed frames are sliced from the atlas, so cached frames depend on the atlas files
+            return frame_count, [], Atlas.source_files(base_path, state)
+
+        path = os.path.join(base_path, state)
+        try:
+            files = [os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith('.png')]
+        except FileNotFoundError:
+            files = []
+        return len(files), files, files
+
+    @classmethod
+    def image_files(cls, base_path, state, width, height):
+        """
+        Get the image files loading a frame set would decode.
+
+        Args:
+            base_path: Path to animation folder
+            state: Name of the animation state
+            width: Target frame width
+            height: Target frame height
+
+        Returns:
+            list: The state's PNG frames or atlas pages, empty if the frames are resident or in the scale cache
+        """
+        if cls.is_resident(base_path, state, width, height):
+            return []
+        _, files, sources = cls.__frame_sources(base_path, state)
+        if not sources or ScaleCache.is_valid(base_path, state, width, height, sources):
+            return []
+        return files or Atlas.page_files(base_path, state)
+
+    @classmethod
+    def __load_frames(cls, base_path, state, width, height):
+        """
+        Load and scale all frames of one animation state.
+
+        Frames come from the on-disk scale cache when it is still valid,
+        otherwise from the texture atlas if packed, else from the state's folder.
+        """
+        path = os.path.join(base_path, state)
+        frame_count, files, sources = cls.__frame_sources(base_path, state)
+
+        if cls.placeholders:
+            return [pygame.Surface((width, height), pygame.SRCALPHA)] * max(frame_count, 1)
+
+        if sources:
+            frames = ScaleCache.load(base_path, state, width, height, sources)
+            if frames:
+                return frames
+
+        atlas_frames = Atlas.get_frames(base_path, state) if frame_count and not files else None
+        if atlas_frames:
+            frames = [pygame.transform.scale(frame, (width, height)) for frame in atlas_frames]
+        else:
+            frames = []
+            for file in files:
+                try:
+                    img = AssetLoader.load_image(file)
+                    img = pygame.transform.scale(img, (width, height))
+                    frames.append(img)
+                except pygame.error:
+                    print(f"Error loading animation frame: {file} in {state}")
+                    continue
+
+        # Create default frame if no frames were loaded
+        if not frames:
+            if not os.path.isdir(path):
+                print(f"Animation folder not found: {path}")
+            else:
+                print(f"No frames found for animation state: {state} in {path}")
+            return [cls.__default_frame(width, height)]
+
+        if sources and len(frames) == frame_count:
+            ScaleCache.store(base_path, state, width, height, sources, frames)
+        return frames
+
+class RotationCache:
+    """
+    A least-recently-used cache of rotated animation frames.
+
+    Angles are quantized into buckets of ANGLE_STEP degrees, so each
+    (frame, angle bucket) pair is rotated once and reused afterwards.
+    The cache is bounded by the total pixel memory of its surfaces.
+    """
+    ANGLE_STEP = 5  # Degrees per angle bucket
+    MAX_BYTES = 48 * 1024 * 1024  # Memory bound for all cached surfaces
+
+    # Class attributes to store cached surfaces and their total size
+    entries = OrderedDict()
+    total_bytes = 0
+
+    @classmethod
+    def configure(cls, angle_step=None, max_bytes=None):
+        """
+        Change the angular resolution or memory bound, clearing the cache.
+
+        Args:
+            angle_step: Degrees per angle bucket, dividing 360 so the buckets wrap evenly
+            max_bytes: Maximum total size of cached surfaces in bytes
+        """
+        if angle_step is not None:
+            if angle_step <= 0 or 360 % angle_step:
+                raise ValueError(f"Angle step must divide 360 degrees: {angle_step}")
+            cls.ANGLE_STEP = angle_step
+        if max_bytes is not None:
+            cls.MAX_BYTES = max_bytes
+        cls.clear()
+
+    @classmethod
+    def clear(cls):
+        """Remove all cached rotated frames."""
+        cls.entries.clear()
+        cls.total_bytes = 0
+
+    @classmethod
+    def get(cls, frame_key, frame, angle):
+        """
+        Get a rotated copy of a frame, rotating it only on a cache miss.
+
+        Args:
+            frame_key: Hashable key identifying the unrotated frame
+            frame: The unrotated frame surface
+            angle: Rotation in degrees (counter-clockwise, as pygame.transform.rotate)
+
+        Returns:
+            Surface: The frame rotated to the nearest angle bucket
+        """
+        bucket = round((angle % 360) / cls.ANGLE_STEP) % round(360 / cls.ANGLE_STEP)
+        key = (frame_key, bucket)
+
+        rotated = cls.entries.get(key)
+        if rotated is not None:
+            cls.entries.move_to_end(key)
+            return rotated
+
+        rotated = pygame.transform.rotate(frame, bucket * cls.ANGLE_STEP)
+        cls.entries[key] = rotated
+        cls.total_bytes += cls.__size_of(rotated)
+
+        # Evict least recently used frames until we are within budget
+        while cls.total_bytes > cls.MAX_BYTES and len(cls.entries) > 1:
+            _, evicted = cls.entries.popitem(last=False)
+            cls.total_bytes -= cls.__size_of(evicted)
+
+        return rotated
+
+    @staticmethod
+    def __size_of(surface):
+        """Pixel memory used by a surface in bytes"""
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
 
 class Animation:
     def __init__(self, sprite_owner, base_path, states, animation_speed=0.1):
@@ -19,45 +293,49 @@ class Animation:
         
         # Animation state handling
         self.animations = {}  # Stores animation frames for each state
+        self.mirrored_animations = {}  # Lazily mirrored frames for each state
         self.animation_loops = states  # Which animations should loop
         self.current_state = list(states.keys())[0]  # Default to first state
         self.current_frame = 0
         self.animation_timer = 0
         self.animation_speed = animation_speed
         self.animation_finished = False
+        self.__released = False
         
         # Load all animations
         self.__load_animations()
     
-    def __load_animations(self):
-        """Load all animation frames from their respective folders"""
+    def __getstate__(self):
+        """State for pickling: the playback position and frame size, without the shared frames"""
+        state = self.__dict__.copy()
+        state['animations'] = {}
+        state['mirrored_animations'] = {}
+        state['size'] = (self.owner.width, self.owner.height)
+        return state
+
+    def __setstate__(self, state):
+        """Restore a pickled animation, taking its frames from the shared frame cache again"""
+        state = state.copy()
+        width, height = state.pop('size')
+        self.__dict__.update(state)
+        if not self.__released:
+            self.__load_animations(width, height)
+
+    def __load_animations(self, width=None, height=None):
+        """Get all animation frames from the shared frame cache (at the owner's size by default)"""
+        width = width if width is not None else self.owner.width
+        height = height if height is not None else self.owner.height
         for state in self.animation_loops.keys():
-            self.animations[state] = []
-            path = os.path.join(self.base_path, state)
+            self.animations[state] = FrameCache.acquire(self.base_path, state, width, height)
+            self.mirrored_animations[state] = FrameCache.mirrored(self.base_path, state, width, height)
             
-            try:
-                files = sorted([f for f in os.listdir(path) if f.endswith('.png')])
-                for file in files:
-                    try:
-                        img = pygame.image.load(os.path.join(path, file)).convert_alpha()
-                        img = pygame.transform.scale(img, (self.owner.width, self.owner.height))
-                        self.animations[state].append(img)
-                    except pygame.error:
-                        print(f"Error loading animation frame: {file} in {state}")
-                        continue
-                        
-                # Create default frame if no frames were loaded
-                if not self.animations[state]:
-                    print(f"No frames found for animation state: {state} in {path}")
-                    default_frame = pygame.Surface((self.owner.width, self.owner.height), pygame.SRCALPHA)
-                    default_frame.fill((255, 0, 0, 128))  # Red semi-transparent default for visibility
-                    self.animations[state].append(default_frame)
-                    
-            except FileNotFoundError:
-                print(f"Animation folder not found: {path}")
-                default_frame = pygame.Surface((self.owner.width, self.owner.height), pygame.SRCALPHA)
-                default_frame.fill((255, 0, 0, 128))  # Red semi-transparent default for visibility
-                self.animations[state].append(default_frame)
+    def release(self):
+        """Release this animation's references to the shared frame cache"""
+        if self.__released:
+            return
+        self.__released = True
+        for state in self.animations.keys():
+            FrameCache.release(self.base_path, state, self.owner.width, self.owner.height)
     
     def change_state(self, new_state):
         """Change animation state and reset frame counter"""
@@ -92,7 +370,15 @@ class Animation:
     
     def get_current_frame(self, facing_right=True):
         """Get current animation frame with proper facing direction"""
-        frame = self.animations[self.current_state][self.current_frame]
         if not facing_right:
-            frame = pygame.transform.flip(frame, True, False)
-        return frame
\ No newline at end of file
+            return FrameCache.get_mirrored_frame(self.animations[self.current_state],
+                                                 self.mirrored_animations[self.current_state],
+                                                 self.current_frame)
+        return self.animations[self.current_state][self.current_frame]
+
+    def get_rotated_frame(self, angle, facing_right=True):
+        """Get current animation frame rotated by angle degrees, using the rotation cache"""
+        frame = self.get_current_frame(facing_right)
+        frame_key = (self.base_path, self.current_state, self.owner.width, self.owner.height,
+                     facing_right, self.current_frame)
+        return RotationCache.get(frame_key, frame, angle)
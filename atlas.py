@@ -0,0 +1,255 @@
+import pygame
+import os
+import json
+from loader import AssetLoader
+
+class Atlas:
+    """
+    Packed texture atlas for the sprites/ tree.
+
+    The offline builder (build() or `python atlas.py`) packs every animation
+    state folder (sprites/<entity>/<state>/*.png) into a few large atlas pages
+    plus a JSON index. At runtime each page is decoded the first time one of
+    its frames is needed and animation frames are sliced from it as
+    subsurfaces, so frame sets served by the scale cache never decode a page.
+    The index gives the frames of every packed state, so loading one never
+    lists its folder or decodes its PNG frames.
+    """
+    SPRITES_DIR = "sprites"
+    OUTPUT_DIR = os.path.join("sprites", "atlas")
+    INDEX_FILE = "atlas.json"
+    PAGE_SIZE = 2048  # Width and height of each atlas page in pixels
+    PADDING = 1       # Transparent gap between packed frames
+    VERSION = 1
+
+    # Class attributes to store the loaded index, its folder and the decoded pages by number
+    index = None
+    index_dir = None
+    pages = {}
+
+    @staticmethod
+    def normalize_path(path):
+        """Normalize a sprite folder path so it can be used as an index key"""
+        return os.path.normpath(path).replace("\\", "/")
+
+    @classmethod
+    def load_index(cls, output_dir=None):
+        """
+        Load the atlas index without decoding any page.
+
+        Args:
+            output_dir: Folder containing the atlas pages and index
+
+        Returns:
+            bool: True if an atlas index is available, False otherwise
+        """
+        if cls.index is not None:
+            return True
+
+        output_dir = output_dir or cls.OUTPUT_DIR
+        index_path = os.path.join(output_dir, cls.INDEX_FILE)
+        if not os.path.exists(index_path):
+            return False
+
+        try:
+            with open(index_path, 'r') as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError) as e:
+            print(f"Error loading texture atlas: {e}")
+            return False
+        if index.get('version') != cls.VERSION:
+            print(f"Ignoring atlas with unsupported version: {index_path}")
+            return False
+
+        cls.index = index
+        cls.index_dir = output_dir
+        return True
+
+    @classmethod
+    def __page(cls, page):
+        """Get a decoded atlas page, decoding it on first use"""
+        surface = cls.pages.get(page)
+        if surface is None:
+            surface = AssetLoader.load_image(os.path.join(cls.index_dir, cls.index['pages'][page]))
+            cls.pages[page] = surface
+        return surface
+
+    @classmethod
+    def unload(cls):
+        """Forget the loaded index and pages."""
+        cls.index = None
+        cls.index_dir = None
+        cls.pages = {}
+
+    @classmethod
+    def frame_count(cls, base_path, state):
+        """
+        Get the number of frames the atlas packs for an animation state, without decoding any page.
+
+        Returns:
+            int: Number of packed frames, 0 if the state is not packed
+        """
+        if not cls.load_index():
+            return 0
+        return len(cls.index['animations'].get(cls.normalize_path(base_path), {}).get(state, []))
+
+    @classmethod
+    def page_files(cls, base_path, state):
+        """
+        Get the paths of the atlas pages holding the frames of an animation state, without decoding them.
+
+        Args:
+            base_path: Path to animation folder
+            state: Name of the animation state
+
+        Returns:
+            list: Page file paths, empty if the state is not packed
+        """
+        if not cls.load_index():
+            return []
+
+        rects = cls.index['animations'].get(cls.normalize_path(base_path), {}).get(state, [])
+        pages = sorted({page for page, _, _, _, _ in rects})
+        return [os.path.join(cls.index_dir, cls.index['pages'][page]) for page in pages]
+
+    @classmethod
+    def source_files(cls, base_path, state):
+        """
+        Get the files the atlas frames of an animation state are read from.
+
+        Returns:
+            list: The index file and the pages holding the state's frames, empty if the state is not packed
+        """
+        page_files = cls.page_files(base_path, state)
+        if not page_files:
+            return []
+        return [os.path.join(cls.index_dir, cls.INDEX_FILE)] + page_files
+
+    @classmethod
+    def get_frames(cls, base_path, state):
+        """
+        Get the unscaled frames of an animation state from the atlas.
+
+        Args:
+            base_path: Path to animation folder (e.g., 'sprites/player')
+            state: Name of the animation state
+
+        Returns:
+            list: Subsurfaces of the atlas pages, or None if the state is not packed
+        """
+        if not cls.load_index():
+            return None
+
+        states = cls.index['animations'].get(cls.normalize_path(base_path))
+        if states is None or state not in states:
+            return None
+
+        try:
+            return [cls.__page(page).subsurface((x, y, w, h))
+                    for page, x, y, w, h in states[state]]
+        except (OSError, IndexError, pygame.error) as e:
+            print(f"Error loading texture atlas: {e}")
+            return None
+
+    @classmethod
+    def find_animation_folders(cls, sprites_dir=None):
+        """
+        Find every animation state folder below the sprites directory.
+
+        A folder is an animation state if it contains PNG frames and sits at
+        least two levels below sprites_dir (sprites/<entity>/<state>), which
+        leaves out loose images such as the backgrounds in sprites/others.
+
+        Returns:
+            list: (base_path, state, [frame file paths]) tuples
+        """
+        sprites_dir = sprites_dir or cls.SPRITES_DIR
+        output_dir = cls.normalize_path(cls.OUTPUT_DIR)
+        folders = []
+
+        for root, dirs, files in os.walk(sprites_dir):
+            dirs.sort()
+            if cls.normalize_path(root).startswith(output_dir):
+                continue
+            relative = os.path.relpath(root, sprites_dir)
+            if relative == '.' or len(cls.normalize_path(relative).split('/')) < 2:
+                continue
+
+            frames = sorted(f for f in files if f.endswith('.png'))
+            if frames:
+                folders.append((cls.normalize_path(os.path.dirname(root)),
+                                os.path.basename(root),
+                                [os.path.join(root, f) for f in frames]))
+        return folders
+
+    @classmethod
+    def build(cls, sprites_dir=None, output_dir=None):
+        """
+        Pack all animation frames into atlas pages and write the index.
+
+        Frames are packed with a simple shelf algorithm, tallest first.
+
+        Returns:
+            dict: The written index
+        """
+        sprites_dir = sprites_dir or cls.SPRITES_DIR
+        output_dir = output_dir or cls.OUTPUT_DIR
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Decode every frame once
+        images = []
+        for base_path, state, files in cls.find_animation_folders(sprites_dir):
+            for order, file in enumerate(files):
+                image = pygame.image.load(file)
+                if image.get_width() > cls.PAGE_SIZE or image.get_height() > cls.PAGE_SIZE:
+                    print(f"Frame too large for atlas, skipping: {file}")
+                    continue
+                images.append((base_path, state, order, image))
+
+        # Shelf packing, tallest frames first
+        placements = []
+        page, x, y, shelf_height = 0, 0, 0, 0
+        for base_path, state, order, image in sorted(images, key=lambda i: -i[3].get_height()):
+            w, h = image.get_size()
+            if x + w > cls.PAGE_SIZE:
+                x, y = 0, y + shelf_height + cls.PADDING
+                shelf_height = 0
+            if y + h > cls.PAGE_SIZE:
+                page, x, y, shelf_height = page + 1, 0, 0, 0
+            placements.append((base_path, state, order, image, page, x, y))
+            x += w + cls.PADDING
+            shelf_height = max(shelf_height, h)
+
+        # Draw the pages
+        page_surfaces = [pygame.Surface((cls.PAGE_SIZE, cls.PAGE_SIZE), pygame.SRCALPHA)
+                         for _ in range(page + 1 if placements else 0)]
+        animations = {}
+        for base_path, state, order, image, page, x, y in placements:
+            page_surfaces[page].blit(image, (x, y))
+            animations.setdefault(base_path, {}).setdefault(state, []).append(
+                (order, [page, x, y, image.get_width(), image.get_height()]))
+
+        # Sort frames of each state back into file order
+        for states in animations.values():
+            for state, frames in states.items():
+                states[state] = [rect for _, rect in sorted(frames)]
+
+        page_names = []
+        for i, surface in enumerate(page_surfaces):
+            name = f"atlas{i}.png"
+            pygame.image.save(surface, os.path.join(output_dir, name))
+            page_names.append(name)
+
+        index = {'version': cls.VERSION,
+                 'pages': page_names,
+                 'animations': animations}
+        with open(os.path.join(output_dir, cls.INDEX_FILE), 'w') as index_file:
+            json.dump(index, index_file)
+
+        cls.unload()
+        return index
+
+if __name__ == "__main__":
+    index = Atlas.build()
+    frame_count = sum(len(frames) for states in index['animations'].values() for frames in states.values())
+    print(f"Packed {frame_count} frames into {len(index['pages'])} atlas page(s) in {Atlas.OUTPUT_DIR}")
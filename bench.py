@@ -0,0 +1,329 @@
+import argparse
+import subprocess
+import sys
+import time
+
+# Import-time budget for `python game.py`, measured with `python -X importtime`.
+# The budget covers the game's own modules; pygame is reported separately
+# because its import cost is outside our control.
+IMPORT_BUDGET_MS = 150
+DEFERRED_MODULES = ('pandas', 'matplotlib', 'seaborn', 'tkinter')
+
+# Headless simulation must run at least this many times faster than real time
+SIMULATION_MIN_SPEEDUP = 10
+
+# Projectile physics for this many live projectiles must fit in a 60 Hz frame
+PROJECTILE_COUNT = 5000
+PROJECTILE_FRAME_BUDGET_MS = 1000 / 60
+
+# Python heap used per live projectile (surface pixels are allocated by SDL and not counted)
+PROJECTILE_MEMORY_BUDGET = 900
+
+# Restoring a late-game world snapshot must be this fast
+SNAPSHOT_RESTORE_BUDGET_MS = 20
+
+# Collision checks with the most bullets may cost at most this many times those with the fewest
+COLLISION_BULLET_COUNTS = (250, 1000, 4000)
+COLLISION_MAX_GROWTH = 2
+
+def bench_imports(args):
+    """Measure the import time of the game module and check it against the budget
+
+    Returns:
+        bool: True if the budget is met and no deferred module was imported
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import game'],
+                            capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        print(result.stderr)
+        return False
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        cumulative[name] = max(cumulative.get(name, 0), int(cumulative_us))
+
+    game_ms = cumulative.get('game', 0) / 1000
+    pygame_ms = cumulative.get('pygame', 0) / 1000
+    own_ms = game_ms - pygame_ms
+    deferred = sorted({name.split('.')[0] for name in cumulative} & set(DEFERRED_MODULES))
+
+    print(f"python -c 'import game' wall time : {wall_ms:8.1f} ms")
+    print(f"import game (cumulative)          : {game_ms:8.1f} ms")
+    print(f"  of which pygame                 : {pygame_ms:8.1f} ms")
+    print(f"  game modules                    : {own_ms:8.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    if deferred:
+        print(f"Deferred modules imported at startup: {', '.join(deferred)}")
+
+    return own_ms <= IMPORT_BUDGET_MS and not deferred
+
+def bench_simulation(args):
+    """Run the game logic headless and report simulation steps per second
+
+    Returns:
+        bool: True if the simulation runs at least SIMULATION_MIN_SPEEDUP times real time
+    """
+    from game import Game
+    from config import Config as C
+
+    ticks_per_second = Game(headless=True, seed=args.seed).run_headless(args.ticks, snapshot=args.snapshot)
+    return ticks_per_second >= C.FPS * SIMULATION_MIN_SPEEDUP
+
+def bench_phases(args):
+    """Run the game logic headless with phase timing and report the cost of each phase
+
+    Phases named with --skip are not run.
+
+    Returns:
+        bool: True if every phase that was not skipped ran on every playing step
+    """
+    from game import Game
+
+    game = Game(headless=True, seed=args.seed)
+    for name in args.skip:
+        game.pipeline.skip(name)
+    game.pipeline.timing = True
+    game.run_headless(args.ticks, snapshot=args.snapshot)
+
+    report = game.pipeline.report()
+    runs = max(runs for _, runs in report.values())
+    for name, (average_us, phase_runs) in report.items():
+        state = "skipped" if name in game.pipeline.skipped else f"{average_us:8.1f} us/step"
+        print(f"  {name:<10}: {state}")
+    return all(phase_runs == runs for name, (_, phase_runs) in report.items() if name not in game.pipeline.skipped)
+
+def bench_timers(args):
+    """Compare the per-frame cost of Timer.update_all with and without many idle timers
+
+    Idle timers (paused, finished, or owned by objects that are gone) must not
+    make a frame noticeably slower.
+
+    Returns:
+        bool: True if 10000 idle timers cost less than twice the baseline frame time
+    """
+    from timer import Timer
+
+    class Owner:
+        pass
+
+    def frame_time(frames=2000):
+        start = time.perf_counter()
+        for _ in range(frames):
+            Timer.update_all(1 / 60)
+        return (time.perf_counter() - start) / frames * 1e6
+
+    # A steady set of running timers, like a busy round
+    owner = Owner()
+    active = [Timer(duration=0.05 * (i % 20 + 1), owner=owner, auto_reset=True) for i in range(100)]
+    baseline = frame_time()
+
+    # Timers left behind by thousands of dead enemies
+    idle = [Timer(duration=1.0, owner=owner, paused=True) for _ in range(5000)]
+    for _ in range(5000):
+        Timer(duration=1.0, owner=Owner())
+    loaded = frame_time()
+
+    print(f"update_all with {len(active)} running timers : {baseline:8.1f} us/frame")
+    print(f"  plus {len(idle)} paused and 5000 orphaned   : {loaded:8.1f} us/frame")
+    print(f"  timers still registered              : {len(Timer.all_timers)}")
+    return loaded < baseline * 2
+
+def bench_projectiles(args):
+    """Time Projectile.update_all with thousands of live projectiles (drawing off)
+
+    Returns:
+        bool: True if a frame of PROJECTILE_COUNT projectiles fits in PROJECTILE_FRAME_BUDGET_MS
+    """
+    import random
+    from pygame.math import Vector2
+    from config import Config as C
+    from projectile import Projectile, Ball, Laser
+
+    Projectile.drawing = False
+    rng = random.Random(0)
+
+    def spawn():
+        position = Vector2(rng.uniform(0, C.WINDOW_WIDTH), rng.uniform(0, C.WINDOW_HEIGHT / 2))
+        velocity = Vector2(rng.uniform(-8, 8), rng.uniform(-8, 8))
+        if rng.random() < 0.25:
+            Laser.spawn(position=position, velocity=velocity, bounce_limit=3)
+        else:
+            Ball.spawn(position=position, velocity=velocity)
+
+    for _ in range(PROJECTILE_COUNT):
+        spawn()
+
+    # Keep the volume steady by respawning whatever left the screen
+    frames = 600
+    elapsed = 0
+    for _ in range(frames):
+        start = time.perf_counter()
+        Projectile.update_all()
+        elapsed += time.perf_counter() - start
+        for _ in range(PROJECTILE_COUNT - Projectile.store.count):
+            spawn()
+    frame_ms = elapsed / frames * 1000
+    Projectile.clear_all()
+
+    print(f"update_all with {PROJECTILE_COUNT} projectiles : {frame_ms:8.2f} ms/frame "
+          f"(budget {PROJECTILE_FRAME_BUDGET_MS:.2f} ms)")
+    for name, (hits, misses, pooled) in Projectile.pool_stats().items():
+        print(f"  {name:<6} pool: {hits} hits, {misses} misses, {pooled} pooled")
+    return frame_ms <= PROJECTILE_FRAME_BUDGET_MS
+
+def bench_memory(args):
+    """Measure the Python memory held per live projectile with tracemalloc
+
+    Returns:
+        bool: True if a projectile takes at most PROJECTILE_MEMORY_BUDGET bytes
+    """
+    import gc
+    import tracemalloc
+    from pygame.math import Vector2
+    from projectile import Projectile, Ball, Shard, Laser
+
+    Projectile.drawing = False
+    count = 5000
+    passed = True
+    for projectile_type in (Ball, Shard, Laser):
+        projectile_type.spawn(position=Vector2(0, 0), velocity=Vector2(1, 0)).kill()  # Warm up the store and imports
+        Projectile.clear_pools()
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        projectiles = [projectile_type(position=Vector2(i % 1280, 100), velocity=Vector2(1, 0), attack_name='Bench')
+                       for i in range(count)]
+        per_projectile = (tracemalloc.get_traced_memory()[0] - before) / count
+        tracemalloc.stop()
+
+        for projectile in projectiles:
+            projectile.kill()
+        Projectile.clear_pools()
+        print(f"{projectile_type.__name__:<6} : {per_projectile:8.0f} bytes/projectile "
+              f"(budget {PROJECTILE_MEMORY_BUDGET})")
+        passed = passed and per_projectile <= PROJECTILE_MEMORY_BUDGET
+    return passed
+
+def bench_collisions(args):
+    """Time the collision phase as far-away bullets pile up around a fixed set of colliders
+
+    Enemies stand on the floor next to the deflecting player while hostile
+    and deflected bullets fill the upper part of the screen, out of reach.
+    The spatial hashes of the two collision layers the checks query are
+    rebuilt once per physics step and timed separately.
+
+    Returns:
+        bool: True if the cost grows at most COLLISION_MAX_GROWTH times from the fewest bullets to the most
+    """
+    import random
+    from pygame.math import Vector2
+    from game import Game
+    from config import Config as C
+    from projectile import Projectile, Ball
+
+    game = Game(headless=True, seed=args.seed)
+    game.warmup.run()
+    game.game_state = Game.STATE_PLAYING
+    game.setup_game()
+    for _ in range(5):
+        game.spawn_enemy()
+    floor = C.WINDOW_HEIGHT - C.FLOOR_HEIGHT - 50
+    for index, enemy in enumerate(game.groups['enemies']):
+        enemy.position = Vector2(100 + index * 200, floor)
+        enemy.previous_position = Vector2(enemy.position)
+    game.player.position = Vector2(C.WINDOW_WIDTH - 100, floor)
+    game.player.previous_position = Vector2(game.player.position)
+    game.player.knife.active = True
+    rng = random.Random(args.seed)
+
+    costs = []
+    for count in COLLISION_BULLET_COUNTS:
+        Projectile.clear_all()
+        game.groups['bullets'].empty()
+        for index in range(count):
+            position = Vector2(rng.uniform(0, C.WINDOW_WIDTH), rng.uniform(0, C.WINDOW_HEIGHT / 3))
+            Ball.spawn(position=position, velocity=Vector2(0, 0), game=game, deflected=index % 2 == 0)
+        frames = 200
+        start = time.perf_counter()
+        for _ in range(frames):
+            Projectile.store.version += 1  # As after a physics step
+            Projectile.refresh_grid()
+        rebuild = (time.perf_counter() - start) / frames * 1e6
+        start = time.perf_counter()
+        for _ in range(frames):
+            game.update_collisions()
+        costs.append((time.perf_counter() - start) / frames * 1e6)
+        print(f"{count:>5} bullets: collision phase {costs[-1]:8.1f} us/step, "
+              f"spatial hash rebuild (physics phase) {rebuild:8.1f} us/step")
+    Projectile.clear_all()
+    return costs[-1] <= costs[0] * COLLISION_MAX_GROWTH
+
+def bench_snapshot(args):
+    """Play headless for DIFFICULTY_PEAK_TIME, then time capturing and restoring the busiest world seen
+
+    Returns:
+        bool: True if a restore takes at most SNAPSHOT_RESTORE_BUDGET_MS
+    """
+    from game import Game
+    from config import Config as C
+    from snapshot import WorldSnapshot
+
+    game = Game(headless=True, seed=args.seed)
+    game.warmup.run()
+    game.game_state = Game.STATE_PLAYING
+    game.setup_game()
+    busiest, load = None, -1
+    for tick in range(1, Game.DIFFICULTY_PEAK_TIME * C.FPS + 1):
+        game.update(1 / C.FPS)
+        if tick % C.FPS == 0 and len(game.groups['all']) > load:
+            busiest, load = WorldSnapshot.capture(game), len(game.groups['all'])
+    busiest.restore(game)
+
+    runs = 50
+    start = time.perf_counter()
+    for _ in range(runs):
+        snapshot = WorldSnapshot.capture(game)
+    capture_ms = (time.perf_counter() - start) / runs * 1000
+    start = time.perf_counter()
+    for _ in range(runs):
+        snapshot.restore(game)
+    restore_ms = (time.perf_counter() - start) / runs * 1000
+
+    print(f"world: {len(game.groups['enemies'])} enemies, {len(game.groups['bullets'])} projectiles, "
+          f"{len(snapshot.data)} bytes")
+    print(f"capture : {capture_ms:8.2f} ms")
+    print(f"restore : {restore_ms:8.2f} ms (budget {SNAPSHOT_RESTORE_BUDGET_MS} ms)")
+    return restore_ms <= SNAPSHOT_RESTORE_BUDGET_MS
+
+BENCHMARKS = {
+    'imports': bench_imports,
+    'simulation': bench_simulation,
+    'phases': bench_phases,
+    'timers': bench_timers,
+    'projectiles': bench_projectiles,
+    'memory': bench_memory,
+    'collisions': bench_collisions,
+    'snapshot': bench_snapshot,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deflect performance benchmarks")
+    parser.add_argument('benchmark', choices=list(BENCHMARKS.keys()) + ['all'])
+    parser.add_argument('--ticks', type=int, default=18000, help="Simulation steps for the simulation benchmarks")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the simulation benchmarks, so runs are comparable")
+    parser.add_argument('--skip', nargs='*', default=[], help="Pipeline phases to skip in the phases benchmark")
+    parser.add_argument('--snapshot', metavar='FILE', help="World snapshot the simulation benchmarks start from")
+    args = parser.parse_args()
+
+    names = BENCHMARKS.keys() if args.benchmark == 'all' else [args.benchmark]
+    passed = True
+    for name in names:
+        print(f"== {name} ==")
+        passed = BENCHMARKS[name](args) and passed
+    sys.exit(0 if passed else 1)
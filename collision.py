@@ -0,0 +1,98 @@
+import numpy as np
+from projectile import Projectile
+
+class CollisionStage:
+    """
+    Batched swept circle tests between projectiles and the colliders of one relation.
+
+    gather() takes the projectiles near a set of collider circles, searching
+    only the spatial hashes of the collision layers the colliders collide
+    with, so pairs that can never collide are never visited. test() puts
+    their paths and the circles into arrays and tests every pair in one
+    NumPy broadcast. The hits come back as one list per collider, in spawn
+    order, for the colliders' handlers (Knife.deflect_bullet,
+    Player.take_damage, Enemy.take_damage) to consume.
+
+    Tests are continuous: a projectile touches a collider if the segment it
+    moved along in the last step, taken relative to the collider's own
+    movement, passes within the collider's radius. Fast projectiles and
+    colliders cannot pass through each other between two steps.
+
+    A collider is a (center, radius, previous_center) circle, previous_center
+    being where the collider was at the previous collision phase (None if it
+    does not move).
+    """
+    @staticmethod
+    def gather(circles, layers):
+        """
+        Get the live projectiles of some collision layers that may have touched some circles.
+
+        Args:
+            circles: (center, radius, previous_center) of each collider; colliders with a None center are skipped
+            layers: Mask of the layers the colliders collide with (Projectile.LAYER_* bits)
+
+        Returns:
+            list: The projectiles, in spawn order
+        """
+        # Widen each circle by how far its collider moved
+        circles = [(center, radius + (center - previous).length() if previous is not None else radius)
+                   for center, radius, previous in circles if center is not None]
+        if not circles:
+            return []
+        return Projectile.near(circles, layers)
+
+    @staticmethod
+    def test(circles, candidates, inclusive=False):
+        """
+        Test the paths of projectiles in the last step against collider circles.
+
+        Args:
+            circles: (center, radius, previous_center) of each collider; a None center touches nothing
+            candidates: Projectiles from gather(); ones killed since are skipped
+            inclusive: Count projectiles passing exactly on a circle as touching it
+
+        Returns:
+            list: For each collider, the list of projectiles touching it, in the order of candidates
+        """
+        hits = [[] for _ in circles]
+        candidates = [projectile for projectile in candidates if projectile.alive()]
+        if not candidates or not circles:
+            return hits
+
+        store = Projectile.store
+        slots = np.fromiter((projectile.slot for projectile in candidates), dtype=np.intp, count=len(candidates))
+        ends = store.pos[slots]
+        starts = store.prev[slots]
+        centers = np.full((len(circles), 2), np.nan)
+        previous_centers = np.full((len(circles), 2), np.nan)
+        for index, (center, _, previous) in enumerate(circles):
+            if center is not None:
+                centers[index] = (center[0], center[1])
+                previous_centers[index] = (previous[0], previous[1]) if previous is not None else centers[index]
+        radii = np.array([radius for _, radius, _ in circles], dtype=np.float64)
+
+        # Path of every projectile relative to every collider, from (ax, ay) to (bx, by)
+        ax = starts[None, :, 0] - previous_centers[:, 0, None]
+        ay = starts[None, :, 1] - previous_centers[:, 1, None]
+        bx = ends[None, :, 0] - centers[:, 0, None]
+        by = ends[None, :, 1] - centers[:, 1, None]
+
+        # Squared distance from each path's closest point to its collider; NaN centers never compare true
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+        t = np.divide(-(ax * dx + ay * dy), length_sq, out=np.zeros_like(length_sq), where=length_sq > 0)
+        np.clip(t, 0, 1, out=t)
+        cx, cy = ax + t * dx, ay + t * dy
+        distances_sq = cx * cx + cy * cy
+        limits_sq = (radii * radii)[:, None]
+        mask = distances_sq <= limits_sq if inclusive else distances_sq < limits_sq
+
+        colliders, indices = np.nonzero(mask)
+        for collider, index in zip(colliders.tolist(), indices.tolist()):
+            hits[collider].append(candidates[index])
+        return hits
+
+    @classmethod
+    def hits(cls, circles, layers, inclusive=False):
+        """gather() then test(): the projectiles of some layers touching each collider"""
+        return cls.test(circles, cls.gather(circles, layers), inclusive)
@@ -3,7 +3,9 @@ class Config:
     # Window Settings
     WINDOW_WIDTH = 1280
     WINDOW_HEIGHT = 720
-    FPS = 60
+    FPS = 60              # Simulation steps per second (fixed timestep)
+    RENDER_FPS = 60       # Display frame rate cap, 0 for uncapped
+    MAX_FRAME_STEPS = 5   # Most simulation steps run to catch up in one displayed frame
 
     # Colors
     BACKGROUND_COLOR = (12, 12, 15)
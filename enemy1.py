@@ -1,6 +1,19 @@
 from enemy_all import *
 
 class Wizard(Enemy):
+    SIZE = (100, 100)
+    ANIMATION = {
+        'path': 'sprites/enemies/e1',
+        'loops': {
+            "idle": True,
+            "move": True,
+            "attack": False,
+            "hurt": False,
+            "death": False
+        },
+        'speed': 0.2
+    }
+
     # Attack properties
     ATTACK_INFO = {
         'radial': {'speed': 8, 'speed_mul': 1, 'delay': 5/60, 'damage': 25},
@@ -10,21 +23,9 @@ class Wizard(Enemy):
     }
     
     def __init__(self, x, y, game):
-        loops = {
-            "idle": True,
-            "move": True,
-            "attack": False,
-            "hurt": False,
-            "death": False
-        }
-
-        anim_info = {'path':'sprites/enemies/e1',
-                'loops': loops,
-                'speed': 0.2}
-
-        super().__init__(x, y, game, width=100, 
-                         height=100, gravity=0.0, movespeed=0.1, 
-                         maxhp=40, anim=anim_info, name='Wizard')
+        super().__init__(x, y, game, width=self.SIZE[0], 
+                         height=self.SIZE[1], gravity=0.0, movespeed=0.1, 
+                         maxhp=40, anim=self.ANIMATION, name='Wizard')
 
         # Movement attributes
         self.start_pos = Vector2(x, y)
@@ -78,12 +79,12 @@ class Wizard(Enemy):
             for angle in range(0, 360, inerval_deg):
                 rad_angle = math.radians(angle + offset_deg)
                 velocity = Vector2(math.cos(rad_angle), math.sin(rad_angle)) * pr['speed']
-                Ball(position=copy.deepcopy(self.position), 
-                       velocity=velocity, 
-                       game=self.game,
-                       damage=self.ATTACK_INFO['radial']['damage'],
-                       speed_multiplier=pr['speed_mul'],
-                       attack_name='Wizard Radial-Cast')
+                Ball.spawn(position=copy.deepcopy(self.position), 
+                           velocity=velocity, 
+                           game=self.game,
+                           damage=self.ATTACK_INFO['radial']['damage'],
+                           speed_multiplier=pr['speed_mul'],
+                           attack_name='Wizard Radial-Cast')
 
         # First layer
         if self.attack_phase == 0:
@@ -118,12 +119,12 @@ class Wizard(Enemy):
             spread = self.random((-pb['spread'], pb['spread']))
             angle = math.radians(base_angle + spread)
             velocity = Vector2(math.cos(angle), math.sin(angle)) * pb['speed']
-            Ball(position=copy.deepcopy(self.position), 
-                   velocity=velocity, 
-                   game=self.game,
-                   damage=self.ATTACK_INFO['burst']['damage'],
-                   speed_multiplier=pb['speed_mul'],
-                   attack_name='Wizard Burst-Cast ')
+            Ball.spawn(position=copy.deepcopy(self.position), 
+                       velocity=velocity, 
+                       game=self.game,
+                       damage=self.ATTACK_INFO['burst']['damage'],
+                       speed_multiplier=pb['speed_mul'],
+                       attack_name='Wizard Burst-Cast ')
         
         self.shots_fired += 1
         self._attack_timer.start(pb['delay'])
@@ -145,12 +146,12 @@ class Wizard(Enemy):
         if to_target.length() > 0:
             direction = to_target.normalize()
             velocity = direction * pf['speed']
-            Ball(position=copy.deepcopy(self.position), 
-                   velocity=velocity, 
-                   game=self.game,
-                   damage=self.ATTACK_INFO['follow']['damage'],
-                   speed_multiplier=pf['speed_mul'],
-                   attack_name='Wizard Track-Cast')
+            Ball.spawn(position=copy.deepcopy(self.position), 
+                       velocity=velocity, 
+                       game=self.game,
+                       damage=self.ATTACK_INFO['follow']['damage'],
+                       speed_multiplier=pf['speed_mul'],
+                       attack_name='Wizard Track-Cast')
         
         self.shots_fired += 1
         self._attack_timer.start(pf['delay'])
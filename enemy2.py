@@ -1,6 +1,28 @@
 from enemy_all import *
 
 class Fencer(Enemy):
+    ANIMATION = {
+        'path': 'sprites/enemies/e2',
+        'loops': {
+            "idle": True,
+            "move": True,
+            "hurt": False,
+            "death": False,
+            "dash": False,
+            "attack2": False,
+            "attack1": False
+        },
+        'speed': 0.2
+    }
+    WEAPON_ANIMATION = {
+        'path': 'sprites/enemies/e2_slash',
+        'loops': {
+            "charge": False,
+            "slash": False
+        },
+        'speed': 0.1
+    }
+
     # Constants
     MAX_DISTANCE = 400   # Maximum allowed distance from player
     
@@ -12,19 +34,8 @@ class Fencer(Enemy):
     }
     
     def __init__(self, x, y, game):
-        loops = {
-            "idle": True,
-            "move": True,
-            "hurt": False,
-            "death": False,
-            "dash": False,
-            "attack2": False,
-            "attack1": False
-        }
-        anim_info = {'path': 'sprites/enemies/e2', 
-                     'loops': loops,
-                     'speed': 0.2}
-        super().__init__(x, y, game, maxhp=40, anim=anim_info, name='Fencer')
+        super().__init__(x, y, game, width=self.SIZE[0], height=self.SIZE[1],
+                         maxhp=40, anim=self.ANIMATION, name='Fencer')
         
         # Override base attributes
         self.MOVE_SPEED = (0.0, 3.0)
@@ -36,10 +47,9 @@ class Fencer(Enemy):
         self._init_timers()
                 
         # Weapon sprite
-        self.weapon_anim = Animation(self, "sprites/enemies/e2_slash", {
-            "charge": False,
-            "slash": False
-        }, animation_speed=0.1)
+        self.weapon_anim = Animation(self, self.WEAPON_ANIMATION['path'],
+                                     self.WEAPON_ANIMATION['loops'],
+                                     animation_speed=self.WEAPON_ANIMATION['speed'])
         self.weapon_active = False
         
         # Attack state tracking
@@ -51,6 +61,15 @@ class Fencer(Enemy):
         # Start in waiting state
         self._start_waiting()
         
+    @classmethod
+    def animation_specs(cls):
+        weapon = cls.WEAPON_ANIMATION
+        return super().animation_specs() + [(weapon['path'], weapon['loops'], cls.SIZE[0], cls.SIZE[1])]
+
+    def kill(self):
+        self.weapon_anim.release()
+        super().kill()
+
     def __start_attack(self, target):
         if abs(target.position.x - self.position.x) < self.MAX_DISTANCE:
             self.current_attack = self.random((self.__dash_attack, self.__shard_attack), choice=True)
@@ -153,12 +172,12 @@ class Fencer(Enemy):
             )
             
             # Initialize with zero velocity
-            shard = Shard(position=spawn_pos, 
-                          velocity=Vector2(0, 0), 
-                          game=self.game,
-                          damage=self.ATTACK_INFO['shard']['damage'],
-                          attack_name='Fencer Forward-Shards')
-            self.shards.append(shard)
+            shard = Shard.spawn(position=spawn_pos, 
+                                velocity=Vector2(0, 0), 
+                                game=self.game,
+                                damage=self.ATTACK_INFO['shard']['damage'],
+                                attack_name='Fencer Forward-Shards')
+            self.shards.append((shard, shard.serial))
         
         self._anim.change_state("attack1")
         self.velocity.x = 0
@@ -171,7 +190,10 @@ class Fencer(Enemy):
         if self._attack_timer.just_completed:
             # Launch all shards
             Sounds().play_sound('e2_shards_push')
-            for shard in self.shards:
+            for shard, serial in self.shards:
+                # Skip shards killed before launch (their object may be a recycled projectile by now)
+                if shard.serial != serial or not shard.alive():
+                    continue
                 to_target = (target.position - shard.position).normalize()
                 angle = math.degrees(math.atan2(to_target.y, to_target.x))
                 final_angle = math.radians(angle)
@@ -214,12 +236,12 @@ class Fencer(Enemy):
         if self._attack_timer.just_completed and self.rain_index < self.ATTACK_INFO['rain']['count']:
             spawn_pos = self.rain_positions[self.rain_index]
             
-            Shard(position=spawn_pos, 
-                 velocity=Vector2(0, -4), 
-                 game=self.game,
-                 damage=self.ATTACK_INFO['rain']['damage'],
-                 gravity=0.3,
-                 attack_name='Fencer Raining-Shards')
+            Shard.spawn(position=spawn_pos, 
+                        velocity=Vector2(0, -4), 
+                        game=self.game,
+                        damage=self.ATTACK_INFO['rain']['damage'],
+                        gravity=0.3,
+                        attack_name='Fencer Raining-Shards')
             
             self.rain_index += 1
             Sounds().play_sound_random(['e2_shards_spawn1','e2_shards_spawn2'])
@@ -305,8 +327,8 @@ class Fencer(Enemy):
         for _ in range(self.ATTACK_INFO['shard']['count']):
             angle_rad = math.radians(self.random((0.0, 360.0)))
             velocity = Vector2(math.cos(angle_rad), math.sin(angle_rad)) * self.random((15.0, 25.0))
-            Shard(position=midpoint + Vector2(0, -0), 
-                 velocity=velocity, 
-                 game=self.game,
-                 damage=self.ATTACK_INFO['shard']['damage'], 
-                 deflected=True)
+            Shard.spawn(position=midpoint + Vector2(0, -0), 
+                        velocity=velocity, 
+                        game=self.game,
+                        damage=self.ATTACK_INFO['shard']['damage'], 
+                        deflected=True)
@@ -1,6 +1,19 @@
 from enemy_all import *
 
 class Gunman(Enemy):
+    SIZE = (100, 100)
+    ANIMATION = {
+        'path': 'sprites/enemies/e3',
+        'loops': {
+            "idle": True,
+            "aim": True,
+            "attack": False,
+            "hurt": False,
+            "death": False
+        },
+        'speed': 0.2
+    }
+
     # Movement constants
     TARGET_DISTANCE = (300, 500)
     DISTANCE_TOLERANCE = 75
@@ -46,24 +59,9 @@ class Gunman(Enemy):
     }
     
     def __init__(self, x, y, game):
-        # Animation setup
-        loops = {
-            "idle": True,
-            "aim": True,
-            "attack": False,
-            "hurt": False,
-            "death": False
-        }
-
-        anim_info = {
-            'path': 'sprites/enemies/e3',
-            'loops': loops,
-            'speed': 0.2
-        }
-
-        super().__init__(x, y, game, width=100, 
-                         height=100, gravity=0.0, movespeed=self.random((0.5, 2.0)), 
-                         maxhp=40, anim=anim_info, name='Gunman')
+        super().__init__(x, y, game, width=self.SIZE[0], 
+                         height=self.SIZE[1], gravity=0.0, movespeed=game.rng.stream(RNG.AI).uniform(0.5, 2.0), 
+                         maxhp=40, anim=self.ANIMATION, name='Gunman')
 
         # Movement attributes
         self.target_dst = self.random(self.TARGET_DISTANCE)
@@ -175,15 +173,15 @@ class Gunman(Enemy):
         gun_position = Vector2(self.position.x + (self.width/2 if self.facing_right else -self.width/2), 
                              self.position.y)
 
-        Laser(position=gun_position, 
-              velocity=direction * bomb_info['initial_speed'],
-              game=self.game,
-              damage=bomb_info['initial_damage'], 
-              radius=bomb_info['initial_size'],
-              speed_multiplier=bomb_info['speed_mul'],
-              laser_type='bomb',
-              bomb_info=bomb_info,
-              attack_name='Gunman Exploding-Laser')
+        Laser.spawn(position=gun_position, 
+                    velocity=direction * bomb_info['initial_speed'],
+                    game=self.game,
+                    damage=bomb_info['initial_damage'], 
+                    radius=bomb_info['initial_size'],
+                    speed_multiplier=bomb_info['speed_mul'],
+                    laser_type='bomb',
+                    bomb_info=bomb_info,
+                    attack_name='Gunman Exploding-Laser')
 
         self.shots_fired = 1
         Sounds().play_sound_random(['e3_shoot1', 'e3_shoot2'])
@@ -205,15 +203,15 @@ class Gunman(Enemy):
         gun_position = Vector2(self.position.x + (self.width/2 if self.facing_right else -self.width/2), 
                              self.position.y)
         Sounds().play_sound_random(['e3_shoot1', 'e3_shoot2'])
-        Laser(position=gun_position, 
-              velocity=direction * self.random(homing_info['speed']),
-              game=self.game,
-              damage=homing_info['damage'], 
-              radius=homing_info['size'], 
-              laser_type='homing', 
-              target=target,
-              turn_rate=self.random(homing_info['turn_rate']),
-              attack_name='Gunman Homing-Laser')
+        Laser.spawn(position=gun_position, 
+                    velocity=direction * self.random(homing_info['speed']),
+                    game=self.game,
+                    damage=homing_info['damage'], 
+                    radius=homing_info['size'], 
+                    laser_type='homing', 
+                    target=target,
+                    turn_rate=self.random(homing_info['turn_rate']),
+                    attack_name='Gunman Homing-Laser')
         
         self.shots_fired += 1
         self._attack_timer.start(homing_info['delay'])
@@ -233,13 +231,13 @@ class Gunman(Enemy):
             gun_position = Vector2(self.position.x - self.width/2, self.position.y)
             
         bounce_info = self.ATTACK_INFO['bounce']
-        Laser(position=gun_position, 
-              velocity=direction * bounce_info['speed'], 
-              game=self.game,
-              damage=bounce_info['damage'], 
-              radius=bounce_info['size'], 
-              bounce_limit=bounce_info['bounce_limit'],
-              attack_name='Gunman Bouncing-Laser')
+        Laser.spawn(position=gun_position, 
+                    velocity=direction * bounce_info['speed'], 
+                    game=self.game,
+                    damage=bounce_info['damage'], 
+                    radius=bounce_info['size'], 
+                    bounce_limit=bounce_info['bounce_limit'],
+                    attack_name='Gunman Bouncing-Laser')
 
         self.shots_fired = 1
         Sounds().play_sound_random(['e3_shoot1', 'e3_shoot2'])
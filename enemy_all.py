@@ -2,30 +2,34 @@ import pygame
 from pygame.math import Vector2
 from config import Config as C
 from projectile import *
+from collision import CollisionStage
+from events import CollisionEvents
 from animation import Animation
 from timer import Timer
-from datetime import datetime
 from stats import Stats
 from sounds import Sounds
 from player import Player
 from knife import Spark
+from rng import RNG
 import copy
 import math
 
-import random
 
 class Enemy(pygame.sprite.Sprite):
+    SIZE = (100, 100)
+    ANIMATION = {"path": "", "loops": {}, "speed": 0.2}
     MOVE_DURATION = (1.0, 3.0)  
     WAIT_DURATION = (1.0, 3.0)
     HURT_DURATION = 1/6
     KNOCKBACK_DECAY = 0.95
+    COLLISION_MASK = Projectile.LAYER_DEFLECTED  # Hit by bullets deflected by the knife
     
     def __init__(self, x, y, game, anim={"path":"", "loops": {}, "speed": 0.2}, 
                  width=100, height=100, maxhp=100, movespeed=3, 
                  gravity=0.8, maxfallspeed=15, bodydamage=30, name=''):
         super().__init__()
         self.__tag = {'name': name,
-                      'spawn_time': datetime.now()}
+                      'spawn_time': Timer.clock}  # Simulation time, so lifespans are reproducible
 
         # Basic attributes
         self.width = width
@@ -35,6 +39,7 @@ class Enemy(pygame.sprite.Sprite):
         
         # Physics attributes
         self.position = Vector2(x, y)
+        self.previous_position = Vector2(x, y)  # Position at the last collision phase
         self.velocity = Vector2(0, 0)
         self.on_ground = False
         
@@ -74,14 +79,18 @@ class Enemy(pygame.sprite.Sprite):
         self.image = self._anim.get_current_frame(self.facing_right)
         self.rect = pygame.Rect(x, y, self.width, self.height)
 
+    @classmethod
+    def animation_specs(cls):
+        """Animations of this enemy type as (base_path, states, width, height) tuples"""
+        return [(cls.ANIMATION['path'], cls.ANIMATION['loops'], cls.SIZE[0], cls.SIZE[1])]
+
     @property
     def name(self):
         return self.__tag['name']
     
     @property
     def lifespan(self):
-        difference = datetime.now() - self.__tag['spawn_time']
-        return difference.total_seconds()
+        return Timer.clock - self.__tag['spawn_time']
 
     def _init_timers(self, move_duration=None, wait_duration=None, attack_duration=0):
         """Initialize common timers with appropriate durations"""
@@ -104,21 +113,21 @@ class Enemy(pygame.sprite.Sprite):
         self._move_timer.start(move_dur)
         self._anim.change_state("move")
     
-    @staticmethod
-    def random(values:tuple, choice=False):
+    def random(self, values:tuple, choice=False):
+        """Random int/float in the range of values, or one of values with choice=True, from the game's AI stream"""
+        rng = self.game.rng.stream(RNG.AI)
         if not choice:
             if isinstance(values[0], int):
-                return random.randint(values[0], values[1])
-            return random.uniform(values[0], values[1])
+                return rng.randint(values[0], values[1])
+            return rng.uniform(values[0], values[1])
         else:
-            return random.choice(values)
+            return rng.choice(values)
 
     def _update_animation(self):
         self._anim.update()
         self.image = self._anim.get_current_frame(self.facing_right)
 
     def take_damage(self, amount):
-        Sounds().play_sound_random(['enemy_damaged1', 'enemy_damaged2'])
         self.health -= amount
         self.game.freeze_and_shake(0, 5, 5)
         if self.is_alive:
@@ -153,22 +162,40 @@ class Enemy(pygame.sprite.Sprite):
         
         self.rect.center = self.position
     
-    def __check_projectile_collisions(self):
-        for bullet in self.game.groups['bullets']:
-            if bullet.is_deflected:
-                distance = (bullet.position - self.position).length()
-                if distance < self.width/2:
-                    self.take_damage(bullet.damage)
-                    self.start_knockback(bullet.velocity, bullet.speed * 0.1)
-                    
-                    # If the bullet has a deflect_id, record the damage for this deflection batch
-                    if hasattr(bullet, '_Projectile__tag') and 'deflect_id' in bullet._Projectile__tag:
-                        deflect_id = bullet._Projectile__tag['deflect_id']
-                        # Find player knife to add damage to deflection batch
-                        if self.game and self.game.player and self.game.player.knife:
-                            self.game.player.knife.record_deflected_damage(deflect_id, bullet.damage)
-                    
-                    bullet.kill()
+    @staticmethod
+    def check_projectile_collisions(enemies):
+        """
+        Let a group of enemies get hit by deflected bullets, testing them all in one batch.
+
+        Args:
+            enemies: The enemies, processed in order
+        """
+        pending = [enemy for enemy in enemies if enemy.is_alive]
+        while pending:
+            store_version = Projectile.store.version
+            circles = [(enemy.position, enemy.width/2, enemy.previous_position) for enemy in pending]
+            hits = CollisionStage.hits(circles, Enemy.COLLISION_MASK)
+            for index, (enemy, bullets) in enumerate(zip(pending, hits)):
+                for bullet in bullets:
+                    if bullet.alive():  # Not already taken by an earlier enemy
+                        enemy.__on_projectile_hit(bullet)
+
+                # Bullets spawned by a hit (exploding lasers) can still hit the remaining enemies
+                if Projectile.store.version != store_version:
+                    pending = pending[index + 1:]
+                    break
+            else:
+                pending = None
+
+        for enemy in enemies:
+            enemy.previous_position = Vector2(enemy.position)
+
+    def __on_projectile_hit(self, bullet):
+        """Take a deflected bullet's damage and knockback; its deflection batch is credited by the hit event"""
+        self.take_damage(bullet.damage)
+        self.start_knockback(bullet.velocity, bullet.speed * 0.1)
+        self.game.collision_events.emit(CollisionEvents.ENEMY_HIT, bullet.deflect_id, bullet.damage)
+        bullet.kill()
 
     def start_knockback(self, direction, amount):
         if direction.length() > 0:
@@ -189,10 +216,15 @@ class Enemy(pygame.sprite.Sprite):
                 self.is_knocked_back = False
     
     def update(self):
+        """Update the enemy through every phase (the game runs the phases separately)"""
+        self.update_ai()
+        self.update_physics()
+        self.update_collisions()
+        self.update_animation()
+
+    def update_ai(self):
+        """AI phase: recover from hurt and run the attack/movement logic"""
         if not self.is_alive:
-            self._update_animation()
-            if self._anim.current_state == "death" and self._anim.animation_finished:
-                self.kill()
             return
             
         if self.is_hurt and self.__hurt_timer.is_completed:
@@ -201,11 +233,24 @@ class Enemy(pygame.sprite.Sprite):
         
         if self.target and not self.is_hurt:
             self._ai_logic(self.target)
-        
+
+    def update_physics(self):
+        """Physics phase: apply knockback, gravity and velocity"""
+        if not self.is_alive:
+            return
         self.__update_knockback()
         self.__apply_physics()
-        self.__check_projectile_collisions()
+
+    def update_collisions(self):
+        """Collision phase: get hit by deflected bullets"""
+        Enemy.check_projectile_collisions([self])
+
+    def update_animation(self):
+        """Animation phase: advance the animation and remove the enemy once its death animation ends"""
+        dying = not self.is_alive
         self._update_animation()
+        if dying and self._anim.current_state == "death" and self._anim.animation_finished:
+            self.kill()
 
     def kill(self):
         self.game.add_score(200)
@@ -213,4 +258,6 @@ class Enemy(pygame.sprite.Sprite):
         Stats().record(stat_type='enemy_lifespan',
                      enemy_type=self.name,
                      lifespan_sec=self.lifespan)
+        self._anim.release()
+        Timer.remove_owner_timers(self)
         super().kill()
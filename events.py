@@ -0,0 +1,47 @@
+class CollisionEvents:
+    """
+    A per-step buffer of collision events.
+
+    Collision checks only decide what touched what: everything else a hit
+    causes (stats rows, sounds, camera shake, score, deflection batch
+    damage, dodge bookkeeping) is emitted as a compact (kind, source, amount) event and
+    applied by the consumers subscribed to its kind when dispatch() drains
+    the buffer after the collision phase.
+    """
+    # Event kinds, with what source and amount hold
+    DEFLECT = 0       # The knife deflected a bullet: attack id, bullet damage
+    PLAYER_HIT = 1    # The player was hit: attack name, damage recorded
+    ENEMY_HIT = 2     # An enemy was hit by a deflected bullet: deflect id (or None), bullet damage
+    DODGE = 3         # The dodge evaded a bullet or an enemy: the bullet or enemy, damage evaded
+    PLAYER_DAMAGED = 4  # A hit took the player's health (not one absorbed by invincibility): attack name, damage taken
+
+    def __init__(self):
+        self.events = []            # (kind, source, amount) emitted since the last dispatch()
+        self.__consumers = {}       # Kind -> functions called with (kind, source, amount)
+
+    def subscribe(self, consumer, *kinds):
+        """
+        Have a function consume events of some kinds.
+
+        Args:
+            consumer: Called with (kind, source, amount) for each event, in emission order
+            *kinds: Event kinds to consume
+        """
+        for kind in kinds:
+            self.__consumers.setdefault(kind, []).append(consumer)
+
+    def emit(self, kind, source, amount):
+        """Buffer an event until the next dispatch()"""
+        self.events.append((kind, source, amount))
+
+    def dispatch(self):
+        """Hand every buffered event to its consumers, in emission order, and empty the buffer"""
+        events, self.events = self.events, []
+        consumers = self.__consumers
+        for event in events:
+            for consumer in consumers.get(event[0], ()):
+                consumer(*event)
+
+    def clear(self):
+        """Drop buffered events without consuming them"""
+        self.events.clear()
@@ -0,0 +1,163 @@
+import pygame
+from collections import OrderedDict
+
+class Fonts:
+    """
+    Process-wide registry of loaded fonts and rendered text.
+
+    Each (path, size) font is opened once. Rendered text surfaces are kept in
+    a bounded LRU cache keyed by font, text and color, so screens that draw
+    the same strings every frame (titles, buttons, overlays) render them once.
+    """
+    MAX_RENDERED = 256  # Maximum number of rendered text surfaces kept
+
+    # Class attributes to store loaded fonts, rendered text surfaces and glyph atlases
+    fonts = {}
+    rendered = OrderedDict()
+    glyph_atlases = {}
+
+    @classmethod
+    def get(cls, path, size):
+        """
+        Get a font, loading it on first use.
+
+        Args:
+            path: Font file path, or None for the default font
+            size: Font size in points
+
+        Returns:
+            Font: The shared font (falls back to the default font if the file cannot be loaded)
+        """
+        key = (path, size)
+        font = cls.fonts.get(key)
+        if font is None:
+            try:
+                font = pygame.font.Font(path, size)
+            except (FileNotFoundError, OSError, pygame.error):
+                font = pygame.font.Font(None, size)
+            cls.fonts[key] = font
+        return font
+
+    @classmethod
+    def render(cls, path, size, text, color, antialias=True):
+        """
+        Render text, reusing the surface if the same text was rendered before.
+
+        Args:
+            path: Font file path, or None for the default font
+            size: Font size in points
+            text: The string to render
+            color: Text color as an RGB sequence
+            antialias: Whether to antialias the text
+
+        Returns:
+            Surface: Shared rendered text surface (do not modify)
+        """
+        color = tuple(int(c) for c in color)
+        key = (path, size, text, color, antialias)
+
+        surface = cls.rendered.get(key)
+        if surface is not None:
+            cls.rendered.move_to_end(key)
+            return surface
+
+        surface = cls.get(path, size).render(text, antialias, color)
+        cls.rendered[key] = surface
+        if len(cls.rendered) > cls.MAX_RENDERED:
+            cls.rendered.popitem(last=False)
+        return surface
+
+    @classmethod
+    def glyph_atlas(cls, path, size, color, labels=()):
+        """
+        Get a shared glyph atlas of digits, colon and the given labels.
+
+        Args:
+            path: Font file path, or None for the default font
+            size: Font size in points
+            color: Text color as an RGB sequence
+            labels: Whole strings (e.g. "SCORE ") to pack as single glyphs
+
+        Returns:
+            GlyphAtlas: The atlas, built on first request
+        """
+        color = tuple(int(c) for c in color)
+        key = (path, size, color, tuple(labels))
+        atlas = cls.glyph_atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(cls.get(path, size), color, GlyphAtlas.CHARACTERS, labels)
+            cls.glyph_atlases[key] = atlas
+        return atlas
+
+    @classmethod
+    def clear(cls):
+        """Forget every loaded font, rendered surface and glyph atlas."""
+        cls.fonts.clear()
+        cls.rendered.clear()
+        cls.glyph_atlases.clear()
+
+class GlyphAtlas:
+    """
+    Pre-rendered glyphs packed side by side in one surface.
+
+    Text made only of known glyphs is composed by blitting regions of the
+    atlas, so a changing counter never calls font.render() again. Labels are
+    packed as whole strings to keep their kerning.
+    """
+    CHARACTERS = "0123456789:"
+    PADDING = 2  # Gap between glyphs in the atlas
+
+    def __init__(self, font, color, characters, labels=()):
+        """
+        Args:
+            font: The font to render glyphs with
+            color: Text color
+            characters: Single characters to pack
+            labels: Whole strings to pack as single glyphs
+        """
+        self.height = font.get_height()
+        self.__glyphs = {}  # Glyph text -> (area in atlas, advance)
+
+        glyphs = [(text, font.render(text, True, color)) for text in list(characters) + list(labels) if text]
+        width = sum(surface.get_width() + self.PADDING for _, surface in glyphs)
+        self.surface = pygame.Surface((max(width, 1), self.height), pygame.SRCALPHA)
+
+        x = 0
+        for text, surface in glyphs:
+            self.surface.blit(surface, (x, 0))
+            # Single characters advance by their metrics so digits line up like rendered text
+            metrics = font.metrics(text) if len(text) == 1 else None
+            advance = metrics[0][4] if metrics and metrics[0] else surface.get_width()
+            self.__glyphs[text] = (pygame.Rect(x, 0, surface.get_width(), surface.get_height()), advance)
+            x += surface.get_width() + self.PADDING
+
+    def supports(self, tokens):
+        """Check if every token has a glyph in the atlas"""
+        return all(token in self.__glyphs for token in tokens)
+
+    def measure(self, tokens):
+        """
+        Returns:
+            int: Width of the composed tokens in pixels
+        """
+        if not tokens:
+            return 0
+        width = sum(self.__glyphs[token][1] for token in tokens[:-1])
+        return width + self.__glyphs[tokens[-1]][0].width
+
+    def draw(self, target, position, tokens):
+        """
+        Compose tokens onto a surface.
+
+        Args:
+            target: Surface to draw on
+            position: Top-left corner of the text
+            tokens: Glyph names in order (labels or single characters)
+        """
+        x, y = position
+        blits = []
+        for token in tokens:
+            area, advance = self.__glyphs[token]
+            blits.append((self.surface, (x, y), area))
+            x += advance
+        target.blits(blits, doreturn=False)
@@ -7,15 +7,25 @@ from enemy2 import Fencer
 from enemy3 import Gunman
 from ui import HealthBar, Button, TextDisplay
 from pygame.math import Vector2
-import random
 from timer import Timer
 import sys
 from stats import Stats
-import tkinter as tk
-from tkinter import ttk, font
-import pandas as pd
 from sounds import Sounds
+from loader import AssetLoader
+from warmup import Warmup
+from knife import Knife, Spark
+from fonts import Fonts
+from inputs import InputState, AutoInput, InputRecording, ReplayInput
+from animation import FrameCache
+from projectile import Projectile
+from pipeline import Pipeline
+from events import CollisionEvents
+from rng import RNG
+from snapshot import WorldSnapshot
 from datetime import datetime, timedelta
+import argparse
+import time
+import os
 
 class Game:
     # Game States
@@ -30,16 +40,65 @@ class Game:
     FINAL_SPAWN_RANGE = (2.0, 4.0) # Seconds
     DIFFICULTY_PEAK_TIME = 120 # Seconds
     
-    def __init__(self):
-        pg.init()
-        self.screen = pg.display.set_mode((C.WINDOW_WIDTH, C.WINDOW_HEIGHT))
-        pg.display.set_caption("Deflect")
+    HEALTHBAR_SIZE = (1000 * 0.3, 300 * 0.3)
+    
+    def __init__(self, headless=False, seed=None, record_dir=None):
+        """
+        Args:
+            headless: Run the game logic only - no window, mixer, drawing,
+                stats files or images; the player is driven by AutoInput
+            seed: Seed of the game's random streams, or None for a random one
+            record_dir: Directory to save an input recording of every session to, or None
+        """
+        self.headless = headless
+        
+        # Input recording of the current session
+        self.record_dir = record_dir
+        self.recording = None
+        
+        # Random streams; every session gets its own, derived from the game's seed
+        self.seed = seed if seed is not None else RNG.new_seed()
+        self.session_number = 0
+        self.rng = RNG(self.seed)
+        if headless:
+            # Blank frames of the right size stand in for sprites and nothing is drawn or played
+            FrameCache.placeholders = True
+            Projectile.drawing = False
+            Sounds.enabled = False
+            Stats.enabled = False
+            self.screen = None
+            self.input = AutoInput(self)
+        else:
+            pg.init()
+            self.screen = pg.display.set_mode((C.WINDOW_WIDTH, C.WINDOW_HEIGHT))
+            pg.display.set_caption("Deflect")
+            self.input = InputState()
         self.clock = pg.time.Clock()
         self.running = True
+        self.sessions = 0
+        
+        # Fixed timestep: unsimulated time and where rendering sits between two steps
+        self.accumulator = 0.0
+        self.interpolation = 1.0
+        self.previous_centers = {}
         
-        # Load background images
-        self.bg_game = pg.image.load("sprites/others/background.png").convert()
-        self.bg_controls = pg.image.load("sprites/others/controls.png").convert()
+        # Entity animations are warmed one archetype per menu frame
+        self.warmup = Warmup({
+            'player': Player.animation_specs(),
+            'wizard': Wizard.animation_specs(),
+            'fencer': Fencer.animation_specs(),
+            'gunman': Gunman.animation_specs(),
+            'spark': Spark.animation_specs(),
+            'hud': HealthBar.animation_specs(*Game.HEALTHBAR_SIZE)
+        })
+        
+        if not headless:
+            # Decode images and sounds on worker threads behind a loading screen
+            self.load_assets()
+            
+            # Load background images
+            self.bg_game = AssetLoader.load_image("sprites/others/background.png", alpha=False)
+            self.bg_controls = AssetLoader.load_image("sprites/others/controls.png", alpha=False)
         
         # Music : management
         self.current_music = None
@@ -81,9 +140,90 @@ class Game:
         self.stats_button = None
         self.stats_data = {}
         
-        self.setup_home_menu()
-        self.play_menu_music()
+        # Collision events and their consumers, drained after the collision phase
+        self.hard_attack_ids = frozenset(Projectile.attack_id_of(name) for name in Knife.HARD_ATTACKS)
+        self.collision_events = CollisionEvents()
+        self.collision_events.subscribe(self.__score_collision, CollisionEvents.DEFLECT)
+        self.collision_events.subscribe(self.__play_collision_sound, CollisionEvents.DEFLECT, CollisionEvents.ENEMY_HIT,
+                                        CollisionEvents.PLAYER_DAMAGED)
+        self.collision_events.subscribe(self.__shake_collision, CollisionEvents.PLAYER_DAMAGED)
+        self.collision_events.subscribe(self.__record_collision, CollisionEvents.PLAYER_HIT,
+                                        CollisionEvents.ENEMY_HIT, CollisionEvents.DODGE)
+        
+        # Phases of a playing step; every entity is updated once per phase it takes part in
+        self.pipeline = Pipeline([
+            ('input', self.update_input),
+            ('ai', self.update_ai),
+            ('physics', self.update_physics),
+            ('collision', self.update_collisions),
+            ('events', self.collision_events.dispatch),
+            ('effects', self.update_effects),
+            ('animation', self.update_animations),
+            ('ui', self.update_ui)
+        ])
+        
+        if not headless:
+            self.setup_home_menu()
+            self.play_menu_music()
 
+    def load_assets(self):
+        """Decode the images missing from the scale cache and all sound effects on a thread pool while drawing a loading bar"""
+        loader = AssetLoader()
+        loader.add_image("sprites/others/background.png")
+        loader.add_image("sprites/others/controls.png")
+        
+        # Only the frame sets the scale cache misses decode their PNG frames or atlas pages
+        image_files = []
+        for specs in self.warmup.archetypes.values():
+            for base_path, states, width, height in specs:
+                for state in states:
+                    for path in FrameCache.image_files(base_path, state, width, height):
+                        if path not in image_files:
+                            image_files.append(path)
+        for path in image_files:
+            loader.add_image(path)
+        
+        sounds = Sounds(load_sounds=False)
+        for name, path in sounds.sound_files().items():
+            loader.add_sound(name, path)
+        
+        loader.start()
+        while not loader.done:
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    self.running = False
+            if not self.running:
+                # Closed while loading: drop the pending work instead of waiting for it
+                loader.cancel()
+                return
+            self.draw_loading_screen(loader.progress)
+            self.clock.tick(C.RENDER_FPS)
+        
+        # Convert images and register sounds on the main thread
+        for name, sound in loader.finish().items():
+            sounds.add_sound(name, sound)
+        self.draw_loading_screen(1.0)
+    
+    def draw_loading_screen(self, progress):
+        """Draw the loading bar
+        
+        Args:
+            progress: Fraction of assets loaded, from 0.0 to 1.0
+        """
+        self.screen.fill(C.BACKGROUND_COLOR)
+        
+        text_surface = Fonts.render("fonts/Jua-Regular.ttf", 32, f"Loading... {round(progress * 100)}%", (255, 255, 255))
+        self.screen.blit(text_surface, text_surface.get_rect(center=(C.WINDOW_WIDTH // 2, C.WINDOW_HEIGHT // 2 - 40)))
+        
+        bar_width = C.BUTTON_WIDTH
+        bar_height = 12
+        bar_rect = pg.Rect(0, 0, bar_width, bar_height)
+        bar_rect.center = (C.WINDOW_WIDTH // 2, C.WINDOW_HEIGHT // 2)
+        pg.draw.rect(self.screen, C.FLOOR_COLOR, bar_rect)
+        pg.draw.rect(self.screen, C.BUTTON_HOVER_COLOR['blue'], (bar_rect.x, bar_rect.y, int(bar_width * progress), bar_height))
+        
+        pg.display.flip()
+    
     def add_score(self, score_add):
         self.score = round(self.score + score_add)
 
@@ -447,18 +587,12 @@ class Game:
         # Create dark background
         self.screen.fill(C.BACKGROUND_COLOR)
         
-        # Load font
-        try:
-            font = pg.font.Font("fonts/Jua-Regular.ttf", 32)
-        except:
-            font = pg.font.Font(None, 32)
-        
         # Create message text
         message = "Statistics are opened in another window"
         sub_message = "Close it to continue the game"
         
-        text_surface = font.render(message, True, (255, 255, 255))
-        sub_text_surface = font.render(sub_message, True, (200, 200, 200))
+        text_surface = Fonts.render("fonts/Jua-Regular.ttf", 32, message, (255, 255, 255))
+        sub_text_surface = Fonts.render("fonts/Jua-Regular.ttf", 32, sub_message, (200, 200, 200))
         
         # Position the text in the center of the screen
         text_rect = text_surface.get_rect(center=(C.WINDOW_WIDTH // 2, C.WINDOW_HEIGHT // 2 - 20))
@@ -472,10 +606,30 @@ class Game:
         """Quit the game - callback for Quit button"""
         self.running = False
     
+    def finish_warmup(self):
+        """Warm any archetype not yet loaded and drop unused preloaded images"""
+        if self.warmup.done:
+            return
+        self.warmup.run()
+        AssetLoader.clear()
+    
     def setup_game(self):
         """Initialize or reset the game state"""
+        # Make sure no entity loads its frames on its first spawn
+        self.finish_warmup()
+        
+        # Fresh random streams for the new session
+        self.session_number += 1
+        self.rng = RNG(self.seed).derive(self.session_number)
+        
+        # Record the new session's input, saving the previous session's recording
+        self.stop_recording()
+        if self.record_dir is not None:
+            self.recording = InputRecording(self.seed, self.session_number, Timer.clock, C.FPS)
+        
         # Reset game state
         self.score = 0
+        self.collision_events.clear()
         self.game_over = False
         self.game_over_timer.reset()
         
@@ -491,7 +645,8 @@ class Game:
         self.spawn_timer.duration = self.get_next_spawn_time()
         self.spawn_timer.start()
         
-        # Clear gameplay groups
+        # Clear gameplay groups and the projectile store
+        Projectile.clear_all()
         for group_name in ['all', 'enemies', 'bullets', 'players', 'ui', 'gameover']:
             self.groups[group_name].empty()
         
@@ -504,12 +659,41 @@ class Game:
         self.groups['all'].add(self.player)
         self.groups['all'].add(self.player.knife)
         
+        # Release any input held over from the previous session
+        self.input.clear()
+        
         # Create UI elements
-        self.setup_ui()
+        if not self.headless:
+            self.setup_ui()
         
         # Spawn initial enemy
         self.spawn_enemy()
     
+    def save_snapshot(self, path):
+        """Save the world of the current session to a file
+        
+        Args:
+            path: Snapshot file to write
+        """
+        WorldSnapshot.capture(self).save(path)
+    
+    def load_snapshot(self, path):
+        """Continue playing from a world saved by save_snapshot()
+        
+        Args:
+            path: Snapshot file to read
+        """
+        self.finish_warmup()
+        self.stop_recording()
+        WorldSnapshot.load(path).restore(self)
+        self.collision_events.clear()
+        
+        self.game_state = Game.STATE_PLAYING
+        self.previous_centers = {}
+        self.input.clear()
+        if not self.headless:
+            self.setup_ui()
+    
     def get_next_spawn_time(self):
         """Calculate spawn time based on elapsed game time"""
         # Calculate elapsed seconds from timer instead of datetime
@@ -522,7 +706,7 @@ class Game:
         min_spawn = self.INITIAL_SPAWN_RANGE[0] - (self.INITIAL_SPAWN_RANGE[0] - self.FINAL_SPAWN_RANGE[0]) * difficulty_progress
         max_spawn = self.INITIAL_SPAWN_RANGE[1] - (self.INITIAL_SPAWN_RANGE[1] - self.FINAL_SPAWN_RANGE[1]) * difficulty_progress
         
-        return random.uniform(min_spawn, max_spawn)
+        return self.rng.stream(RNG.SPAWN).uniform(min_spawn, max_spawn)
     
     def format_time(self, td):
         """Format timedelta to 'MM:SS' format"""
@@ -539,7 +723,7 @@ class Game:
 
     def spawn_enemy(self):
         """Spawn an enemy at a valid position"""
-        enemy_type = random.choice([1,2,3])  # 1 for Wizard, 2 for Fencer, 3 for Gunman
+        enemy_type = self.rng.stream(RNG.SPAWN).choice([1,2,3])  # 1 for Wizard, 2 for Fencer, 3 for Gunman
         spawn_pos = self.get_valid_spawn_position(enemy_type)
 
         if enemy_type == 1:
@@ -564,13 +748,13 @@ class Game:
                         self.toggle_pause()
                 elif self.game_state == Game.STATE_PLAYING:
                     if event.key == pg.K_SPACE:
-                            self.player.space_pressed = True
+                            self.input.jump = True
                     elif event.key == pg.K_LSHIFT and not self.game_over:
-                        self.player.shift_pressed = True
+                        self.input.dodge = True
             elif event.type == pg.MOUSEBUTTONDOWN:
                 if self.game_state == Game.STATE_PLAYING and not self.game_over:
                     if event.button == 1:  # Left click
-                        self.player.mouse_clicked = True
+                        self.input.deflect = True
     
     def freeze_and_shake(self, freeze_duration=3, shake_duration=7, shake_intensity=20):
         """Freeze the game and then apply camera shake
@@ -597,16 +781,31 @@ class Game:
         if not self.shake_timer.is_completed and not self.shake_timer.is_paused:
             # The shake gets weaker as the timer progresses
             remaining_ratio = 1.0 - self.shake_timer.progress
-            self.camera_offset.x = random.uniform(-self.shake_intensity, self.shake_intensity) * remaining_ratio
-            self.camera_offset.y = random.uniform(-self.shake_intensity, self.shake_intensity) * remaining_ratio
+            camera_rng = self.rng.stream(RNG.CAMERA)
+            self.camera_offset.x = camera_rng.uniform(-self.shake_intensity, self.shake_intensity) * remaining_ratio
+            self.camera_offset.y = camera_rng.uniform(-self.shake_intensity, self.shake_intensity) * remaining_ratio
         else:
             # Reset camera offset when shake is complete
             self.camera_offset = Vector2(0, 0)
 
-    def update(self):
-        """Update game state"""
-        dt = 1 / C.FPS
+    def update(self, dt=1 / C.FPS):
+        """Advance the game by one fixed simulation step, recording it if a session is recorded
+        
+        Args:
+            dt: Length of the step in seconds
+        """
+        recording = self.recording
+        playing = self.game_state == Game.STATE_PLAYING
+        self.__step(dt)
         
+        # A new session set up during the step has already saved the previous recording
+        if recording is not None and recording is self.recording:
+            recording.end_step(paused=not playing)
+            if self.game_state in (Game.STATE_GAMEOVER, Game.STATE_MENU):
+                self.stop_recording()
+    
+    def __step(self, dt):
+        """Advance timers and the current game state by one step"""
         # Update all timers
         Timer.update_all(dt)
         
@@ -616,6 +815,10 @@ class Game:
         # Update based on game state
         if self.game_state == Game.STATE_MENU:
             self.groups['menu'].update()
+            if not self.warmup.done:
+                self.warmup.step()
+                if self.warmup.done:
+                    AssetLoader.clear()
             if self.current_music != "Spire":
                 self.play_menu_music()
         elif self.game_state == Game.STATE_PAUSED:
@@ -634,28 +837,12 @@ class Game:
             self.update_elapsed_time()
             
             if not self.freeze_timer.is_completed:
-                self.draw()
                 return
             
             if self.freeze_timer.just_completed:
                 self.shake_timer.start()
 
-            if self.spawn_timer.is_completed and not self.game_over:
-                self.spawn_enemy()
-                self.spawn_timer.duration = self.get_next_spawn_time()
-                self.spawn_timer.start()
-            
-            self.update_camera_shake()
-            self.groups['all'].update()
-            
-            for enemy in self.groups['enemies']:
-                enemy.update()
-            
-            self.groups['ui'].update()
-            if self.player_stats_timer.just_completed:
-                Stats().record('player_pos',
-                               player_x=self.player.position.x,
-                               player_y=self.player.position.y)
+            self.pipeline.run()
 
             # Check for game over
             if not self.game_over and self.player.health <= 0:
@@ -666,9 +853,95 @@ class Game:
             
             # Game over timer complete - switch to game over state
             if self.game_over and self.game_over_timer.is_completed:
+                if self.headless:
+                    # Headless runs go straight into a new session
+                    self.sessions += 1
+                    self.setup_game()
+                    return
                 self.game_state = Game.STATE_GAMEOVER
                 self.setup_gameover_menu()
     
+    def update_input(self):
+        """Input phase: sample the input and let the player act on it"""
+        self.input.poll()
+        if self.recording is not None:
+            self.recording.record(self.input)
+        self.player.update_input()
+
+    def update_ai(self):
+        """AI phase: spawn enemies and run their logic"""
+        if self.spawn_timer.is_completed and not self.game_over:
+            self.spawn_enemy()
+            self.spawn_timer.duration = self.get_next_spawn_time()
+            self.spawn_timer.start()
+        
+        for enemy in self.groups['enemies'].sprites():
+            enemy.update_ai()
+
+    def update_physics(self):
+        """Physics phase: move projectiles, the player, the knife and enemies"""
+        Projectile.update_all()
+        self.player.update_physics()
+        self.player.knife.update_physics()
+        for enemy in self.groups['enemies'].sprites():
+            enemy.update_physics()
+
+    def update_collisions(self):
+        """Collision phase: deflections, then hits on the player, then hits on enemies"""
+        self.player.knife.update_collisions()
+        self.player.update_collisions()
+        Enemy.check_projectile_collisions(self.groups['enemies'].sprites())
+
+    def __score_collision(self, kind, source, amount):
+        """Score consumer of collision events: a deflected bullet scores half its damage"""
+        self.add_score(amount/2)
+
+    def __play_collision_sound(self, kind, source, amount):
+        """Sound consumer of collision events: deflections, hits on enemies and damage to the player"""
+        sounds = Sounds()
+        if kind == CollisionEvents.DEFLECT:
+            if source in self.hard_attack_ids:
+                sounds.play_sound('deflect_hard')  # Make it sound hard
+            sounds.play_sound_random(['deflect1', 'deflect2', 'deflect3'])
+        elif kind == CollisionEvents.PLAYER_DAMAGED:
+            sounds.play_sound('player_damaged')
+        else:
+            sounds.play_sound_random(['enemy_damaged1', 'enemy_damaged2'])
+
+    def __shake_collision(self, kind, source, amount):
+        """Camera consumer of collision events: damage to the player freezes the game and shakes the camera"""
+        self.freeze_and_shake(10, 10, 20)
+
+    def __record_collision(self, kind, source, amount):
+        """Bookkeeping consumer of collision events: damage stats, deflection batches and dodge evasion"""
+        if kind == CollisionEvents.PLAYER_HIT:
+            Stats().record('dmg_income', attack_name=source, damage=amount)
+        elif kind == CollisionEvents.ENEMY_HIT:
+            # Add the damage to the knife's deflection batch the bullet belongs to
+            if source is not None and self.player and self.player.knife:
+                self.player.knife.record_deflected_damage(source, amount)
+        elif kind == CollisionEvents.DODGE:
+            self.player.count_evaded(source, amount)
+
+    def update_effects(self):
+        """Effects phase: camera shake and periodic player stats"""
+        self.update_camera_shake()
+        if self.player_stats_timer.just_completed:
+            Stats().record('player_pos',
+                           player_x=self.player.position.x,
+                           player_y=self.player.position.y)
+
+    def update_animations(self):
+        """Animation phase: advance the player, knife and enemy animations"""
+        self.player.knife.update_animation()
+        self.player.update_animation()
+        for enemy in self.groups['enemies'].sprites():
+            enemy.update_animation()
+
+    def update_ui(self):
+        """UI phase: refresh the HUD"""
+        self.groups['ui'].update()
+
     def draw(self):
         """Draw the game screen"""
         self.screen.fill(C.BACKGROUND_COLOR)
@@ -679,14 +952,10 @@ class Game:
             
             # Draw menu background here if needed
             # For example, a title or artwork on the right side
-            title_font = pg.font.Font("fonts/Coiny-Regular.ttf", C.TITLE_FONT_SIZE)
-            if title_font is None:
-                title_font = pg.font.Font(None, C.TITLE_FONT_SIZE)
-
             button_width = C.BUTTON_WIDTH
             left_margin = 150
 
-            title_text = title_font.render("DEFLECT", True, (255, 255, 255))
+            title_text = Fonts.render("fonts/Coiny-Regular.ttf", C.TITLE_FONT_SIZE, "DEFLECT", (255, 255, 255))
             title_rect = title_text.get_rect(center=(left_margin + button_width//2, C.WINDOW_HEIGHT // 2 - 250))
             self.screen.blit(title_text, title_rect)
             
@@ -700,32 +969,17 @@ class Game:
             else:
                 self.screen.blit(self.bg_game, (0, 0))
             
-            # Save the original positions of all sprites
-            original_positions = {}
-            if not self.shake_timer.is_completed:
-                for sprite in self.groups['all']:
-                    if hasattr(sprite, 'rect') and hasattr(sprite, 'position'):
-                        original_positions[sprite] = Vector2(sprite.rect.center)
-                        # Apply camera shake offset to sprite's position
-                        sprite.rect.center = (
-                            sprite.rect.center[0] + self.camera_offset.x,
-                            sprite.rect.center[1] + self.camera_offset.y
-                        )
+            # Move sprites to their interpolated, shaken positions for this frame
+            shake = self.camera_offset if not self.shake_timer.is_completed else Vector2(0, 0)
+            original_centers = self.apply_render_offsets(self.groups['all'], shake)
             
             # Draw all game sprites
             self.groups['all'].draw(self.screen)
             
-            # Draw Fencer weapons with camera shake
+            # Draw Fencer weapons (placed from the already offset rect)
             for enemy in self.groups['enemies']:
                 if isinstance(enemy, Fencer):
-                    if not self.shake_timer.is_completed:
-                        # Apply shake to weapon drawing
-                        original_pos = enemy.position
-                        enemy.position += self.camera_offset
-                        enemy.draw_weapon(self.screen)
-                        enemy.position = original_pos
-                    else:
-                        enemy.draw_weapon(self.screen)
+                    enemy.draw_weapon(self.screen)
             
             # Draw floor with camera shake
             floor_rect = (
@@ -738,31 +992,13 @@ class Game:
             )
             pg.draw.rect(self.screen, C.FLOOR_COLOR, floor_rect)
             
-            # Restore original positions
-            if not self.shake_timer.is_completed:
-                for sprite, pos in original_positions.items():
-                    sprite.rect.center = (pos.x, pos.y)
+            # Restore simulated positions
+            self.restore_render_offsets(original_centers)
             
             # Draw sparks with camera shake (always drawn even during freeze)
-            # Save and apply shake to sparks if needed
-            spark_positions = {}
-            if not self.shake_timer.is_completed:
-                for spark in self.groups['sparks']:
-                    if hasattr(spark, 'rect') and hasattr(spark, 'position'):
-                        spark_positions[spark] = Vector2(spark.rect.center)
-                        # Apply camera shake offset to spark's position
-                        spark.rect.center = (
-                            spark.rect.center[0] + self.camera_offset.x,
-                            spark.rect.center[1] + self.camera_offset.y
-                        )
-                        
-            # Draw all sparks
+            spark_centers = self.apply_render_offsets(self.groups['sparks'], shake)
             self.groups['sparks'].draw(self.screen)
-            
-            # Restore spark positions
-            if not self.shake_timer.is_completed:
-                for spark, pos in spark_positions.items():
-                    spark.rect.center = (pos.x, pos.y)
+            self.restore_render_offsets(spark_centers)
             
             # Draw UI elements on top - UI doesn't shake to avoid disorienting the player
             self.groups['ui'].draw(self.screen)
@@ -776,11 +1012,7 @@ class Game:
                 self.screen.blit(overlay, (0, 0))
                 
                 # Draw "PAUSED" text
-                pause_font = pg.font.Font("fonts/Coiny-Regular.ttf", C.TITLE_FONT_SIZE)
-                if pause_font is None:
-                    pause_font = pg.font.Font(None, C.TITLE_FONT_SIZE)
-                
-                pause_text = pause_font.render("PAUSED", True, (255, 255, 255))
+                pause_text = Fonts.render("fonts/Coiny-Regular.ttf", C.TITLE_FONT_SIZE, "PAUSED", (255, 255, 255))
                 pause_rect = pause_text.get_rect(center=(C.WINDOW_WIDTH // 2, C.WINDOW_HEIGHT // 2 - 220))
                 self.screen.blit(pause_text, pause_rect)
                 
@@ -796,20 +1028,15 @@ class Game:
                 self.screen.blit(overlay, (0, 0))
                 
                 # Draw game over text and stats
-                title_font = pg.font.Font("fonts/Coiny-Regular.ttf", C.TITLE_FONT_SIZE)
-                if title_font is None:
-                    title_font = pg.font.Font(None, C.TITLE_FONT_SIZE)
-                
-                stats_font = pg.font.Font("fonts/Jua-Regular.ttf", 36)
-                if stats_font is None:
-                    stats_font = pg.font.Font(None, 36)
+                title_font = ("fonts/Coiny-Regular.ttf", C.TITLE_FONT_SIZE)
+                stats_font = ("fonts/Jua-Regular.ttf", 36)
                 
                 score = self.score + (self.elapsed_time.seconds * 10)
 
-                game_over_text = title_font.render('GAME OVER', True, (255, 255, 255))
-                score_text = stats_font.render(f'SCORE  ----------  {score: <7}', True, (255, 255, 255))
-                time_text = stats_font.render(f'  TIME  ----------  {self.format_time(self.elapsed_time): <6}', True, (255, 255, 255))
-                kills_text = stats_font.render(f'KILLS  ----------  {self.enemies_killed: <8}', True, (255, 255, 255))
+                game_over_text = Fonts.render(*title_font, 'GAME OVER', (255, 255, 255))
+                score_text = Fonts.render(*stats_font, f'SCORE  ----------  {score: <7}', (255, 255, 255))
+                time_text = Fonts.render(*stats_font, f'  TIME  ----------  {self.format_time(self.elapsed_time): <6}', (255, 255, 255))
+                kills_text = Fonts.render(*stats_font, f'KILLS  ----------  {self.enemies_killed: <8}', (255, 255, 255))
                 
                 # Position text
                 text_y = C.WINDOW_HEIGHT // 2 - 220
@@ -826,17 +1053,163 @@ class Game:
         # Refresh display
         pg.display.flip()
     
+    def record_previous_centers(self):
+        """Remember where every sprite is before a simulation step, for render interpolation"""
+        self.previous_centers = {sprite: sprite.rect.center
+                                 for group in (self.groups['all'], self.groups['sparks'])
+                                 for sprite in group}
+    
+    def apply_render_offsets(self, group, shake):
+        """Move sprite rects to their drawn positions for this frame
+        
+        Sprites are drawn between their previous and current simulated
+        positions by the interpolation fraction, then offset by the camera shake.
+        
+        Args:
+            group: Sprites to offset
+            shake: Camera shake offset
+            
+        Returns:
+            dict: Original rect centers by sprite, for restore_render_offsets()
+        """
+        original_centers = {}
+        for sprite in group:
+            center = sprite.rect.center
+            previous = self.previous_centers.get(sprite, center)
+            x = previous[0] + (center[0] - previous[0]) * self.interpolation + shake.x
+            y = previous[1] + (center[1] - previous[1]) * self.interpolation + shake.y
+            original_centers[sprite] = center
+            sprite.rect.center = (x, y)
+        return original_centers
+    
+    def restore_render_offsets(self, original_centers):
+        """Put sprite rects back to their simulated positions"""
+        for sprite, center in original_centers.items():
+            sprite.rect.center = center
+    
+    def stop_recording(self):
+        """Save the current session's input recording, if any, and stop recording"""
+        if self.recording is None:
+            return
+        os.makedirs(self.record_dir, exist_ok=True)
+        path = os.path.join(self.record_dir,
+                            f"session-{self.recording.seed}-{self.recording.session_number}.rec")
+        self.recording.save(path)
+        self.recording = None
+    
     def run(self):
-        """Main game loop"""
+        """Main game loop
+        
+        The simulation advances in fixed steps of 1 / C.FPS seconds, as many as
+        the elapsed real time calls for (at most C.MAX_FRAME_STEPS per frame, so a
+        long stall drops time instead of spiralling). Rendering runs at up to
+        C.RENDER_FPS and interpolates sprites between the last two steps.
+        """
+        step = 1 / C.FPS
+        self.clock.tick()
         while self.running:
+            frame_time = self.clock.tick(C.RENDER_FPS) / 1000
+            self.accumulator += min(frame_time, C.MAX_FRAME_STEPS * step)
+            
             self.handle_events()
-            self.update()
+            while self.accumulator >= step and self.running:
+                self.record_previous_centers()
+                self.update(step)
+                self.accumulator -= step
+            
+            self.interpolation = min(self.accumulator / step, 1.0)
             self.draw()
-            self.clock.tick(C.FPS)
         
+        self.stop_recording()
         pg.quit()
         sys.exit()
 
+    def run_headless(self, ticks, snapshot=None):
+        """Simulate gameplay as fast as possible, with no window, audio or drawing
+        
+        Sessions restart automatically on game over.
+        
+        Args:
+            ticks: Number of fixed simulation steps to run
+            snapshot: Path of a world snapshot to start from instead of a new session
+            
+        Returns:
+            float: Simulation steps per second achieved
+        """
+        self.warmup.run()
+        if snapshot is not None:
+            self.load_snapshot(snapshot)
+        else:
+            self.game_state = Game.STATE_PLAYING
+            self.setup_game()
+        
+        step = 1 / C.FPS
+        start = time.perf_counter()
+        for _ in range(ticks):
+            self.update(step)
+        elapsed = time.perf_counter() - start
+        
+        ticks_per_second = ticks / elapsed if elapsed > 0 else float('inf')
+        print(f"{ticks} ticks in {elapsed:.2f} s ({ticks_per_second:.0f} ticks/s, "
+              f"{ticks_per_second / C.FPS:.1f}x real time), {self.sessions} sessions completed")
+        return ticks_per_second
+    
+    def run_replay(self, recording):
+        """Replay a recorded session as fast as possible, drawing every step unless headless
+        
+        Args:
+            recording: The InputRecording to replay
+            
+        Returns:
+            float: Simulation steps per second achieved
+        """
+        if recording.fps != C.FPS:
+            raise ValueError(f"Recording runs at {recording.fps} steps per second, the game at {C.FPS}")
+        
+        # Recreate the recorded session: same random streams, same clock. A replay
+        # is not a new session, so it is neither recorded nor added to the stats
+        self.record_dir = None
+        Stats.enabled = False
+        self.input = ReplayInput(recording)
+        self.warmup.run()
+        self.seed = recording.seed
+        self.session_number = recording.session_number - 1
+        Timer.set_clock(recording.clock)
+        self.game_state = Game.STATE_PLAYING
+        self.setup_game()
+        
+        step = 1 / C.FPS
+        ticks = 0
+        paused = False
+        start = time.perf_counter()
+        while self.running:
+            step_paused = self.input.next_step()
+            if step_paused is None:
+                break
+            
+            # Pausing and resuming happen between steps
+            if step_paused != paused:
+                paused = step_paused
+                if paused:
+                    self.elapsed_timer.pause()
+                else:
+                    self.elapsed_timer.resume()
+            self.game_state = Game.STATE_PAUSED if paused else Game.STATE_PLAYING
+            self.update(step)
+            ticks += 1
+            
+            if not self.headless:
+                for event in pg.event.get():
+                    if event.type == pg.QUIT:
+                        self.running = False
+                self.draw()
+        elapsed = time.perf_counter() - start
+        
+        ticks_per_second = ticks / elapsed if elapsed > 0 else float('inf')
+        print(f"Replayed {ticks} of {recording.steps} ticks in {elapsed:.2f} s ({ticks_per_second:.0f} ticks/s), "
+              f"score {self.score:.0f}, {self.enemies_killed} kills")
+        return ticks_per_second
+    
     def setup_ui(self):
         """Setup UI elements"""
         # Create health bar
@@ -845,8 +1218,7 @@ class Game:
         text_y = C.WINDOW_HEIGHT - C.FLOOR_HEIGHT//2
 
         healthbar_pos = Vector2(350, text_y)  # Center position
-        size = 0.3
-        healthbar = HealthBar(healthbar_pos, 1000 * size, 300 * size, self.player)  # Adjust size as needed
+        healthbar = HealthBar(healthbar_pos, *Game.HEALTHBAR_SIZE, self.player)
         self.groups['ui'].add(healthbar)
 
         # Create score display
@@ -858,7 +1230,8 @@ class Game:
             value_getter=lambda: str(self.score + (self.elapsed_time.seconds * 10)),
             font_path="fonts/Jua-Regular.ttf",
             font_size=32,
-            color=(255, 255, 255)
+            color=(255, 255, 255),
+            glyphs=True
         )
         self.groups['ui'].add(score_display)
         
@@ -871,7 +1244,8 @@ class Game:
             value_getter=lambda: self.format_time(self.elapsed_time),
             font_path="fonts/Jua-Regular.ttf",
             font_size=32,
-            color=(255, 255, 255)
+            color=(255, 255, 255),
+            glyphs=True
         )
         self.groups['ui'].add(time_display)
         
@@ -884,7 +1258,8 @@ class Game:
             value_getter=lambda: str(self.enemies_killed),
             font_path="fonts/Jua-Regular.ttf",
             font_size=32,
-            color=(255, 255, 255)
+            color=(255, 255, 255),
+            glyphs=True
         )
         self.groups['ui'].add(kills_display)
 
@@ -900,9 +1275,11 @@ class Game:
 
     def get_valid_spawn_position(self, enemy_type=1):
         """Get random position for enemy spawn, away from player"""
+        spawn_rng = self.rng.stream(RNG.SPAWN)
+        
         # Wizard
         if enemy_type == 1 or enemy_type == 3:
-            y = random.randint(-200, C.WINDOW_HEIGHT - C.FLOOR_HEIGHT - 100)
+            y = spawn_rng.randint(-200, C.WINDOW_HEIGHT - C.FLOOR_HEIGHT - 100)
 
         # Fencer
         elif enemy_type == 2:
@@ -911,9 +1288,9 @@ class Game:
         # Spawn outside canvas
         middle_offset = C.WINDOW_WIDTH/2 + 100
         if y <= -100:
-            x = random.randint(-100, C.WINDOW_WIDTH + 100)
+            x = spawn_rng.randint(-100, C.WINDOW_WIDTH + 100)
         else:
-            x = int(C.WINDOW_WIDTH/2 + random.choice((-middle_offset, middle_offset)))
+            x = int(C.WINDOW_WIDTH/2 + spawn_rng.choice((-middle_offset, middle_offset)))
 
         return Vector2(x, y)
 
@@ -928,5 +1305,29 @@ class Game:
         stats.create_stats_window(on_close_callback=on_stats_window_close)
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Deflect")
+    parser.add_argument('--headless', action='store_true', help="Simulate without window, audio or drawing")
+    parser.add_argument('--ticks', type=int, default=60 * C.FPS, help="Simulation steps to run in headless mode")
+    parser.add_argument('--seed', type=int, default=None, help="Seed of the random streams (random if omitted)")
+    parser.add_argument('--record', metavar='DIR', help="Save an input recording of every session to DIR")
+    parser.add_argument('--replay', metavar='FILE', help="Replay an input recording as fast as possible")
+    parser.add_argument('--load-snapshot', metavar='FILE', help="Start playing from a saved world")
+    parser.add_argument('--save-snapshot', metavar='FILE', help="Save the world at the end of a headless run")
+    args = parser.parse_args()
+    
+    if args.replay:
+        game = Game(headless=args.headless)
+        game.run_replay(InputRecording.load(args.replay))
+        if not args.headless:
+            pg.quit()
+    elif args.headless:
+        game = Game(headless=True, seed=args.seed, record_dir=args.record)
+        game.run_headless(args.ticks, snapshot=args.load_snapshot)
+        game.stop_recording()
+        if args.save_snapshot:
+            game.save_snapshot(args.save_snapshot)
+    else:
+        game = Game(seed=args.seed, record_dir=args.record)
+        if args.load_snapshot:
+            game.load_snapshot(args.load_snapshot)
+        game.run()
@@ -0,0 +1,238 @@
+import pygame
+import struct
+import zlib
+
+class InputState:
+    """
+    Player input for one simulation step.
+
+    Held controls (left, right, aim) are sampled by poll() every step.
+    Pressed actions (jump, dodge, deflect) are latched by the game's event
+    handling and cleared by the player once it has acted on them.
+    """
+    def __init__(self):
+        self.left = False
+        self.right = False
+        self.aim = (0, 0)  # Aim point in screen coordinates (mouse position)
+        self.jump = False
+        self.dodge = False
+        self.deflect = False
+
+    def poll(self):
+        """Sample the held keys and the mouse position"""
+        keys = pygame.key.get_pressed()
+        self.left = keys[pygame.K_a]
+        self.right = keys[pygame.K_d]
+        self.aim = pygame.mouse.get_pos()
+
+    def clear(self):
+        """Release every control"""
+        self.left = self.right = False
+        self.jump = self.dodge = self.deflect = False
+
+class AutoInput(InputState):
+    """
+    Scripted input for headless runs.
+
+    Paces left and right, jumps and dodges on a fixed rhythm and deflects
+    the closest enemy projectile once it comes within reach, so sessions
+    last long enough to exercise every enemy attack.
+    """
+    MOVE_PERIOD = 120     # Steps between changes of walking direction
+    JUMP_PERIOD = 90      # Steps between jumps
+    DODGE_PERIOD = 240    # Steps between dodges
+    DEFLECT_RANGE = 150   # Distance at which incoming projectiles are deflected
+
+    def __init__(self, game):
+        """
+        Args:
+            game: The game whose player is driven
+        """
+        super().__init__()
+        self.game = game
+        self.__steps = 0
+
+    def poll(self):
+        """Choose this step's input from the current game state"""
+        self.__steps += 1
+        player = self.game.player
+
+        self.right = (self.__steps // self.MOVE_PERIOD) % 2 == 0
+        self.left = not self.right
+        if self.__steps % self.JUMP_PERIOD == 0:
+            self.jump = True
+        if self.__steps % self.DODGE_PERIOD == 0:
+            self.dodge = True
+
+        # Aim at the closest incoming projectile, or the closest enemy
+        incoming = [bullet for bullet in self.game.groups['bullets'] if not bullet.is_deflected]
+        target = min(incoming, key=lambda b: player.position.distance_squared_to(b.position), default=None)
+        if target is not None:
+            self.aim = (target.position.x, target.position.y)
+            if player.position.distance_to(target.position) < self.DEFLECT_RANGE:
+                self.deflect = True
+        else:
+            enemy = min(self.game.groups['enemies'],
+                        key=lambda e: player.position.distance_squared_to(e.position), default=None)
+            if enemy is not None:
+                self.aim = (enemy.position.x, enemy.position.y)
+
+class InputRecording:
+    """
+    The input of every simulation step of one session, as a compact binary log.
+
+    The header holds the game's seed, the session number and the shared
+    clock at the start of the session; with those, replaying the steps
+    reproduces the session exactly. Each step is one flags byte, followed
+    by the aim point for steps that polled input: two int16 for integer
+    (mouse) positions, two float64 otherwise. The body is zlib compressed.
+    """
+    MAGIC = b'DFIR'
+    VERSION = 1
+    HEADER = struct.Struct('<4sBHqId')  # magic, version, steps per second, seed, session number, clock
+    INT_AIM = struct.Struct('<hh')
+    FLOAT_AIM = struct.Struct('<dd')
+
+    # Step flag bits
+    LEFT = 1
+    RIGHT = 2
+    JUMP = 4
+    DODGE = 8
+    DEFLECT = 16
+    POLLED = 32     # The step sampled input (playing and not frozen)
+    PAUSED = 64     # The step only advanced timers (paused or in a menu)
+    FLOAT = 128     # The aim point is stored as float64
+
+    def __init__(self, seed, session_number, clock, fps):
+        """
+        Args:
+            seed: The game's seed
+            session_number: Number of the session within the game
+            clock: Timer.clock when the session was set up
+            fps: Simulation steps per second
+        """
+        self.seed = seed
+        self.session_number = session_number
+        self.clock = clock
+        self.fps = fps
+        self.steps = 0
+        self.__data = bytearray()
+        self.__pending = None  # Input sampled during the current step
+
+    def record(self, state):
+        """Remember the input sampled during the current step"""
+        self.__pending = (state.left, state.right, state.jump, state.dodge, state.deflect, state.aim)
+
+    def end_step(self, paused=False):
+        """
+        Append the current step to the log.
+
+        Args:
+            paused: Whether the step only advanced timers
+        """
+        flags = InputRecording.PAUSED if paused else 0
+        if self.__pending is None:
+            self.__data.append(flags)
+        else:
+            left, right, jump, dodge, deflect, (x, y) = self.__pending
+            flags |= InputRecording.POLLED
+            flags |= (InputRecording.LEFT if left else 0) | (InputRecording.RIGHT if right else 0)
+            flags |= (InputRecording.JUMP if jump else 0) | (InputRecording.DODGE if dodge else 0)
+            flags |= InputRecording.DEFLECT if deflect else 0
+            if x == int(x) and y == int(y) and -32768 <= x <= 32767 and -32768 <= y <= 32767:
+                self.__data.append(flags)
+                self.__data += InputRecording.INT_AIM.pack(int(x), int(y))
+            else:
+                self.__data.append(flags | InputRecording.FLOAT)
+                self.__data += InputRecording.FLOAT_AIM.pack(x, y)
+        self.__pending = None
+        self.steps += 1
+
+    def __iter__(self):
+        """Yield (flags, aim) for every step; aim is None for steps that did not poll input"""
+        data = self.__data
+        offset = 0
+        while offset < len(data):
+            flags = data[offset]
+            offset += 1
+            if not flags & InputRecording.POLLED:
+                yield flags, None
+            elif flags & InputRecording.FLOAT:
+                yield flags, InputRecording.FLOAT_AIM.unpack_from(data, offset)
+                offset += InputRecording.FLOAT_AIM.size
+            else:
+                yield flags, InputRecording.INT_AIM.unpack_from(data, offset)
+                offset += InputRecording.INT_AIM.size
+
+    def save(self, path):
+        """Write the log to a file"""
+        header = InputRecording.HEADER.pack(InputRecording.MAGIC, InputRecording.VERSION, self.fps,
+                                            self.seed, self.session_number, self.clock)
+        with open(path, 'wb') as file:
+            file.write(header)
+            file.write(zlib.compress(bytes(self.__data), 9))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a log written by save().
+
+        Returns:
+            InputRecording: The recording
+
+        Raises:
+            ValueError: If the file is not an input recording of a supported version
+        """
+        with open(path, 'rb') as file:
+            blob = file.read()
+        if len(blob) < cls.HEADER.size:
+            raise ValueError(f"{path} is not an input recording")
+        magic, version, fps, seed, session_number, clock = cls.HEADER.unpack_from(blob)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{path} is not an input recording of version {cls.VERSION}")
+
+        recording = cls(seed, session_number, clock, fps)
+        recording.__data = bytearray(zlib.decompress(blob[cls.HEADER.size:]))
+        recording.steps = sum(1 for _ in recording)
+        return recording
+
+class ReplayInput(InputState):
+    """
+    Input fed back from an InputRecording, one recorded step at a time.
+
+    The game calls next_step() before each step to learn whether the step
+    was paused; poll() then hands out the input recorded for that step.
+    """
+    def __init__(self, recording):
+        """
+        Args:
+            recording: The InputRecording to replay
+        """
+        super().__init__()
+        self.recording = recording
+        self.__steps = iter(recording)
+        self.__step = None
+
+    def next_step(self):
+        """
+        Move to the next recorded step.
+
+        Returns:
+            bool: Whether the step was paused, or None once the recording is exhausted
+        """
+        self.__step = next(self.__steps, None)
+        if self.__step is None:
+            return None
+        return bool(self.__step[0] & InputRecording.PAUSED)
+
+    def poll(self):
+        """Set the controls to the ones recorded for the current step"""
+        if self.__step is None or self.__step[1] is None:
+            return
+        flags, aim = self.__step
+        self.left = bool(flags & InputRecording.LEFT)
+        self.right = bool(flags & InputRecording.RIGHT)
+        self.jump = bool(flags & InputRecording.JUMP)
+        self.dodge = bool(flags & InputRecording.DODGE)
+        self.deflect = bool(flags & InputRecording.DEFLECT)
+        self.aim = aim
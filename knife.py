@@ -2,25 +2,35 @@ import pygame
 from pygame.math import Vector2
 from animation import Animation
 import math
-import random
 from projectile import *
-import uuid
+from collision import CollisionStage
+from events import CollisionEvents
+import itertools
 from stats import Stats
-from datetime import datetime
-from sounds import Sounds
+from timer import Timer
+from rng import RNG
 
 class Spark(pygame.sprite.Sprite):
     """
     Visual effect that plays when a bullet is deflected.
     Ignores freeze effects and destroys itself after animation finishes.
     """
+    SIZE = (120, 120)
+    ANIMATION = {
+        'path': 'sprites/sparks',
+        'loops': {
+            "sparks": False  # Non-looping
+        },
+        'speed': 0.05
+    }
+
     def __init__(self, position, velocity, game):
         super().__init__()
         self.position = Vector2(position)
         self.velocity = Vector2(velocity)
         self.game = game
-        self.width = 120
-        self.height = 120
+        self.width = self.SIZE[0]
+        self.height = self.SIZE[1]
         
         # Calculate the angle to face the velocity direction
         if self.velocity.length() > 0:
@@ -28,13 +38,9 @@ class Spark(pygame.sprite.Sprite):
         else:
             self.angle = 0
             
-        # Animation states - spark is a non-looping animation
-        animation_states = {
-            "sparks": False  # Non-looping
-        }
-        
-        # Create animation controller
-        self._anim = Animation(self, "sprites/sparks", animation_states, animation_speed=0.05)
+        # Create animation controller - spark is a non-looping animation
+        self._anim = Animation(self, self.ANIMATION['path'], self.ANIMATION['loops'],
+                               animation_speed=self.ANIMATION['speed'])
         self._anim.change_state("sparks")
         
         # Initialize image and rect
@@ -44,38 +50,54 @@ class Spark(pygame.sprite.Sprite):
         # Add to the dedicated sparks group
         self.game.groups['sparks'].add(self)
     
+    @classmethod
+    def animation_specs(cls):
+        """Animations of the spark effect as (base_path, states, width, height) tuples"""
+        return [(cls.ANIMATION['path'], cls.ANIMATION['loops'], cls.SIZE[0], cls.SIZE[1])]
+
     def update(self):
         """Update spark animation and check if it's finished"""
         # Update animation
         self._anim.update()
         
-        # Get the current frame and rotate it to match velocity direction
-        original_image = self._anim.get_current_frame(True)
-        
-        # Rotate to match velocity direction
+        # Get the current frame rotated to match velocity direction
         # In Pygame, rotation is clockwise from the original orientation
-        self.image = pygame.transform.rotate(original_image, -self.angle)
+        self.image = self._anim.get_rotated_frame(-self.angle)
         self.rect = self.image.get_rect(center=self.position)
         
         # Remove if animation is finished
         if self._anim.animation_finished:
             self.kill()
 
+    def kill(self):
+        """Remove the spark and release its shared animation frames"""
+        self._anim.release()
+        super().kill()
+
 class Knife(pygame.sprite.Sprite):
     DEFLECTED_SPEED_MUL = 2
     DEFLECTION_FINALIZE_DELAY = 5.0
+    DEFLECT_IDS = itertools.count(1)  # Int ids of deflection batches
+    COLLISION_MASK = Projectile.LAYER_HOSTILE  # Deflects bullets fired at the player
+    HARD_ATTACKS = ('Gunman Bouncing-Laser', 'Wizard Track-Cast')  # Attacks that sound hard when deflected
+    SIZE = (180, 180)
+    ANIMATION = {
+        'path': 'sprites/knife',
+        'loops': {
+            "deflect": False
+        },
+        'speed': 0.05
+    }
 
     def __init__(self, player):
         super().__init__()
         self.player = player
-        self.width = 180
-        self.height = 180
+        self.width = self.SIZE[0]
+        self.height = self.SIZE[1]
         
         # Animation system
-        animation_states = {
-            "deflect": False
-        }
-        self._anim = Animation(self, "sprites/knife", animation_states, animation_speed=0.05)
+        self._anim = Animation(self, self.ANIMATION['path'], self.ANIMATION['loops'],
+                               animation_speed=self.ANIMATION['speed'])
         self.facing_right = True
         
         # Set initial image and rect
@@ -85,6 +107,7 @@ class Knife(pygame.sprite.Sprite):
         
         # Positioning and hitbox
         self.position = Vector2(self.player.position)
+        self.previous_position = Vector2(self.position)  # Position at the last collision phase
         self.OFFSET = 50
         
         # Deflection attributes
@@ -95,8 +118,37 @@ class Knife(pygame.sprite.Sprite):
         # Deflection damage tracking
         self.deflection_damage = {}
     
+    @classmethod
+    def animation_specs(cls):
+        """Animations of the knife as (base_path, states, width, height) tuples"""
+        return [(cls.ANIMATION['path'], cls.ANIMATION['loops'], cls.SIZE[0], cls.SIZE[1])]
+
     def update(self):
-        """Update the knife's state and position"""
+        """Update the knife through every phase (the game runs the phases separately)"""
+        self.update_physics()
+        self.update_collisions()
+        self.update_animation()
+
+    def update_physics(self):
+        """Physics phase: follow the player at the current angle"""
+        # Calculate offset using standard angle
+        angle_rad = math.radians(self.angle)
+        offset_vector = Vector2(
+            math.cos(angle_rad) * self.OFFSET,
+            -math.sin(angle_rad) * self.OFFSET  # Negative because pygame Y is down
+        )
+
+        self.position = self.player.position + offset_vector
+        self.rect.center = self.position
+
+    def update_collisions(self):
+        """Collision phase: deflect bullets touching the active knife"""
+        if self.active:
+            self.__check_projectile_collisions()
+        self.previous_position = Vector2(self.position)
+
+    def update_animation(self):
+        """Animation phase: advance the deflect animation and finalize deflection batches"""
         if self.active:
             self._anim.update()
             self.original_image = self._anim.get_current_frame(self.facing_right)
@@ -106,27 +158,16 @@ class Knife(pygame.sprite.Sprite):
             if not self.facing_right:
                 display_angle += 180
 
-            # Rotate image
-            self.image = pygame.transform.rotate(self.original_image, display_angle)
+            # Rotate image (pre-rotated frames are shared through the rotation cache)
+            self.image = self._anim.get_rotated_frame(display_angle, self.facing_right)
             self.rect = self.image.get_rect()
             
-            self.__check_projectile_collisions()
-            
             if self._anim.animation_finished:
                 self.active = False
                 self.current_deflect_id = None
         else:
             # When inactive, use transparent surface
             self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        # Calculate offset using standard angle
-        angle_rad = math.radians(self.angle)
-        offset_vector = Vector2(
-            math.cos(angle_rad) * self.OFFSET,
-            -math.sin(angle_rad) * self.OFFSET  # Negative because pygame Y is down
-        )
-
-        self.position = self.player.position + offset_vector
         self.rect.center = self.position
         
         self.check_completed_deflections()
@@ -134,16 +175,16 @@ class Knife(pygame.sprite.Sprite):
     def check_completed_deflections(self):
         """Check for deflections that have been completed and need their total damage recorded."""
         keys_to_remove = []
-        current_time = datetime.now()
+        current_time = Timer.clock
         
         for deflect_id, data in self.deflection_damage.items():
             # Skip current active deflection
             if deflect_id == self.current_deflect_id:
                 continue
-            time_elapsed = current_time - data["timestamp"]
+            time_elapsed = current_time - data["timestamp"]  # Seconds of simulation time
             
             # If sufficient time has passed and this deflection has hits that haven't been recorded yet
-            if time_elapsed.total_seconds() >= self.DEFLECTION_FINALIZE_DELAY and not data["recorded"]:
+            if time_elapsed >= self.DEFLECTION_FINALIZE_DELAY and not data["recorded"]:
                 if data["hit_count"] > 0:
                     # Record the combined damage for this deflection batch
                     Stats().record('dmg_deflected', total_damage_dealt=data["total_damage_dealt"])
@@ -153,7 +194,7 @@ class Knife(pygame.sprite.Sprite):
                 keys_to_remove.append(deflect_id)
             
             # If it's been a very long time, clean it up regardless
-            elif time_elapsed.total_seconds() >= self.DEFLECTION_FINALIZE_DELAY * 2:
+            elif time_elapsed >= self.DEFLECTION_FINALIZE_DELAY * 2:
                 keys_to_remove.append(deflect_id)
         
         # Clean up completed deflections
@@ -166,12 +207,12 @@ class Knife(pygame.sprite.Sprite):
             self.active = True
             self._anim.change_state("deflect")
             
-            self.current_deflect_id = str(uuid.uuid4())
+            self.current_deflect_id = next(self.DEFLECT_IDS)
             self.deflection_damage[self.current_deflect_id] = {
                 "total_damage_dealt": 0,
                 "hit_count": 0,
                 "recorded": False,
-                "timestamp": datetime.now()
+                "timestamp": Timer.clock
             }
             
             # Calculate direction to mouse
@@ -194,15 +235,13 @@ class Knife(pygame.sprite.Sprite):
         if not self.active or self._anim.animation_finished:
             return
         
-        # Get center point of knife for circle collision
-        
-        # Check all bullets
-        for bullet in self.player.game.groups['bullets']:
-            if not bullet.is_deflected:  # Only check non-deflected bullets
-                distance = (bullet.position - self.position).length()
-                if distance <= self.width/2:
-                    self.player.game.add_score(bullet.damage/2)
-                    self.deflect_bullet(bullet)
+        # Hostile bullets touching the knife's circle
+        hits, = CollisionStage.hits([(self.position, self.width/2, self.previous_position)],
+                                     self.COLLISION_MASK, inclusive=True)
+        events = self.player.game.collision_events
+        for bullet in hits:
+            events.emit(CollisionEvents.DEFLECT, bullet.attack_id, bullet.damage)
+            self.deflect_bullet(bullet)
     
     def deflect_bullet(self, bullet):
         """Deflect a bullet in the direction the knife is facing"""
@@ -210,7 +249,7 @@ class Knife(pygame.sprite.Sprite):
         
         error_deg = 10
         if isinstance(bullet, Shard): error_deg = 45
-        angle_rad = math.radians(self.angle + random.randrange(-error_deg, error_deg))
+        angle_rad = math.radians(self.angle + self.player.game.rng.stream(RNG.KNIFE).randrange(-error_deg, error_deg))
         
         # Calculate new velocity for the deflected bullet
         new_velocity = Vector2(math.cos(angle_rad), -math.sin(angle_rad)) * (bullet.speed * self.DEFLECTED_SPEED_MUL)
@@ -220,17 +259,13 @@ class Knife(pygame.sprite.Sprite):
         bullet.damage_recorded = False
 
         bullet.is_deflected = True
-        bullet.SPEED_RANGE[0] *= self.DEFLECTED_SPEED_MUL
-        bullet.SPEED_RANGE[1] *= self.DEFLECTED_SPEED_MUL
+        bullet.SPEED_RANGE = (bullet.SPEED_RANGE[0] * self.DEFLECTED_SPEED_MUL,
+                              bullet.SPEED_RANGE[1] * self.DEFLECTED_SPEED_MUL)
         bullet.velocity = new_velocity
         bullet.draw()
         
         # Create spark effect at the bullet's position
         Spark(bullet.position, new_velocity, self.player.game)
-        
-        if bullet.attack_name in ('Gunman Bouncing-Laser','Wizard Track-Cast'):
-            Sounds().play_sound('deflect_hard') # Make it sounds hard
-        Sounds().play_sound_random(['deflect1', 'deflect2', 'deflect3'])
     
     def record_deflected_damage(self, deflect_id, damage):
         """Record damage done by deflected projectiles in the same batch"""
@@ -0,0 +1,120 @@
+import pygame
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+class AssetLoader:
+    """
+    Decodes images and sounds on a thread pool while the main thread keeps drawing.
+
+    Workers only decode (pygame.image.load / pygame.mixer.Sound release the GIL
+    while decoding); finish() runs on the main thread and converts every image
+    to the display format with convert_alpha(). Converted images are kept in a
+    class-level store that load_image() serves from, so the frame cache and the
+    atlas pick them up instead of reading the files again.
+    """
+    # Class attribute to store preloaded, display-ready images by path
+    images = {}
+
+    def __init__(self, max_workers=None):
+        """
+        Args:
+            max_workers: Number of decoding threads (defaults to the CPU count)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.__image_paths = []
+        self.__sound_paths = {}
+        self.__futures = {}
+        self.__executor = None
+        self.sounds = {}
+
+    @staticmethod
+    def __key(path):
+        return os.path.normpath(path)
+
+    @classmethod
+    def load_image(cls, path, alpha=True):
+        """
+        Get a display-ready image, taking it from the preloaded store if present.
+
+        Args:
+            path: Image file path
+            alpha: Whether to keep per-pixel alpha (convert_alpha) or not (convert)
+        """
+        image = cls.images.pop(cls.__key(path), None)
+        if image is None:
+            image = pygame.image.load(path)
+            return image.convert_alpha() if alpha else image.convert()
+        return image if alpha else image.convert()
+
+    @classmethod
+    def clear(cls):
+        """Drop every preloaded image that was never used."""
+        cls.images.clear()
+
+    def add_image(self, path):
+        """Queue an image file for decoding"""
+        self.__image_paths.append(path)
+
+    def add_sound(self, name, path):
+        """Queue a sound file for decoding"""
+        self.__sound_paths[name] = path
+
+    def start(self):
+        """Submit every queued file to the thread pool"""
+        self.__executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        for path in self.__image_paths:
+            self.__futures[('image', path)] = self.__executor.submit(pygame.image.load, path)
+        for name, path in self.__sound_paths.items():
+            self.__futures[('sound', name)] = self.__executor.submit(pygame.mixer.Sound, path)
+
+    @property
+    def total(self):
+        return len(self.__futures)
+
+    @property
+    def completed(self):
+        return sum(1 for future in self.__futures.values() if future.done())
+
+    @property
+    def progress(self):
+        """Fraction of queued files decoded, from 0.0 to 1.0"""
+        if not self.__futures:
+            return 1.0
+        return self.completed / self.total
+
+    @property
+    def done(self):
+        return all(future.done() for future in self.__futures.values())
+
+    def finish(self):
+        """
+        Wait for all decoding and convert images on the calling (main) thread.
+
+        Failed files are reported and skipped; they are loaded the usual way
+        later if anything still needs them.
+
+        Returns:
+            dict: Decoded sounds by name
+        """
+        for (kind, key), future in self.__futures.items():
+            try:
+                result = future.result()
+            except (pygame.error, OSError) as e:
+                print(f"Error loading {kind}: {key} ({e})")
+                continue
+
+            if kind == 'image':
+                AssetLoader.images[self.__key(key)] = result.convert_alpha()
+            else:
+                self.sounds[key] = result
+
+        if self.__executor:
+            self.__executor.shutdown()
+        self.__futures.clear()
+        return self.sounds
+
+    def cancel(self):
+        """Drop every queued file that is not decoded yet, without waiting for the ones in progress"""
+        if self.__executor:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+        self.__futures.clear()
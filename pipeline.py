@@ -0,0 +1,85 @@
+import time
+
+class Pipeline:
+    """
+    The named phases of one simulation step, run in order.
+
+    Each phase is a function called once per step. Phases can be skipped by
+    name, and with timing enabled the time spent in each phase is added up
+    so a run can report where a step's time goes.
+    """
+    def __init__(self, phases=()):
+        """
+        Args:
+            phases: Sequence of (name, function) pairs in run order
+        """
+        self.__phases = []          # (name, function) in run order
+        self.skipped = set()        # Names of phases that are not run
+        self.timing = False         # Whether run() measures each phase
+        self.timings = {}           # Phase name -> [total seconds, runs]
+        for name, function in phases:
+            self.add_phase(name, function)
+
+    @property
+    def names(self):
+        """Phase names in run order"""
+        return [name for name, _ in self.__phases]
+
+    def add_phase(self, name, function):
+        """
+        Append a phase.
+
+        Args:
+            name: Unique phase name
+            function: Called with no arguments when the phase runs
+        """
+        if name in self.names:
+            raise ValueError(f"Duplicate pipeline phase: {name}")
+        self.__phases.append((name, function))
+        self.timings[name] = [0.0, 0]
+
+    def skip(self, name, skipped=True):
+        """
+        Skip a phase, or run it again with skipped=False.
+
+        Args:
+            name: Phase name
+            skipped: Whether the phase is skipped
+        """
+        if name not in self.names:
+            raise KeyError(f"Unknown pipeline phase: {name}")
+        if skipped:
+            self.skipped.add(name)
+        else:
+            self.skipped.discard(name)
+
+    def run(self):
+        """Run every phase that is not skipped, in order"""
+        if not self.timing:
+            for name, function in self.__phases:
+                if name not in self.skipped:
+                    function()
+            return
+
+        for name, function in self.__phases:
+            if name in self.skipped:
+                continue
+            start = time.perf_counter()
+            function()
+            timing = self.timings[name]
+            timing[0] += time.perf_counter() - start
+            timing[1] += 1
+
+    def reset_timings(self):
+        """Forget all measured phase times"""
+        for timing in self.timings.values():
+            timing[0] = 0.0
+            timing[1] = 0
+
+    def report(self):
+        """
+        Returns:
+            dict: Phase name -> (average microseconds per run, runs), in run order
+        """
+        return {name: (total / runs * 1e6 if runs else 0.0, runs)
+                for name, (total, runs) in ((name, self.timings[name]) for name in self.names)}
@@ -3,6 +3,9 @@ from pygame.math import Vector2
 from config import Config as C
 from animation import Animation
 from knife import Knife
+from projectile import Projectile
+from collision import CollisionStage
+from events import CollisionEvents
 import math
 from timer import Timer
 from stats import Stats
@@ -21,12 +24,28 @@ class Player(pygame.sprite.Sprite):
     DOUBLE_JUMP_FORCE = -12
     KNOCKBACK_FORCE = Vector2(-3, -8)
     DODGE_SPEED = 25
+    COLLISION_MASK = Projectile.LAYER_HOSTILE  # Hit by bullets fired by enemies
+    SIZE = (100, 100)
+    ANIMATION = {
+        'path': 'sprites/player',
+        'loops': {
+            "idle": True,
+            "run": True,
+            "jump": False,
+            "fall": False,
+            "dodge": False,
+            "deflect": False,
+            "hurt": False,  # Hurt animation is non-looping
+            "dead": False   # Death animation is non-looping
+        },
+        'speed': 0.08
+    }
 
     def __init__(self, game, x=0, y=0):
         super().__init__()
         self.game = game
-        self.width = 100
-        self.height = 100
+        self.width = self.SIZE[0]
+        self.height = self.SIZE[1]
         
         # Private tag for stats tracking
         self.__tag = {
@@ -37,29 +56,16 @@ class Player(pygame.sprite.Sprite):
         }
         
         # Animation system
-        animation_states = {
-            "idle": True,
-            "run": True,
-            "jump": False,
-            "fall": False,
-            "dodge": False,
-            "deflect": False,
-            "hurt": False,  # Hurt animation is non-looping
-            "dead": False   # Death animation is non-looping
-        }
-        self._anim = Animation(self, "sprites/player", animation_states, animation_speed=0.08)
+        self._anim = Animation(self, self.ANIMATION['path'], self.ANIMATION['loops'],
+                               animation_speed=self.ANIMATION['speed'])
         self.facing_right = True
         
         # Physics attributes
         self.position = Vector2(x, y)
+        self.previous_position = Vector2(x, y)  # Position at the last collision phase
         self.velocity = Vector2(0, 0)
         self.acceleration = Vector2(0, 0)
         self.on_ground = False
-        
-        # Input states
-        self.space_pressed = False
-        self.shift_pressed = False
-        self.mouse_clicked = False  # New input state for mouse click
 
         # Dodge attributes
         self.__dodge_timer = Timer(duration=0.14, owner=self)
@@ -90,6 +96,11 @@ class Player(pygame.sprite.Sprite):
         self.image = self._anim.get_current_frame(self.facing_right)
         self.rect = self.image.get_rect(center=(x, y))
     
+    @classmethod
+    def animation_specs(cls):
+        """Animations of the player and its knife as (base_path, states, width, height) tuples"""
+        return [(cls.ANIMATION['path'], cls.ANIMATION['loops'], cls.SIZE[0], cls.SIZE[1])] + Knife.animation_specs()
+
     @property
     def dodge_start_position(self):
         return self.__tag['dodge_start_position']
@@ -115,7 +126,17 @@ class Player(pygame.sprite.Sprite):
         return self.__tag['last_processed_bullets']
 
     def update(self):
-        """Update the player's state"""
+        """Update the player and its knife through every phase (the game runs the phases separately)"""
+        self.update_input()
+        self.update_physics()
+        self.knife.update_physics()
+        self.knife.update_collisions()
+        self.update_collisions()
+        self.knife.update_animation()
+        self.update_animation()
+
+    def update_input(self):
+        """Input phase: handle timer completions and act on the game's input state"""
         # Check for timer completions
         if self.__self_heal_timer.just_completed and self.is_alive:
             self.health += 1
@@ -143,20 +164,35 @@ class Player(pygame.sprite.Sprite):
         # Only handle input if not hurt/dead
         if not self.is_hurt and self.is_alive:
             self.__handle_input()
-            
+
+    def update_physics(self):
+        """Physics phase: move the player"""
         self.__apply_physics()
-        self.knife.update()
-        
+
+    def update_collisions(self):
+        """Collision phase: get hit by enemy bullets and enemies"""
         # Only check collisions if alive
         if self.is_alive:
             self.__check_projectile_collisions()
             self.__check_enemy_collisions()
-            
+        self.previous_position = Vector2(self.position)
+
+    def update_animation(self):
+        """Animation phase: advance the player's animation"""
         self.__update_animation()
 
     def take_damage(self, amount, source_position=None):
-        """Handle player taking damage with knockback"""
-        if not self.__is_invincible and not self.is_hurt and self.is_alive:
+        """
+        Handle player taking damage with knockback.
+
+        A dodging player evades hits instead of taking them. The sound and
+        camera shake of the hit are left to the PLAYER_DAMAGED event the
+        caller emits.
+
+        Returns:
+            bool: True if the damage was taken
+        """
+        if not self.__is_invincible and not self.is_hurt and not self.is_dodging and self.is_alive:
             self.health -= amount
             self.__is_invincible = True
             self.__invincible_timer.start()
@@ -167,7 +203,7 @@ class Player(pygame.sprite.Sprite):
                 knockback_to_right = False if source_position.x > self.position.x else True
             else:
                 knockback_to_right = False if self.facing_right else True
-            self.velocity = self.KNOCKBACK_FORCE
+            self.velocity = Vector2(self.KNOCKBACK_FORCE)  # A copy: the velocity is changed in place
             self.facing_right = False
             if knockback_to_right:
                 self.velocity = self.velocity.reflect(Vector2(1,0))
@@ -180,18 +216,8 @@ class Player(pygame.sprite.Sprite):
             if self.on_ground:
                 self.on_ground = False
                 self.position.y -= 1  # Slight lift to guarantee we're off ground
-            
-            # End any dodge and record evaded damage (even if damage_evaded is 0)
-            if self.is_dodging:
-                Stats().record('dodged_attack', damage_evaded=self.dodge_damage_evaded)
-                self.dodge_start_position = None
-                self.dodge_counted_enemies.clear()
-                self.last_processed_bullets.clear()
-            
-            self.is_dodging = False
-            self.__dodge_timer.stop()
-            self.game.freeze_and_shake(10, 10, 20)
-            Sounds().play_sound('player_damaged')
+            return True
+        return False
     
 
     def __start_dodge(self):
@@ -209,7 +235,7 @@ class Player(pygame.sprite.Sprite):
             self.dodge_counted_enemies.clear()
             self.last_processed_bullets.clear()
             
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = self.game.input.aim
             to_mouse = Vector2(mouse_pos) - self.position
             angle = math.degrees(math.atan2(to_mouse.y, to_mouse.x))
             angle = (360 - angle) % 360  # Convert to clockwise and ensure [0,360]
@@ -235,12 +261,12 @@ class Player(pygame.sprite.Sprite):
         if self.is_hurt or not self.is_alive:
             return
             
-        keys = pygame.key.get_pressed()
+        controls = self.game.input
         
         # Deflecting
-        if self.mouse_clicked and not self.is_dodging and self.__can_deflect:
+        if controls.deflect and not self.is_dodging and self.__can_deflect:
             Sounds().play_sound_random(['slash1', 'slash2', 'slash3'])
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = controls.aim
             self.knife.activate(mouse_pos)
             self._anim.change_state("deflect")
             # Set deflecting state and direction
@@ -249,8 +275,7 @@ class Player(pygame.sprite.Sprite):
             # Start cooldown
             self.__can_deflect = False
             self.__deflect_cooldown_timer.start()
-        if self.mouse_clicked:
-            self.mouse_clicked = False
+        controls.deflect = False
         
         # Don't handle movement input while dodging
         if not self.is_dodging:
@@ -258,17 +283,17 @@ class Player(pygame.sprite.Sprite):
             self.acceleration.x = 0
             
             # Horizontal movement with acceleration
-            if keys[pygame.K_d]:
+            if controls.right:
                 self.acceleration.x += self.ACCELERATION
                 if not self.is_deflecting:  # Only change facing if not deflecting
                     self.facing_right = True
-            if keys[pygame.K_a]:
+            if controls.left:
                 self.acceleration.x -= self.ACCELERATION
                 if not self.is_deflecting:  # Only change facing if not deflecting
                     self.facing_right = False
         
         # Jumping and double jumping
-        if self.space_pressed:
+        if controls.jump:
             if self.on_ground:
                 self.velocity.y = self.JUMP_FORCE
                 self.on_ground = False
@@ -279,12 +304,12 @@ class Player(pygame.sprite.Sprite):
                 self.velocity.y = self.DOUBLE_JUMP_FORCE
                 self.__can_double_jump = False
                 self._anim.change_state("jump")
-            self.space_pressed = False  # Reset the press state
+            controls.jump = False  # Reset the press state
         
         # Dodging
-        if self.shift_pressed:
+        if controls.dodge:
             self.__start_dodge()
-            self.shift_pressed = False  # Reset the press state
+            controls.dodge = False  # Reset the press state
     
     def __apply_physics(self):
         """Apply physics calculations to the player"""
@@ -401,117 +426,97 @@ class Player(pygame.sprite.Sprite):
         """Check for collisions with enemy bullets"""
         if self.__is_invincible or not self.is_alive:
             return
-        
-        # Define a maximum check distance to avoid unnecessary calculations
-        max_check_dist = self.width * 1.5  # Larger buffer to account for fast moving projectiles
-        dodge_pos = self.dodge_start_position
-        current_pos = self.position
-        collision_width = self.width/3
-        dodge_width = self.width
+
         bullet_cache = self.last_processed_bullets
-        
-        for bullet in self.game.groups['bullets']:
-            # Skip if this bullet was already processed
-            if bullet in bullet_cache:
-                continue
-                
-            if not bullet.is_deflected:  # Only check non-deflected bullets
-                bullet_pos = bullet.position
-                
-                # Skip distant projectiles with quick bounding box check
-                dx = abs(bullet_pos.x - current_pos.x)
-                dy = abs(bullet_pos.y - current_pos.y)
-                
-                # Skip if bullet is too far from both current and dodge start positions
-                if dx > max_check_dist or dy > max_check_dist:
-                    if not self.is_dodging or not dodge_pos or \
-                       abs(bullet_pos.x - dodge_pos.x) > max_check_dist or \
-                       abs(bullet_pos.y - dodge_pos.y) > max_check_dist:
-                        continue
-                
-                # Check collision with player's current position if not dodging
-                if not self.is_dodging:
-                    # Use squared distance for performance (avoids square root)
-                    dx = bullet_pos.x - current_pos.x
-                    dy = bullet_pos.y - current_pos.y
-                    dist_sq = dx*dx + dy*dy
-                    collision_width_sq = collision_width * collision_width
-                    
-                    if dist_sq < collision_width_sq:
-                        damage = bullet.damage * bullet.speed if bullet.attack_name == 'Gunman Exploding-Laser' else bullet.damage
-                        self.take_damage(damage, bullet_pos)
-                        Stats().record('dmg_income',
-                                      attack_name=bullet.attack_name,
-                                      damage=bullet.damage)
-                        bullet.kill()
-                        continue
-                
-                # If player is dodging, check for dodge evasion (collision with original position)
-                elif dodge_pos:
-                    try:
-                        # Skip already counted projectiles
-                        if bullet.dodge_counted_by != id(self):
-                            dx = bullet_pos.x - dodge_pos.x
-                            dy = bullet_pos.y - dodge_pos.y
-                            dist_sq = dx*dx + dy*dy
-                            dodge_width_sq = dodge_width * dodge_width
-                            
-                            if dist_sq < dodge_width_sq:
-                                self.dodge_damage_evaded += bullet.damage
-                                bullet.dodge_counted_by = id(self)
-                                # Add to processed set
-                                bullet_cache.add(bullet)
-                    except (AttributeError, KeyError):
-                        pass
+        events = self.game.collision_events
+
+        # While dodging, bullets crossing the dodge start count as evaded instead of hitting
+        if self.is_dodging:
+            dodge_pos = self.dodge_start_position
+            circles = [(dodge_pos if dodge_pos else None, self.width, None)]
+            evaded, = CollisionStage.hits(circles, self.COLLISION_MASK)
+            for bullet in evaded:
+                events.emit(CollisionEvents.DODGE, bullet, bullet.damage)
+            return
+
+        # Gathered with a wide margin, so the candidates still cover the player after a hit lifts it
+        candidates = CollisionStage.gather([(self.position, self.width, self.previous_position)],
+                                           self.COLLISION_MASK)
+        while candidates:
+            tested, candidates = candidates, None
+            tested_pos = Vector2(self.position)
+            hits, = CollisionStage.test([(tested_pos, self.width/3, self.previous_position)], tested)
+            for bullet in hits:
+                # Skip bullets evaded by a dodge that a jump cut short
+                if bullet in bullet_cache:
+                    continue
+                damage = bullet.damage * bullet.speed if bullet.attack_id == Projectile.attack_id_of('Gunman Exploding-Laser') else bullet.damage
+                if self.take_damage(damage, bullet.position):
+                    events.emit(CollisionEvents.PLAYER_DAMAGED, bullet.attack_name, damage)
+                events.emit(CollisionEvents.PLAYER_HIT, bullet.attack_name, bullet.damage)
+                bullet.kill()
+
+                # Lifted off the ground by the hit: test the bullets after this one at the new position
+                if self.position != tested_pos:
+                    candidates = tested[tested.index(bullet) + 1:]
+                    break
 
     def __check_enemy_collisions(self):
         """Check for collisions with enemies"""
         if self.__is_invincible or not self.is_alive:
             return
-        
-        # IT WOULDN'T HAVE TO BE THIS MUCH IF THERE WERE NO STATS TRACKING
-        # AHHHHH
 
         # Store values locally for better performance
         dodge_pos = self.dodge_start_position
-        current_pos = self.position 
+        current_pos = self.position
         is_dodging = self.is_dodging
-        dodge_counted = self.dodge_counted_enemies
         player_radius = self.width/2
-            
+        events = self.game.collision_events
+
         for enemy in self.game.groups['enemies']:
             if enemy.is_alive:
                 enemy_pos = enemy.position
                 enemy_radius = enemy.width/3
                 collision_dist = player_radius + enemy_radius
-                
+                collision_dist_sq = collision_dist * collision_dist
+
                 # Check evasion if dodging
-                if is_dodging and dodge_pos and enemy not in dodge_counted:
+                if is_dodging and dodge_pos:
                     dx = enemy_pos.x - dodge_pos.x
                     dy = enemy_pos.y - dodge_pos.y
-                    dist_sq = dx*dx + dy*dy
-                    collision_dist_sq = collision_dist * collision_dist
-                    
-                    if dist_sq < collision_dist_sq:
-                        self.dodge_damage_evaded += enemy.BODY_DAMAGE
-                        dodge_counted.add(enemy)
-                
+                    if dx*dx + dy*dy < collision_dist_sq:
+                        events.emit(CollisionEvents.DODGE, enemy, enemy.BODY_DAMAGE)
+
                 # Check actual collision if not dodging
                 if not is_dodging:
                     dx = enemy_pos.x - current_pos.x
                     dy = enemy_pos.y - current_pos.y
-                    dist_sq = dx*dx + dy*dy
-                    collision_dist_sq = collision_dist * collision_dist
-                    
-                    if dist_sq < collision_dist_sq:
+                    if dx*dx + dy*dy < collision_dist_sq:
                         if enemy.name == 'Fencer' and enemy.is_dashing:
-                            self.take_damage(enemy.ATTACK_INFO['slash']['damage'], enemy_pos)
-                            Stats().record('dmg_income',
-                                            attack_name='Fencer Slash',
-                                            damage=enemy.BODY_DAMAGE)
+                            damage = enemy.ATTACK_INFO['slash']['damage']
+                            if self.take_damage(damage, enemy_pos):
+                                events.emit(CollisionEvents.PLAYER_DAMAGED, 'Fencer Slash', damage)
+                            events.emit(CollisionEvents.PLAYER_HIT, 'Fencer Slash', enemy.BODY_DAMAGE)
                         else:
-                            self.take_damage(enemy.BODY_DAMAGE, enemy_pos)
-                            Stats().record('dmg_income',
-                                            attack_name=enemy.name + ' ' + 'Body',
-                                            damage=enemy.BODY_DAMAGE)
+                            if self.take_damage(enemy.BODY_DAMAGE, enemy_pos):
+                                events.emit(CollisionEvents.PLAYER_DAMAGED, enemy.name + ' ' + 'Body', enemy.BODY_DAMAGE)
+                            events.emit(CollisionEvents.PLAYER_HIT, enemy.name + ' ' + 'Body', enemy.BODY_DAMAGE)
+
+    def count_evaded(self, source, damage):
+        """
+        Add the damage of a bullet or enemy evaded by the current dodge, counting each one once.
 
+        Args:
+            source: The evaded bullet or enemy
+            damage: Its damage
+        """
+        if isinstance(source, Projectile):
+            if source in self.last_processed_bullets or source.dodge_counted_by == id(self):
+                return
+            source.dodge_counted_by = id(self)
+            self.last_processed_bullets.add(source)
+        else:
+            if source in self.dodge_counted_enemies:
+                return
+            self.dodge_counted_enemies.add(source)
+        self.dodge_damage_evaded += damage
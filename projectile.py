@@ -1,61 +1,413 @@
 import pygame
+import numpy as np
 from pygame.math import Vector2
 from config import Config as C
 import math
 import random
-from datetime import datetime
+import itertools
+import operator
 from sounds import Sounds
+from rng import RNG
+from spatial import SpatialHash
+
+class ProjectileStore:
+    """
+    Struct-of-arrays storage for the physics state of every live projectile.
+
+    Positions, velocities, speed ranges, gravity, speed multipliers, damage,
+    radii, flags, attack ids and remaining bounces live in contiguous NumPy
+    arrays, so one step() moves, clamps, bounces and culls all projectiles
+    in a few vectorized passes. prev keeps each position from before the
+    last step, so collisions can test the path a projectile swept. Live
+    projectiles occupy slots 0..count-1; removing one moves the last
+    projectile into its slot. version changes whenever a projectile is added
+    or moved.
+    """
+    INITIAL_CAPACITY = 256
+
+    # Flag bits
+    FLAG_DEFLECTED = 1
+    FLAG_BOUNCES = 2      # Bounces off the screen edges instead of leaving the screen (Laser)
+    FLAG_SLOW_KILL = 4    # Dies once its speed drops to SLOW_SPEED or below (Laser)
+    SLOW_SPEED = 1
+
+    # Per-projectile arrays
+    FIELDS = ('pos', 'prev', 'vel', 'speed_min', 'speed_max', 'gravity', 'mul',
+              'damage', 'radius', 'flags', 'attack_id', 'bounces')
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.count = 0
+        self.capacity = 0
+        self.version = 0        # Bumped by every add and move
+        self.projectiles = []   # Projectile object of each live slot
+        self.attack_ids = {}    # Attack name -> int id stored in attack_id
+        self.attack_names = []  # Int id -> attack name
+        self.__resize(capacity)
+
+    def __resize(self, capacity):
+        """Grow every array to the given capacity, keeping live slots"""
+        def grow(old, shape, dtype):
+            new = np.zeros(shape, dtype=dtype)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            return new
+
+        self.pos = grow(getattr(self, 'pos', None), (capacity, 2), np.float64)
+        self.prev = grow(getattr(self, 'prev', None), (capacity, 2), np.float64)
+        self.vel = grow(getattr(self, 'vel', None), (capacity, 2), np.float64)
+        self.speed_min = grow(getattr(self, 'speed_min', None), capacity, np.float64)
+        self.speed_max = grow(getattr(self, 'speed_max', None), capacity, np.float64)
+        self.gravity = grow(getattr(self, 'gravity', None), capacity, np.float64)
+        self.mul = grow(getattr(self, 'mul', None), capacity, np.float64)
+        self.damage = grow(getattr(self, 'damage', None), capacity, np.float64)
+        self.radius = grow(getattr(self, 'radius', None), capacity, np.float64)
+        self.flags = grow(getattr(self, 'flags', None), capacity, np.uint8)
+        self.attack_id = grow(getattr(self, 'attack_id', None), capacity, np.int32)
+        self.bounces = grow(getattr(self, 'bounces', None), capacity, np.int32)
+        self.capacity = capacity
+
+    def attack_id_of(self, attack_name):
+        """Get the int id of an attack name, assigning a new one on first use"""
+        attack_id = self.attack_ids.get(attack_name)
+        if attack_id is None:
+            attack_id = self.attack_ids[attack_name] = len(self.attack_names)
+            self.attack_names.append(attack_name)
+        return attack_id
+
+    def add(self, projectile, position, velocity, speed_range, gravity, speed_multiplier,
+            damage, radius, flags, attack_id, bounces=0):
+        """
+        Store a new projectile.
+
+        Returns:
+            int: The projectile's slot
+        """
+        if self.count == self.capacity:
+            self.__resize(self.capacity * 2)
+
+        slot = self.count
+        self.pos[slot] = (position[0], position[1])
+        self.prev[slot] = self.pos[slot]
+        self.vel[slot] = (velocity[0], velocity[1])
+        self.speed_min[slot], self.speed_max[slot] = speed_range
+        self.gravity[slot] = gravity
+        self.mul[slot] = speed_multiplier
+        self.damage[slot] = damage
+        self.radius[slot] = radius
+        self.flags[slot] = flags
+        self.attack_id[slot] = attack_id
+        self.bounces[slot] = bounces
+        self.projectiles.append(projectile)
+        self.count += 1
+        self.version += 1
+        return slot
+
+    def remove(self, slot):
+        """
+        Free a slot by moving the last live projectile into it.
+
+        Returns:
+            Projectile: The projectile now in the slot, or None if the last slot was freed
+        """
+        last = self.count - 1
+        moved = None
+        if slot != last:
+            for field in self.FIELDS:
+                array = getattr(self, field)
+                array[slot] = array[last]
+            moved = self.projectiles[last]
+            self.projectiles[slot] = moved
+        self.projectiles.pop()
+        self.count -= 1
+        return moved
+
+    def clear(self):
+        """Drop every projectile."""
+        self.projectiles.clear()
+        self.count = 0
+
+    def step(self, width, height, floor_height):
+        """
+        Advance every projectile by one frame.
+
+        Applies the speed multiplier, gravity and velocity, clamps speeds to
+        each projectile's range, bounces FLAG_BOUNCES projectiles off the
+        screen edges (one edge per frame) and finds the ones to remove.
+
+        Returns:
+            tuple: (slots that bounced, slots that are out of bounds, out of bounces or too slow)
+        """
+        n = self.count
+        if n == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        self.version += 1
+        pos, vel = self.pos[:n], self.vel[:n]
+        self.prev[:n] = pos
+
+        # Physics
+        vel *= self.mul[:n, None]
+        vel[:, 1] += self.gravity[:n]
+        pos += vel
+
+        # Clamp speed to [speed_min, speed_max]; stationary projectiles stay still
+        speed = np.hypot(vel[:, 0], vel[:, 1])
+        moving = speed != 0
+        clamped = np.clip(speed, self.speed_min[:n], self.speed_max[:n])
+        vel *= np.divide(clamped, speed, out=np.ones(n), where=moving)[:, None]
+        speed = np.where(moving, clamped, 0)
+
+        x, y = pos[:, 0], pos[:, 1]
+        ground = height - floor_height
+        flags = self.flags[:n]
+        bouncer = (flags & self.FLAG_BOUNCES) != 0
+
+        # Projectiles that do not bounce die off screen or below the floor
+        removed = ~bouncer & ((x < -100) | (x > width + 100) | (y > height + 100) |
+                              (y + self.radius[:n] / 2 > ground + 100))
+
+        # Edge bounces, checked in order left, right, top, ground
+        bounced = np.zeros(n, dtype=bool)
+        if bouncer.any():
+            bounces = self.bounces[:n]
+            bouncing = bouncer & (bounces > 0)
+            left = bouncing & (x <= 0)
+            right = bouncing & ~left & (x >= width)
+            top = bouncing & ~left & ~right & (y <= 0)
+            bottom = bouncing & ~left & ~right & ~top & (y >= ground)
+            bounced = left | right | top | bottom
+            if bounced.any():
+                x[left] = 0
+                vel[left, 0] = np.abs(vel[left, 0])
+                x[right] = width
+                vel[right, 0] = -np.abs(vel[right, 0])
+                y[top] = 0
+                vel[top, 1] = np.abs(vel[top, 1])
+                y[bottom] = ground
+                vel[bottom, 1] = -np.abs(vel[bottom, 1])
+                bounces[bounced] -= 1
+            removed |= bouncing & (bounces <= 0)
+            removed |= ((flags & self.FLAG_SLOW_KILL) != 0) & (speed <= self.SLOW_SPEED)
+
+        return np.flatnonzero(bounced), np.flatnonzero(removed)
 
 class Projectile(pygame.sprite.Sprite):
-    def __init__(self, 
-                 position=Vector2(0, 0),        # Starting position
-                 velocity=Vector2(0, 0),        # Initial velocity vector
-                 game=None,                     # Game reference
-                 damage=10,                     # Damage dealt
-                 radius=10,                     # Collision radius 
-                 speed_multiplier=1.0,          # Speed change per frame
-                 speed_range=(0, math.inf),     # Min/max speed
-                 gravity=0,                     # Gravity effect
-                 surfacesize=None,              # Size of surface for drawing
-                 deflected=False,
-                 attack_name=''):              # Whether this is deflected
+    """
+    Base projectile sprite.
+
+    Physics state lives in the shared Projectile.store; position, velocity
+    and the other physics attributes are properties backed by the store, so
+    assign to them instead of mutating them in place. Once a projectile is
+    killed its last state is copied back onto the object.
+
+    Killed projectiles go back to a per-type pool and spawn() hands them out
+    again through reset(), keeping their surfaces when the size matches.
+    Do not hold on to a projectile after it is killed: it may come back as
+    a new one. Compare serial numbers to tell the two apart.
+
+    Projectile attributes (and the sprite's group set) are kept in
+    __slots__. pygame.sprite.Sprite has no __slots__ of its own, so every
+    instance still has a __dict__; it just stays empty. Attacks are int ids
+    into the store's attack names and deflections are stamped with
+    Projectile.tick, the number of update_all() calls so far.
+    """
+    __slots__ = ('_Sprite__g', 'image', 'rect', 'game', 'color', 'surface_size', 'serial',
+                 '__slot', '__detached', '__pooled', '__scratch', '__is_deflected', '__attack_id',
+                 '__deflect_tick', '__deflect_id', '__damage_recorded', '__dodge_counted_by')
+
+    COLOR_SET = {'red': (230, 49, 49), 'blue': (0, 100, 255)}
+
+    # Class attributes for the shared physics store and to turn off drawing (headless runs)
+    store = ProjectileStore()
+    drawing = True
+    tick = 0                        # Calls of update_all() so far
+
+    # Collision layers, as bits of a collider's mask
+    LAYER_HOSTILE = 1               # Fired by enemies, hits the knife and the player
+    LAYER_DEFLECTED = 2             # Deflected by the knife, hits enemies
+    LAYERS = (LAYER_HOSTILE, LAYER_DEFLECTED)
+
+    # Class attributes for a spatial hash of the live projectiles of each layer, rebuilt when the store changes
+    GRID_MIN_COUNT = 64             # Below this many projectiles, near() scans the layers instead
+    grids = {layer: SpatialHash(C.WINDOW_WIDTH, C.WINDOW_HEIGHT) for layer in LAYERS}
+    reach = {layer: 0.0 for layer in LAYERS}  # Longest distance a projectile of each layer moved in the last step
+    __grid_version = -1
+
+    # Class attributes to store killed projectiles per type and pool statistics
+    MAX_POOLED = 256                # Maximum killed projectiles kept per type
+    pools = {}                      # Projectile class -> killed instances ready for reuse
+    pool_hits = {}                  # Class name -> spawns served from the pool
+    pool_misses = {}                # Class name -> spawns that constructed a new projectile
+    __serials = itertools.count(1)
+    __by_serial = operator.attrgetter('serial')
+
+    def __init__(self, *args, **kwargs):
+        """Create a projectile; arguments are those of reset()"""
         super().__init__()
-        
-        self.__tag = {'attack_name': attack_name,
-                      'deflect_timestamp': None,
-                      'deflect_id': None,
-                      'damage_recorded': False,
-                      'dodge_counted_by': None}
+        self.image = None
+        self.__scratch = None
+        self.__slot = None
+        self.__pooled = False
+        self.reset(*args, **kwargs)
+
+    @classmethod
+    def spawn(cls, **kwargs):
+        """
+        Get a projectile of this type, reusing a killed one when available.
+
+        Args:
+            **kwargs: Arguments of the type's reset()
+
+        Returns:
+            Projectile: The spawned projectile
+        """
+        name = cls.__name__
+        pool = Projectile.pools.get(cls)
+        if pool:
+            Projectile.pool_hits[name] = Projectile.pool_hits.get(name, 0) + 1
+            projectile = pool.pop()
+            projectile.reset(**kwargs)
+            return projectile
+
+        Projectile.pool_misses[name] = Projectile.pool_misses.get(name, 0) + 1
+        return cls(**kwargs)
+
+    def reset(self, 
+              position=Vector2(0, 0),        # Starting position
+              velocity=Vector2(0, 0),        # Initial velocity vector
+              game=None,                     # Game reference
+              damage=10,                     # Damage dealt
+              radius=10,                     # Collision radius 
+              speed_multiplier=1.0,          # Speed change per frame
+              speed_range=(0, math.inf),     # Min/max speed
+              gravity=0,                     # Gravity effect
+              surfacesize=None,              # Size of surface for drawing
+              deflected=False,
+              attack_name='',
+              flags=0,                       # Extra ProjectileStore flags
+              bounces=0):                    # Edge bounces left (with FLAG_BOUNCES)
+        """(Re)initialize the projectile as a new, live one"""
+        self.__pooled = False
+        self.serial = next(Projectile.__serials)  # Unique per spawn, so stale references can be detected
+
+        # Stats metadata
+        self.__attack_id = Projectile.store.attack_id_of(attack_name)
+        self.__deflect_tick = None
+        self.__deflect_id = None
+        self.__damage_recorded = False
+        self.__dodge_counted_by = None
+
+        # Physics state in the shared store
+        self.detach()
+        self.__detached = None
+        self.__slot = Projectile.store.add(self, position, velocity, speed_range, gravity,
+                                           speed_multiplier, damage, radius, flags, self.__attack_id, bounces)
 
         # Basic attributes
-        self.position = position
-        self.velocity = velocity
-        self.damage = damage
-        self.radius = radius
-        self.DEFLECTED_VELOCITY = self.velocity * 1.1
-        self.SPEED_RANGE = speed_range
         self.is_deflected = deflected
-        self.COLOR_SET = {'red': (230, 49, 49), 'blue': (0, 100, 255)}
         self.color = self.COLOR_SET['blue'] if self.is_deflected else self.COLOR_SET['red']
         self.game = game
 
-        # Physics attributes
-        self.GRAVITY = gravity
-        self.SPEED_MULTIPLIER = speed_multiplier
-        
-        # State
-        self.alive = True
-
-        # Draw
+        # Draw, reusing the surfaces of a recycled projectile of the same size
         self.surface_size = surfacesize if surfacesize is not None else radius * 2
-        self.image = pygame.Surface((self.surface_size, self.surface_size), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(center=(self.position.x, self.position.y))
+        size = (int(self.surface_size), int(self.surface_size))
+        if self.image is None or self.image.get_size() != size:
+            self.image = pygame.Surface(size, pygame.SRCALPHA)
+            self.__scratch = None
+        else:
+            self.image.fill((0, 0, 0, 0))
+        self.rect = self.image.get_rect(center=(position[0], position[1]))
 
         # Add to game groups if game is provided
         if self.game:
             self.game.groups['bullets'].add(self)
             self.game.groups['all'].add(self)
 
+    def __get(self, field):
+        """Read a physics field from the store, or from the detached copy once killed"""
+        if self.__slot is None:
+            return self.__detached[field]
+        return getattr(Projectile.store, field)[self.__slot]
+
+    def __set(self, field, value):
+        """Write a physics field to the store, or to the detached copy once killed"""
+        if self.__slot is None:
+            self.__detached[field] = value
+        else:
+            getattr(Projectile.store, field)[self.__slot] = value
+
+    @property
+    def slot(self):
+        """Get the projectile's slot in the store (None once killed)"""
+        return self.__slot
+
+    @property
+    def position(self):
+        return Vector2(self.__get('pos').tolist())
+
+    @position.setter
+    def position(self, value):
+        """Move the projectile, as a jump: it sweeps no path to the new position"""
+        self.__set('pos', (value[0], value[1]))
+        self.__set('prev', (value[0], value[1]))
+        Projectile.store.version += 1
+
+    @property
+    def velocity(self):
+        return Vector2(self.__get('vel').tolist())
+
+    @velocity.setter
+    def velocity(self, value):
+        self.__set('vel', (value[0], value[1]))
+
+    @property
+    def damage(self):
+        return float(self.__get('damage'))
+
+    @damage.setter
+    def damage(self, value):
+        self.__set('damage', value)
+
+    @property
+    def radius(self):
+        return float(self.__get('radius'))
+
+    @radius.setter
+    def radius(self, value):
+        self.__set('radius', value)
+
+    @property
+    def GRAVITY(self):
+        return float(self.__get('gravity'))
+
+    @GRAVITY.setter
+    def GRAVITY(self, value):
+        self.__set('gravity', value)
+
+    @property
+    def SPEED_MULTIPLIER(self):
+        return float(self.__get('mul'))
+
+    @SPEED_MULTIPLIER.setter
+    def SPEED_MULTIPLIER(self, value):
+        self.__set('mul', value)
+
+    @property
+    def SPEED_RANGE(self):
+        """(min, max) speed; assign a new pair to change it"""
+        return (float(self.__get('speed_min')), float(self.__get('speed_max')))
+
+    @SPEED_RANGE.setter
+    def SPEED_RANGE(self, value):
+        self.__set('speed_min', value[0])
+        self.__set('speed_max', value[1])
+
+    @property
+    def bounces(self):
+        return int(self.__get('bounces'))
+
+    @bounces.setter
+    def bounces(self, value):
+        self.__set('bounces', value)
 
     @property
     def is_deflected(self):
@@ -63,107 +415,308 @@ class Projectile(pygame.sprite.Sprite):
     
     @is_deflected.setter
     def is_deflected(self, value):
+        """Set the deflected state, moving the projectile to the matching collision layer"""
         self.__is_deflected = value
+        flags = int(self.__get('flags'))
+        if bool(flags & ProjectileStore.FLAG_DEFLECTED) != bool(value):
+            self.__set('flags', flags ^ ProjectileStore.FLAG_DEFLECTED)
+            self.__set('prev', self.__get('pos').copy())  # The path swept so far belongs to the old layer
+            Projectile.store.version += 1  # The layer grids are stale
         if value:
-            self.__tag['deflect_timestamp'] = datetime.now()
+            self.__deflect_tick = Projectile.tick
         self.deflect_action()
 
+    @property
+    def layer(self):
+        """Get the collision layer the projectile is in"""
+        return Projectile.LAYER_DEFLECTED if self.__is_deflected else Projectile.LAYER_HOSTILE
+
+    @property
+    def attack_id(self):
+        return self.__attack_id
+
     @property
     def attack_name(self):
-        return self.__tag['attack_name']
+        return Projectile.store.attack_names[self.__attack_id]
+
+    @staticmethod
+    def random_stream(game):
+        """Projectile random stream of a game, or the random module for projectiles without a game"""
+        return game.rng.stream(RNG.PROJECTILES) if game is not None else random
+
+    @classmethod
+    def attack_id_of(cls, attack_name):
+        """Get the int id of an attack name, for comparing against attack_id"""
+        return cls.store.attack_id_of(attack_name)
+
+    @property
+    def deflect_tick(self):
+        """Projectile.tick of the last deflection, or None if never deflected"""
+        return self.__deflect_tick
 
     @property
     def deflect_id(self):
-        return self.__tag['deflect_id']
+        return self.__deflect_id
     
     @deflect_id.setter
     def deflect_id(self, value):
-        self.__tag['deflect_id'] = value
+        self.__deflect_id = value
     
     @property
     def damage_recorded(self):
-        return self.__tag['damage_recorded']
+        return self.__damage_recorded
     
     @damage_recorded.setter
     def damage_recorded(self, value:bool):
-        self.__tag['damage_recorded'] = value
+        self.__damage_recorded = value
 
     @property
     def dodge_counted_by(self):
-        return self.__tag['dodge_counted_by']
+        return self.__dodge_counted_by
     
     @dodge_counted_by.setter
     def dodge_counted_by(self, value):
-        self.__tag['dodge_counted_by'] = value
+        self.__dodge_counted_by = value
 
     @property
     def speed(self):
-        return self.velocity.length()
+        vx, vy = self.__get('vel')
+        return math.hypot(vx, vy)
 
     def deflect_action(self):
         """ Do something when deflected, in case extra actions are needed"""
         pass
 
-    def check_bounds(self):
-        """Check if projectile is out of screen bounds or has hit the ground"""
-        # Check if projectile is out of screen bounds
-        if (self.position.x < -100 or 
-            self.position.x > C.WINDOW_WIDTH + 100 or 
-            self.position.y > C.WINDOW_HEIGHT + 100):
-            return True
-            
-        # Check if projectile has hit the ground
-        if self.position.y + self.radius/2 > C.WINDOW_HEIGHT - C.FLOOR_HEIGHT + 100:
-            return True
-            
-        return False
-    
+    def on_bounce(self):
+        """ Do something when bouncing off a screen edge, override by child class"""
+        pass
+
     def draw(self):
         """Draw projectile, override by child class"""
         self.color = self.COLOR_SET['blue'] if self.is_deflected else self.COLOR_SET['red']
 
-    def __apply_physics(self):
-        """Apply physics to projectile"""
-        self.velocity *= self.SPEED_MULTIPLIER
-        self.velocity.y += self.GRAVITY
-        self.position += self.velocity
-        self.rect.center = self.position
-
-        if self.speed != 0:
-            self.velocity.clamp_magnitude_ip(self.SPEED_RANGE[0], self.SPEED_RANGE[1])
+    def steer(self):
+        """Per-projectile behavior run before the physics step, override by child class"""
+        pass
 
     def update(self):
-        """Update projectile position and check bounds"""
-        if not self.alive:
+        """Projectiles are advanced together by Projectile.update_all()"""
+        pass
+
+    def detach(self):
+        """Copy this projectile's state out of the store and free its slot"""
+        if self.__slot is None:
+            return
+        store = Projectile.store
+        slot = self.__slot
+        self.__detached = {field: getattr(store, field)[slot].copy() for field in ProjectileStore.FIELDS}
+        self.__slot = None
+        moved = store.remove(slot)
+        if moved is not None:
+            moved.__slot = slot
+
+    def attach(self):
+        """Put a detached projectile's state back into the store (used when restoring a snapshot)"""
+        if self.__slot is not None:
             return
+        physics = self.__detached
+        self.__slot = Projectile.store.add(self, physics['pos'], physics['vel'],
+                                           (physics['speed_min'], physics['speed_max']), physics['gravity'],
+                                           physics['mul'], physics['damage'], physics['radius'],
+                                           physics['flags'], physics['attack_id'], physics['bounces'])
+        self.__detached = None
 
-        # if round(self.velocity.length(), 1) == 0:
-        #     self.kill()
+    def __getstate__(self):
+        """State for pickling: every slot, with the physics state copied out of the store (detached)"""
+        state = {}
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                attribute = f"_{cls.__name__}{name}" if name.startswith('__') else name
+                if hasattr(self, attribute):
+                    state[attribute] = getattr(self, attribute)
+        state['_Projectile__detached'] = {field: self.__get(field).tolist() for field in ProjectileStore.FIELDS}
+        state['_Projectile__slot'] = None
+        state['_Projectile__scratch'] = None
+        state['attack_name'] = self.attack_name  # Attack ids are only valid within one process
+        return state
 
-        self.__apply_physics()
-        if self.check_bounds():
-            self.kill()
-        self.draw()
+    def __setstate__(self, state):
+        """Restore a pickled projectile, detached; attach() puts it back into the store"""
+        state = state.copy()
+        attack_name = state.pop('attack_name')
+        for attribute, value in state.items():
+            setattr(self, attribute, value)
+        self.__attack_id = Projectile.store.attack_id_of(attack_name)
+        self.__detached['attack_id'] = self.__attack_id
+
+        # Keep serials unique among restored and newly spawned projectiles
+        next_serial = next(Projectile.__serials)
+        Projectile.__serials = itertools.count(max(next_serial, self.serial + 1))
+
+    def kill(self):
+        """Remove the projectile from all groups and from the physics store, then pool it"""
+        self.detach()
+        super().kill()
+        self.release()
+
+    def release(self):
+        """Put a killed projectile in its type's pool for spawn() to reuse"""
+        if self.__pooled or self.alive():
+            return
+        pool = Projectile.pools.setdefault(type(self), [])
+        if len(pool) < Projectile.MAX_POOLED:
+            self.__pooled = True
+            pool.append(self)
+
+    def scratch_surface(self):
+        """
+        Get a cleared scratch surface the size of the image, kept across frames and spawns.
+
+        Returns:
+            Surface: The projectile's scratch surface (overwritten by the next call)
+        """
+        if self.__scratch is None:
+            self.__scratch = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
+        else:
+            self.__scratch.fill((0, 0, 0, 0))
+        return self.__scratch
+
+    @classmethod
+    def update_all(cls):
+        """
+        Advance every live projectile by one frame.
+
+        Runs each projectile's steer(), then one vectorized physics, bounce
+        and culling pass over the store, then kills the culled projectiles
+        and updates rects and drawings of the rest.
+        """
+        Projectile.tick += 1
+        store = cls.store
+        for projectile in [p for p in store.projectiles if type(p).steer is not Projectile.steer]:
+            projectile.steer()
+
+        bounced, culled = store.step(C.WINDOW_WIDTH, C.WINDOW_HEIGHT, C.FLOOR_HEIGHT)
+        for slot in bounced:
+            store.projectiles[slot].on_bounce()
+        for projectile in [store.projectiles[slot] for slot in culled]:
+            projectile.kill()
+        if store.count >= cls.GRID_MIN_COUNT:
+            cls.refresh_grid()  # Built once per step, ahead of the collision checks
+
+        # Rects only position the drawing, so headless runs skip both
+        if not cls.drawing:
+            return
+        for projectile, center in zip(store.projectiles, store.pos[:store.count].tolist()):
+            projectile.rect.center = center
+            projectile.draw()
+
+    @classmethod
+    def layer_slots(cls, layer):
+        """
+        Get the store slots of the live projectiles in a collision layer.
+
+        Returns:
+            ndarray: The slots, ascending
+        """
+        store = cls.store
+        deflected = (store.flags[:store.count] & ProjectileStore.FLAG_DEFLECTED) != 0
+        return np.flatnonzero(deflected if layer == cls.LAYER_DEFLECTED else ~deflected)
+
+    @classmethod
+    def refresh_grid(cls):
+        """Rebuild the layer spatial hashes if projectiles were added, moved or changed layer since they were built"""
+        store = cls.store
+        if Projectile.__grid_version != store.version:
+            n = store.count
+            projectiles = list(store.projectiles)  # Shared by the grids, the store's list changes
+            deflected = (store.flags[:n] & ProjectileStore.FLAG_DEFLECTED) != 0
+            moved = store.pos[:n] - store.prev[:n]
+            moved = np.hypot(moved[:, 0], moved[:, 1])
+            for layer, slots in ((cls.LAYER_HOSTILE, np.flatnonzero(~deflected)),
+                                 (cls.LAYER_DEFLECTED, np.flatnonzero(deflected))):
+                cls.grids[layer].build(store.pos, projectiles, slots)
+                cls.reach[layer] = float(moved[slots].max()) if len(slots) else 0.0
+            Projectile.__grid_version = store.version
+
+    @classmethod
+    def near(cls, circles, layers):
+        """
+        Get the live projectiles of some layers that may have touched any of some circles in the last step.
+
+        Only the spatial hashes of the given layers are searched, widened by
+        how far their projectiles moved in the step. The result is a superset
+        (whole grid cells are returned), so callers still test distances.
+        Projectiles are in spawn order, the order of the bullets group.
+
+        Args:
+            circles: (center, radius) pairs, center being an (x, y) point
+            layers: Mask of the layers to search (LAYER_* bits)
+
+        Returns:
+            list: The projectiles
+        """
+        store = cls.store
+        layers = [layer for layer in cls.LAYERS if layer & layers]
+        if store.count < cls.GRID_MIN_COUNT:
+            found = [store.projectiles[slot] for layer in layers for slot in cls.layer_slots(layer).tolist()]
+        else:
+            cls.refresh_grid()
+            found = []
+            for layer in layers:
+                grid, reach = cls.grids[layer], cls.reach[layer]
+                for center, radius in circles:
+                    found.extend(grid.query_radius(center, radius + reach))
+            if len(circles) > 1:
+                found = set(found)
+        found = [projectile for projectile in found if projectile.alive()]
+        found.sort(key=Projectile.__by_serial)
+        return found
+
+    @classmethod
+    def clear_all(cls):
+        """Detach every live projectile without killing it (no kill side effects)"""
+        for projectile in list(cls.store.projectiles):
+            projectile.detach()
+
+    @classmethod
+    def clear_pools(cls):
+        """Drop every pooled projectile and reset the pool statistics"""
+        cls.pools.clear()
+        cls.pool_hits.clear()
+        cls.pool_misses.clear()
+
+    @classmethod
+    def pool_stats(cls):
+        """
+        Returns:
+            dict: Class name -> (hits, misses, pooled count)
+        """
+        names = set(cls.pool_hits) | set(cls.pool_misses) | {pool_type.__name__ for pool_type in cls.pools}
+        pooled = {pool_type.__name__: len(pool) for pool_type, pool in cls.pools.items()}
+        return {name: (cls.pool_hits.get(name, 0), cls.pool_misses.get(name, 0), pooled.get(name, 0))
+                for name in sorted(names)}
 
 
 class Ball(Projectile):
+    __slots__ = ()
+
     STRETCH_THRESHOLD = 8
     MAX_STRETCH_RATIO = 2.5
     MIN_SQUASH_RATIO = 0.85
 
-    def __init__(self, 
-                 position=Vector2(0, 0),
-                 velocity=Vector2(0, 0),
-                 game=None,
-                 damage=33,
-                 radius=10,
-                 speed_multiplier=1.0,
-                 deflected=False,
-                 attack_name=''):
+    def reset(self, 
+              position=Vector2(0, 0),
+              velocity=Vector2(0, 0),
+              game=None,
+              damage=33,
+              radius=10,
+              speed_multiplier=1.0,
+              deflected=False,
+              attack_name=''):
 
         surfacesize = int(radius * 2 * self.MAX_STRETCH_RATIO)
         
-        super().__init__(
+        super().reset(
             position=position,
             velocity=velocity,
             game=game,
@@ -183,6 +736,8 @@ class Ball(Projectile):
         """Draw the ball with current color, stretching based on velocity"""
         # Call parent draw for color updates
         super().draw()
+        if not Projectile.drawing:
+            return
 
         # Clear the surface
         self.image.fill((0, 0, 0, 0))
@@ -200,7 +755,7 @@ class Ball(Projectile):
             a = self.radius * stretch_factor
             b = self.radius * squash_factor
 
-            ellipse_surface = pygame.Surface((self.surface_size, self.surface_size), pygame.SRCALPHA)
+            ellipse_surface = self.scratch_surface()
             ellipse_rect = pygame.Rect(
                 center[0] - a,
                 center[1] - b,
@@ -217,25 +772,30 @@ class Ball(Projectile):
 
 
 class Shard(Projectile):
+    __slots__ = ('base', 'height', 'angle', 'DEFLECTED_SPIN', 'spin_speed', 'spawn_animation',
+                 'spawn_scale', 'original_base', 'original_height')
+
     SCALE_DECREASE_RATE = 0.07  # How fast it returns to normal size
     NORMAL_SPIN = 3
-    def __init__(self, 
-                 position=Vector2(0, 0),
-                 velocity=Vector2(0, 0),
-                 game=None,
-                 damage=33,
-                 gravity=0,
-                 deflected=False,
-                 attack_name=''):
+    MIN_SCALE = 1.0             # Normal size
+    def reset(self, 
+              position=Vector2(0, 0),
+              velocity=Vector2(0, 0),
+              game=None,
+              damage=33,
+              gravity=0,
+              deflected=False,
+              attack_name=''):
         
         # Shard-specific attributes
-        self.base = random.randint(20, 30)
-        self.height = random.randint(20, 45)
+        rng = Projectile.random_stream(game)
+        self.base = rng.randint(20, 30)
+        self.height = rng.randint(20, 45)
         radius = (self.base + self.height) / 4
         surfacesize = int(max(self.base, self.height) * 2)
 
         # Call parent constructor with calculated parameters
-        super().__init__(
+        super().reset(
             position=position, 
             velocity=velocity, 
             game=game,
@@ -250,14 +810,13 @@ class Shard(Projectile):
         )
         
         # Rotation attributes
-        self.angle = random.uniform(0, 360)
-        self.DEFLECTED_SPIN = random.uniform(10, 15)
+        self.angle = rng.uniform(0, 360)
+        self.DEFLECTED_SPIN = rng.uniform(10, 15)
         self.spin_speed = self.NORMAL_SPIN
 
         # Spawn animation attributes
         self.spawn_animation = True
         self.spawn_scale = 2.0  # Start 80% larger
-        self.min_scale = 1.0  # Normal size
         
         # Save original base and height values
         self.original_base = self.base
@@ -278,6 +837,8 @@ class Shard(Projectile):
     def draw(self):
         """Draw the shard as a triangle"""
         super().draw()
+        if not Projectile.drawing:
+            return
 
         self.image.fill((0, 0, 0, 0))
         center = (self.surface_size/2, self.surface_size/2)
@@ -292,52 +853,51 @@ class Shard(Projectile):
              center[1] + math.sin(angle_rad) * self.base/2)
         ]
         
-        shard_surface = pygame.Surface((self.surface_size, self.surface_size), pygame.SRCALPHA)
+        shard_surface = self.scratch_surface()
         pygame.draw.polygon(self.image, self.color, points)
         rotated_surface = pygame.transform.rotate(shard_surface, -angle_rad)
         rotated_rect = rotated_surface.get_rect(center=center)
         self.image.blit(rotated_surface, rotated_rect)
     
-    def update(self):
-        """Update shard position, rotation, and check bounds"""
+    def steer(self):
+        """Update shard rotation, deflected gravity and spawn animation"""
         # Update rotation
         self.angle += self.spin_speed
         
         # Apply gravity only if deflected
         if self.is_deflected and self.GRAVITY == 0:
-            self.GRAVITY = random.uniform(0.2, 0.5)
+            self.GRAVITY = Projectile.random_stream(self.game).uniform(0.2, 0.5)
             self.spin_speed = self.DEFLECTED_SPIN
         
         # Update spawn animation
         if self.spawn_animation:
             self.spawn_scale -= self.SCALE_DECREASE_RATE
-            if self.spawn_scale <= self.min_scale:
-                self.spawn_scale = self.min_scale
+            if self.spawn_scale <= self.MIN_SCALE:
+                self.spawn_scale = self.MIN_SCALE
                 self.spawn_animation = False
             self._apply_scale()
 
-        super().update()
-
 class Laser(Projectile):
+    __slots__ = ('target', 'laser_type', 'turn_rate', 'bomb_info')
+
     STRETCH_THRESHOLD = 5
 
-    def __init__(self, 
-                 position=Vector2(0, 0),
-                 velocity=Vector2(0, 0),
-                 game=None,
-                 damage=33,
-                 radius=10,
-                 speed_multiplier=1.0,
-                 bounce_limit=0,
-                 deflected=False,
-                 laser_type='normal',
-                 target=None,
-                 turn_rate=0.0,
-                 bomb_info={},
-                 attack_name=''):
+    def reset(self, 
+              position=Vector2(0, 0),
+              velocity=Vector2(0, 0),
+              game=None,
+              damage=33,
+              radius=10,
+              speed_multiplier=1.0,
+              bounce_limit=0,
+              deflected=False,
+              laser_type='normal',
+              target=None,
+              turn_rate=0.0,
+              bomb_info={},
+              attack_name=''):
         
         # Laser-specific attributes
-        self.bounces = bounce_limit + 1
         self.target = target
         self.laser_type = laser_type
         self.turn_rate = turn_rate
@@ -347,7 +907,7 @@ class Laser(Projectile):
         surfacesize = int(radius * 20)
         
         # Call parent constructor with laser-specific parameters
-        super().__init__(
+        super().reset(
             position=position, 
             velocity=velocity,
             game=game, 
@@ -358,7 +918,9 @@ class Laser(Projectile):
             gravity=0,
             surfacesize=surfacesize,
             deflected=deflected,
-            attack_name=attack_name
+            attack_name=attack_name,
+            flags=ProjectileStore.FLAG_BOUNCES | ProjectileStore.FLAG_SLOW_KILL,
+            bounces=bounce_limit + 1
         )
         
         # Set up the surface for drawing
@@ -367,6 +929,8 @@ class Laser(Projectile):
     def draw(self):
         """Draw the laser as a rectangle that stretches based on velocity"""
         super().draw()
+        if not Projectile.drawing:
+            return
         
         # Clear the surface
         self.image.fill((0, 0, 0, 0))
@@ -382,7 +946,7 @@ class Laser(Projectile):
         b = self.radius
         
         # Create a rectangle surface
-        rect_surface = pygame.Surface((self.surface_size, self.surface_size), pygame.SRCALPHA)
+        rect_surface = self.scratch_surface()
         rect = pygame.Rect(
             center[0] - a,
             center[1] - b,
@@ -398,41 +962,10 @@ class Laser(Projectile):
         rotated_rect = rotated_surface.get_rect(center=center)
         self.image.blit(rotated_surface, rotated_rect)
     
-    def check_bounds(self):
-        """Check if projectile is out of bounds and handle bouncing if enabled"""
-        if self.bounces > 0:
-            bounces = self.position.x <= 0 or self.position.x >= C.WINDOW_WIDTH or self.position.y <= 0 or self.position.y >= C.WINDOW_HEIGHT - C.FLOOR_HEIGHT
-            if self.attack_name == 'Gunman Bouncing-Laser' and bounces:
-                Sounds().play_sound_random(['e3_bounce1', 'e3_bounce2'])
-            # Bounce off left edge
-            if self.position.x <= 0:
-                self.position.x = 0
-                self.velocity.x = abs(self.velocity.x)  # Bounce right
-                self.bounces -= 1
-
-            # Bounce off right edge
-            elif self.position.x >= C.WINDOW_WIDTH:
-                self.position.x = C.WINDOW_WIDTH
-                self.velocity.x = -abs(self.velocity.x)  # Bounce left
-                self.bounces -= 1
-                
-            # Bounce off top edge
-            elif self.position.y <= 0:
-                self.position.y = 0
-                self.velocity.y = abs(self.velocity.y)  # Bounce down
-                self.bounces -= 1
-                
-            # Bounce off ground
-            elif self.position.y >= C.WINDOW_HEIGHT - C.FLOOR_HEIGHT:
-                self.position.y = C.WINDOW_HEIGHT - C.FLOOR_HEIGHT
-                self.velocity.y = -abs(self.velocity.y)  # Bounce up
-                self.bounces -= 1
-                
-            # Check if max bounces reached
-            if self.bounces <= 0:
-                return True
-                
-        return False
+    def on_bounce(self):
+        """Play the bounce sound of bouncing lasers (bounces are handled by the projectile store)"""
+        if self.attack_id == Projectile.attack_id_of('Gunman Bouncing-Laser'):
+            Sounds().play_sound_random(['e3_bounce1', 'e3_bounce2'])
 
     def deflect_action(self):
         """Retarget homing laser when deflected"""
@@ -440,7 +973,7 @@ class Laser(Projectile):
             enemies = [sprite for sprite in self.game.groups['enemies'] 
                       if sprite.alive]
             if enemies:
-                self.target = random.choice(enemies)
+                self.target = Projectile.random_stream(self.game).choice(enemies)
 
     def update_homing_laser(self):
         """Update homing laser to track its target"""
@@ -470,7 +1003,7 @@ class Laser(Projectile):
             rad_angle = math.radians(angle)
             explosion_dir = Vector2(math.cos(rad_angle), math.sin(rad_angle))
             
-            Laser(position=Vector2(self.position),
+            Laser.spawn(position=Vector2(self.position),
                 velocity=explosion_dir * b_info['explosion_speed'],
                 game=self.game,
                 damage=b_info['explosion_damage'],
@@ -479,15 +1012,10 @@ class Laser(Projectile):
                 deflected=self.is_deflected,
                 attack_name=self.attack_name)
         
-    def update(self):
-        """Update laser position, special behaviors, and check bounds"""
+    def steer(self):
+        """Turn homing lasers towards their target (lasers slowed to a stop are culled by the store)"""
         if self.laser_type == 'homing':
             self.update_homing_laser()
-            
-        super().update()
-        
-        if self.velocity.length() <= 1:
-            self.kill()
 
     def kill(self) -> None:
         """Handle special effects when laser is destroyed"""
@@ -0,0 +1,60 @@
+import random
+
+class RNG:
+    """
+    Seeded random number streams, one per subsystem.
+
+    Every stream is a random.Random seeded from the session seed and the
+    stream's name, so a subsystem drawing more or fewer numbers (e.g. the
+    camera shaking longer) never changes what another subsystem draws.
+    The same seed and the same input reproduce a run exactly.
+    """
+    # Streams used by the game
+    SPAWN = 'spawn'              # Enemy types, spawn positions and spawn times
+    AI = 'ai'                    # Enemy decisions (Enemy.random)
+    KNIFE = 'knife'              # Deflect aim error
+    PROJECTILES = 'projectiles'  # Shard shapes and spins, homing retargeting
+    CAMERA = 'camera'            # Camera shake
+
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed: Integer seed, or None for a random one
+        """
+        self.seed = seed if seed is not None else RNG.new_seed()
+        self.__streams = {}
+
+    @staticmethod
+    def new_seed():
+        """
+        Returns:
+            int: A fresh seed from the system's entropy source
+        """
+        return random.SystemRandom().randrange(2 ** 32)
+
+    def stream(self, name):
+        """
+        Get a subsystem's stream, creating it on first use.
+
+        Args:
+            name: Stream name (e.g. RNG.SPAWN)
+
+        Returns:
+            random.Random: The stream
+        """
+        stream = self.__streams.get(name)
+        if stream is None:
+            stream = self.__streams[name] = random.Random(f"{self.seed}:{name}")
+        return stream
+
+    def derive(self, index):
+        """
+        Make an independent RNG for a numbered sub-run (e.g. a game session).
+
+        Args:
+            index: Sub-run number
+
+        Returns:
+            RNG: A new RNG whose seed depends only on this seed and the index
+        """
+        return RNG(random.Random(f"{self.seed}/{index}").randrange(2 ** 32))
@@ -0,0 +1,191 @@
+import pygame
+import os
+import json
+import struct
+import hashlib
+import shutil
+
+class ScaleCache:
+    """
+    Persistent on-disk cache of animation frames already scaled to a target size.
+
+    Each (base_path, state, width, height) is stored as one file holding a
+    small JSON header and the raw RGBA pixels of every frame. The header
+    records the modification time and SHA-1 hash of every source file (the
+    PNG frames, plus the atlas files when the frames were sliced from the
+    atlas), so a warm start skips both PNG decoding and scaling while an
+    edited sprite or a rebuilt atlas invalidates its cached frames.
+    """
+    CACHE_DIR = os.path.join(".cache", "frames")
+    VERSION = 1
+    PIXEL_FORMAT = "RGBA"
+    HEADER_SIZE = struct.Struct("<I")  # Length prefix of the JSON header
+
+    enabled = True
+
+    @classmethod
+    def __cache_path(cls, base_path, state, width, height):
+        """Get the cache file path for one scaled animation state"""
+        key = f"{os.path.normpath(base_path)}|{state}|{width}x{height}"
+        name = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(cls.CACHE_DIR, name + ".bin")
+
+    @staticmethod
+    def __file_hash(path):
+        """SHA-1 hash of a file's contents"""
+        with open(path, 'rb') as source:
+            return hashlib.sha1(source.read()).hexdigest()
+
+    @classmethod
+    def __check_sources(cls, recorded, sources):
+        """
+        Check that the recorded source files match the current ones.
+
+        Files are compared by modification time first; only files whose
+        mtime changed are hashed, so an untouched tree costs one stat per file.
+
+        Returns:
+            list: The records with current modification times, or None if a source changed
+        """
+        if [path for path, _, _ in recorded] != [os.path.normpath(path) for path in sources]:
+            return None
+
+        current = []
+        for path, mtime, file_hash in recorded:
+            try:
+                new_mtime = os.path.getmtime(path)
+                if new_mtime != mtime and cls.__file_hash(path) != file_hash:
+                    return None
+            except OSError:
+                return None
+            current.append([path, new_mtime, file_hash])
+        return current
+
+    @classmethod
+    def __write(cls, cache_path, header, pixels):
+        """Write a cache file from its header and the raw pixels of every frame"""
+        header_bytes = json.dumps(header).encode()
+        os.makedirs(cls.CACHE_DIR, exist_ok=True)
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(cls.HEADER_SIZE.pack(len(header_bytes)))
+            cache_file.write(header_bytes)
+            for frame_pixels in pixels:
+                cache_file.write(frame_pixels)
+        os.replace(temp_path, cache_path)
+
+    @classmethod
+    def __read_header(cls, cache_file):
+        """Read the JSON header at the start of an open cache file"""
+        header_size, = cls.HEADER_SIZE.unpack(cache_file.read(cls.HEADER_SIZE.size))
+        return json.loads(cache_file.read(header_size))
+
+    @classmethod
+    def is_valid(cls, base_path, state, width, height, sources):
+        """
+        Check if cached scaled frames exist and are still valid, reading only the header.
+
+        Args:
+            base_path: Path to animation folder
+            state: Name of the animation state
+            width: Target frame width
+            height: Target frame height
+            sources: Paths of the source files, PNG frames in frame order first
+
+        Returns:
+            bool: True if load() would hit
+        """
+        if not cls.enabled:
+            return False
+
+        try:
+            with open(cls.__cache_path(base_path, state, width, height), 'rb') as cache_file:
+                header = cls.__read_header(cache_file)
+            return header['version'] == cls.VERSION and cls.__check_sources(header['sources'], sources) is not None
+        except (OSError, ValueError, KeyError, struct.error):
+            return False
+
+    @classmethod
+    def load(cls, base_path, state, width, height, sources):
+        """
+        Load cached scaled frames if they are still valid.
+
+        Sources whose mtime changed but whose contents did not (touched or
+        checked out again) get their new mtime written back, so they are
+        not hashed again on the next load.
+
+        Args:
+            base_path: Path to animation folder
+            state: Name of the animation state
+            width: Target frame width
+            height: Target frame height
+            sources: Paths of the source files, PNG frames in frame order first
+
+        Returns:
+            list: Scaled frames, or None on a cache miss
+        """
+        if not cls.enabled:
+            return None
+
+        cache_path = cls.__cache_path(base_path, state, width, height)
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                header = cls.__read_header(cache_file)
+                if header['version'] != cls.VERSION:
+                    return None
+                current = cls.__check_sources(header['sources'], sources)
+                if current is None:
+                    return None
+
+                frames = []
+                pixels = []
+                for frame_width, frame_height in header['frames']:
+                    frame_pixels = cache_file.read(frame_width * frame_height * 4)
+                    frame = pygame.image.frombytes(frame_pixels, (frame_width, frame_height), cls.PIXEL_FORMAT)
+                    if pygame.display.get_surface() is not None:
+                        frame = frame.convert_alpha()
+                    frames.append(frame)
+                    pixels.append(frame_pixels)
+        except (OSError, ValueError, KeyError, struct.error, pygame.error):
+            return None
+
+        if current != header['sources']:
+            header['sources'] = current
+            try:
+                cls.__write(cache_path, header, pixels)
+            except OSError as e:
+                print(f"Error updating frame cache for {state} in {base_path}: {e}")
+        return frames
+
+    @classmethod
+    def store(cls, base_path, state, width, height, sources, frames):
+        """
+        Write scaled frames to the cache.
+
+        Args:
+            base_path: Path to animation folder
+            state: Name of the animation state
+            width: Target frame width
+            height: Target frame height
+            sources: Paths of the files the frames were made from, PNG frames in frame order first
+            frames: The scaled frames to store
+        """
+        if not cls.enabled:
+            return
+
+        try:
+            header = {
+                'version': cls.VERSION,
+                'sources': [[os.path.normpath(path), os.path.getmtime(path), cls.__file_hash(path)]
+                            for path in sources],
+                'frames': [list(frame.get_size()) for frame in frames]
+            }
+            cls.__write(cls.__cache_path(base_path, state, width, height), header,
+                        [pygame.image.tobytes(frame, cls.PIXEL_FORMAT) for frame in frames])
+        except (OSError, pygame.error) as e:
+            print(f"Error writing frame cache for {state} in {base_path}: {e}")
+
+    @classmethod
+    def clear(cls):
+        """Delete every cached frame file."""
+        shutil.rmtree(cls.CACHE_DIR, ignore_errors=True)
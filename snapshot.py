@@ -0,0 +1,187 @@
+import io
+import itertools
+import pickle
+import struct
+import types
+import pygame
+from timer import Timer
+from animation import Animation
+from projectile import Projectile
+from knife import Knife
+
+class WorldPickler(pickle.Pickler):
+    """
+    Pickler for the entities of one game.
+
+    The game and its sprite groups are saved by name and resolved against the
+    game the world is restored into. Surfaces are saved by size only: every
+    entity redraws its image on the next step, and animation frames come
+    from the shared frame cache.
+    """
+    def __init__(self, file, game):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.game = game
+        self.group_names = {id(group): name for name, group in game.groups.items()}
+
+    def persistent_id(self, obj):
+        if obj is self.game:
+            return ('game',)
+        if isinstance(obj, pygame.Surface):
+            alpha = bool(obj.get_flags() & pygame.SRCALPHA)
+            return ('surface', id(obj), obj.get_size(), alpha)
+        if isinstance(obj, pygame.sprite.AbstractGroup) and id(obj) in self.group_names:
+            return ('group', self.group_names[id(obj)])
+        return None
+
+    def reducer_override(self, obj):
+        # Bound methods pickle by name, and private names must be mangled to be found again
+        if isinstance(obj, types.MethodType):
+            name = obj.__func__.__name__
+            if name.startswith('__') and not name.endswith('__'):
+                owner = obj.__func__.__qualname__.rsplit('.', 2)[-2]
+                name = f"_{owner.lstrip('_')}{name}"
+            return getattr, (obj.__self__, name)
+        return NotImplemented
+
+class WorldUnpickler(pickle.Unpickler):
+    """Unpickler resolving what WorldPickler saved by name against a live game"""
+    def __init__(self, file, game):
+        super().__init__(file)
+        self.game = game
+        self.surfaces = {}  # Saved surface id -> blank surface, so shared surfaces stay shared
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == 'game':
+            return self.game
+        if kind == 'surface':
+            _, key, size, alpha = pid
+            surface = self.surfaces.get(key)
+            if surface is None:
+                surface = self.surfaces[key] = pygame.Surface(size, pygame.SRCALPHA if alpha else 0)
+            return surface
+        if kind == 'group':
+            return self.game.groups[pid[1]]
+        raise pickle.UnpicklingError(f"Unknown persistent id: {pid}")
+
+class WorldSnapshot:
+    """
+    The full state of a playing session: player, knife and deflection
+    batches, enemies with their AI state and timers, projectiles, sparks,
+    the game's timers, score and random streams.
+
+    A snapshot is a header holding the shared clock followed by a pickle of
+    the world. Restoring replaces the game's world and moves Timer.clock to
+    the saved time, so simulation continues exactly where it was captured
+    given the same input. UI, menus, sounds and the input state are not part
+    of the world.
+    """
+    MAGIC = b'DFWS'
+    VERSION = 1
+    HEADER = struct.Struct('<4sBd')  # magic, version, clock
+
+    # Game attributes, timers and sprite groups that make up the world
+    ATTRIBUTES = ('seed', 'session_number', 'rng', 'score', 'game_over', 'enemies_killed',
+                  'elapsed_time', 'shake_intensity', 'camera_offset', 'player')
+    TIMERS = ('game_over_timer', 'freeze_timer', 'shake_timer', 'player_stats_timer',
+              'elapsed_timer', 'spawn_timer')
+    GROUPS = ('all', 'enemies', 'bullets', 'players', 'sparks')
+
+    # Attributes holding the animations of entities and health bars, released when they are dropped
+    ANIMATIONS = ('_anim', 'weapon_anim', 'bg_anim', 'fg_anim')
+
+    def __init__(self, data):
+        """
+        Args:
+            data: Snapshot bytes, as written by save()
+        """
+        self.data = data
+
+    @classmethod
+    def capture(cls, game):
+        """
+        Capture the world of a game.
+
+        Args:
+            game: The game, playing a session
+
+        Returns:
+            WorldSnapshot: The snapshot
+        """
+        next_deflect_id = next(Knife.DEFLECT_IDS)
+        Knife.DEFLECT_IDS = itertools.count(next_deflect_id)
+        world = {
+            'tick': Projectile.tick,
+            'next_deflect_id': next_deflect_id,
+            'attributes': {name: getattr(game, name) for name in cls.ATTRIBUTES},
+            'timers': {name: getattr(game, name) for name in cls.TIMERS},
+            'projectiles': list(Projectile.store.projectiles),  # In slot order
+            'groups': {name: game.groups[name].sprites() for name in cls.GROUPS},
+        }
+
+        buffer = io.BytesIO()
+        buffer.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, Timer.clock))
+        WorldPickler(buffer, game).dump(world)
+        return cls(buffer.getvalue())
+
+    def restore(self, game):
+        """
+        Replace the world of a game with this snapshot's.
+
+        Args:
+            game: The game to restore into
+
+        Raises:
+            ValueError: If the data is not a snapshot of a supported version
+        """
+        if len(self.data) < self.HEADER.size:
+            raise ValueError("Not a world snapshot")
+        magic, version, clock = self.HEADER.unpack_from(self.data)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"Not a world snapshot of version {self.VERSION}")
+
+        # Drop the current world, the timers of its entities and their references to shared frames
+        old_entities = set(game.groups['all']) | set(game.groups['sparks'])
+        for timer in list(Timer.all_timers):
+            if timer.owner in old_entities:
+                timer.destroy()
+        for sprite in old_entities | set(game.groups['ui']):
+            for name in self.ANIMATIONS:
+                animation = getattr(sprite, name, None)
+                if isinstance(animation, Animation):
+                    animation.release()
+        Projectile.clear_all()
+        for name in self.GROUPS + ('ui', 'gameover'):
+            game.groups[name].empty()
+
+        # Timers are rescheduled on the clock as they are unpickled
+        Timer.set_clock(clock)
+        world = WorldUnpickler(io.BytesIO(self.data[self.HEADER.size:]), game).load()
+
+        Projectile.tick = world['tick']
+        for projectile in world['projectiles']:
+            projectile.attach()
+        for name, sprites in world['groups'].items():
+            game.groups[name].add(*sprites)
+        for name, value in world['attributes'].items():
+            setattr(game, name, value)
+        for name, timer in world['timers'].items():
+            getattr(game, name).destroy()
+            setattr(game, name, timer)
+        Knife.DEFLECT_IDS = itertools.count(world['next_deflect_id'])
+
+    def save(self, path):
+        """Write the snapshot to a file"""
+        with open(path, 'wb') as file:
+            file.write(self.data)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a snapshot written by save().
+
+        Returns:
+            WorldSnapshot: The snapshot
+        """
+        with open(path, 'rb') as file:
+            return cls(file.read())
@@ -6,27 +6,33 @@ class Sounds:
     """
     A singleton class for managing game sounds and music using pygame.mixer.
     Loads all sounds at initialization for efficient playback during gameplay.
+    
+    Set Sounds.enabled = False before the first Sounds() call to run without
+    a mixer (e.g. headless simulation); every call then becomes a no-op.
     """
     __instance = None
+    enabled = True
     
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
         """Ensure only one instance of Sounds exists (singleton pattern)"""
         if cls.__instance is None:
             cls.__instance = super(Sounds, cls).__new__(cls)
             cls.__instance.__initialized = False
         return cls.__instance
     
-    def __init__(self):
-        """Initialize the sound system if not already initialized"""
+    def __init__(self, load_sounds=True):
+        """Initialize the sound system if not already initialized
+        
+        Args:
+            load_sounds (bool): Whether to decode all sound effects now. Pass False
+                when the sounds are decoded elsewhere (e.g. by the AssetLoader) and
+                registered with add_sound().
+        """
         if self.__initialized:
             return
             
         self.__initialized = True
         
-        # Initialize pygame mixer with more channels
-        pg.mixer.init(frequency=44100, size=-16, channels=2, buffer=2048)
-        pg.mixer.set_num_channels(32)  # Increase number of channels
-        
         # Set default volumes
         self.music_volume = 0.5
         self.sound_volume = 0.50  # Changed from 100 to 0.5 (0-1 range)
@@ -38,26 +44,54 @@ class Sounds:
         # Create dictionaries to store loaded sounds
         self.sounds = {}
         self.music = {}
+        self.channels = []
+        self.channel_usage = {}  # Track which sounds are using which channels
+        
+        if not self.enabled:
+            return
+        
+        # Initialize pygame mixer with more channels
+        pg.mixer.init(frequency=44100, size=-16, channels=2, buffer=2048)
+        pg.mixer.set_num_channels(32)  # Increase number of channels
         
         # Channel management
         self.channels = [pg.mixer.Channel(i) for i in range(pg.mixer.get_num_channels())]
-        self.channel_usage = {}  # Track which sounds are using which channels
         
         # Make sure directories exist
         os.makedirs(self.sound_dir, exist_ok=True)
         os.makedirs(self.music_dir, exist_ok=True)
         
         # Load all sounds
-        self._load_all_sounds()
+        self._load_all_sounds(load_sounds)
     
-    def _load_all_sounds(self):
-        """Load all sound files from the sound and music directories"""
-        # Load sound effects
+    def sound_files(self):
+        """Get the sound effect files to load
+        
+        Returns:
+            dict: Sound name (filename without extension) to file path
+        """
+        files = {}
         for filename in os.listdir(self.sound_dir):
             if filename.endswith(('.wav', '.ogg', '.mp3')) and os.path.isfile(os.path.join(self.sound_dir, filename)):
-                name = os.path.splitext(filename)[0]
-                self.sounds[name] = pg.mixer.Sound(os.path.join(self.sound_dir, filename))
-                self.sounds[name].set_volume(self.sound_volume)
+                files[os.path.splitext(filename)[0]] = os.path.join(self.sound_dir, filename)
+        return files
+    
+    def add_sound(self, name, sound):
+        """Register an already decoded sound effect
+        
+        Args:
+            name (str): Name to assign to the sound
+            sound (pg.mixer.Sound): The decoded sound
+        """
+        self.sounds[name] = sound
+        self.sounds[name].set_volume(self.sound_volume)
+    
+    def _load_all_sounds(self, load_sounds=True):
+        """Load all sound files from the sound and music directories"""
+        # Load sound effects
+        if load_sounds:
+            for name, path in self.sound_files().items():
+                self.add_sound(name, pg.mixer.Sound(path))
         
         # Load music files (store the file paths)
         for filename in os.listdir(self.music_dir):
@@ -103,22 +137,25 @@ class Sounds:
             music_name (str): Name of the music track (filename without extension)
             loops (int): Number of times to loop (-1 for infinite)
         """
-        if music_name in self.music:
+        if self.enabled and music_name in self.music:
             pg.mixer.music.load(self.music[music_name])
             pg.mixer.music.set_volume(self.music_volume)
             pg.mixer.music.play(loops)
     
     def stop_music(self):
         """Stop currently playing music"""
-        pg.mixer.music.stop()
+        if self.enabled:
+            pg.mixer.music.stop()
     
     def pause_music(self):
         """Pause currently playing music"""
-        pg.mixer.music.pause()
+        if self.enabled:
+            pg.mixer.music.pause()
     
     def unpause_music(self):
         """Unpause currently playing music"""
-        pg.mixer.music.unpause()
+        if self.enabled:
+            pg.mixer.music.unpause()
     
     def fade_out_music(self, time_ms=1000):
         """Fade out the music over the specified time
@@ -126,7 +163,8 @@ class Sounds:
         Args:
             time_ms (int): Fade out time in milliseconds
         """
-        pg.mixer.music.fadeout(time_ms)
+        if self.enabled:
+            pg.mixer.music.fadeout(time_ms)
     
     def set_music_volume(self, volume):
         """Set music volume
@@ -135,7 +173,8 @@ class Sounds:
             volume (float): Volume from 0.0 to 1.0
         """
         self.music_volume = max(0.0, min(1.0, volume))
-        pg.mixer.music.set_volume(self.music_volume)
+        if self.enabled:
+            pg.mixer.music.set_volume(self.music_volume)
     
     def set_sound_volume(self, volume):
         """Set volume for all sound effects
@@ -186,7 +225,7 @@ class Sounds:
             name (str): Name to assign to the sound
             file_path (str): Path to the sound file
         """
-        if os.path.exists(file_path):
+        if self.enabled and os.path.exists(file_path):
             self.sounds[name] = pg.mixer.Sound(file_path)
             self.sounds[name].set_volume(self.sound_volume)
     
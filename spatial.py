@@ -0,0 +1,105 @@
+import math
+import numpy as np
+
+class SpatialHash:
+    """
+    A uniform grid bucketing items by the cell their position falls in.
+
+    build() sorts all items by cell in a few vectorized passes; query()
+    then returns the items of the cells overlapping a box, so a collision
+    check only visits items near its collider instead of all of them.
+    Results are a superset of the items inside the box: callers still test
+    exact distances.
+
+    The grid covers a fixed area plus one ring of border cells; items
+    beyond the area are kept in the nearest border cell.
+    """
+    CELL_SIZE = 128  # Pixels per cell side, about the size of the largest collider
+
+    def __init__(self, width, height, cell_size=CELL_SIZE):
+        """
+        Args:
+            width: Width of the covered area in pixels
+            height: Height of the covered area in pixels
+            cell_size: Side of a grid cell in pixels
+        """
+        self.cell_size = cell_size
+        self.columns = math.ceil(width / cell_size) + 2
+        self.rows = math.ceil(height / cell_size) + 2
+        self.items = []                                       # The items, as passed to build()
+        self.order = []                                       # Item indices sorted by cell, column by column
+        self.offsets = [0] * (self.columns * self.rows + 1)   # Start of each cell in order
+
+    def build(self, positions, items, indices=None):
+        """
+        Bucket items by position, replacing the previous contents.
+
+        Args:
+            positions: (n, 2) NumPy array of item positions
+            items: Sequence of the n items, kept as is (not copied)
+            indices: Optional NumPy array of the indices of the items to bucket (default all)
+        """
+        self.items = items
+        cell_count = self.columns * self.rows
+        if indices is None:
+            indices = np.arange(len(self.items))
+        if len(indices) == 0:
+            self.order = []
+            self.offsets = [0] * (cell_count + 1)
+            return
+
+        cells = np.floor(positions[indices] * (1 / self.cell_size)).astype(np.int64) + 1
+        np.maximum(cells, 0, out=cells)
+        np.minimum(cells, (self.columns - 1, self.rows - 1), out=cells)
+        keys = cells[:, 0] * self.rows + cells[:, 1]
+
+        # Few cells, so the keys fit 16 bits and sort with a radix sort
+        if cell_count <= np.iinfo(np.int16).max:
+            keys = keys.astype(np.int16)
+        self.order = indices[np.argsort(keys, kind='stable')].tolist()
+        offsets = np.zeros(cell_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=cell_count), out=offsets[1:])
+        self.offsets = offsets.tolist()
+
+    def query(self, x0, y0, x1, y1):
+        """
+        Get the items in every cell overlapping a box.
+
+        Args:
+            x0, y0: Top-left corner of the box
+            x1, y1: Bottom-right corner of the box
+
+        Returns:
+            list: The items, in no particular order
+        """
+        scale = 1 / self.cell_size
+        first_column = min(max(math.floor(x0 * scale) + 1, 0), self.columns - 1)
+        last_column = min(max(math.floor(x1 * scale) + 1, 0), self.columns - 1)
+        first_row = min(max(math.floor(y0 * scale) + 1, 0), self.rows - 1)
+        last_row = min(max(math.floor(y1 * scale) + 1, 0), self.rows - 1)
+
+        # The rows of one column are contiguous in order
+        items = self.items
+        order = self.order
+        offsets = self.offsets
+        found = []
+        for column in range(first_column, last_column + 1):
+            base = column * self.rows
+            start, end = offsets[base + first_row], offsets[base + last_row + 1]
+            if start != end:
+                found.extend([items[index] for index in order[start:end]])
+        return found
+
+    def query_radius(self, center, radius):
+        """
+        Get the items in every cell overlapping the square around a circle.
+
+        Args:
+            center: (x, y) center of the circle
+            radius: Radius of the circle
+
+        Returns:
+            list: The items, in no particular order
+        """
+        x, y = center[0], center[1]
+        return self.query(x - radius, y - radius, x + radius, y + radius)
@@ -1,21 +1,41 @@
 import csv
 import os
 from datetime import datetime
-import tkinter as tk
-from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import seaborn as sns
 from config import Config as C
-import pandas as pd
+
+# Analysis and charting libraries, imported by _import_charting() on first use
+pd = plt = sns = tk = ttk = FigureCanvasTkAgg = None
+
+def _import_charting():
+    """Import the analysis and charting libraries into this module, once"""
+    global pd, plt, sns, tk, ttk, FigureCanvasTkAgg
+    if pd is not None:
+        return
+    import pandas as pd
+    import matplotlib
+    matplotlib.use('Agg')  # Use Agg backend to avoid threading issues
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    import seaborn as sns
+    import tkinter as tk
+    import tkinter.font
+    from tkinter import ttk
 
 class Stats:
     """
     A singleton class for recording game statistics to CSV files.
     Manages creating, recording, and deleting statistics for different game aspects.
     All statistics are stored in separate CSV files within the /stats/ directory.
+    
+    The analysis and charting libraries (pandas, matplotlib, seaborn, tkinter)
+    are imported by _import_charting() the first time stats are analysed, so
+    recording stats during play never pays for importing them.
+    
+    Set Stats.enabled = False to drop recorded rows instead of writing them
+    (e.g. headless simulation).
     """
     __instance = None
+    enabled = True
     
     # Define CSV file paths with their column headers
     CSV_CONFIGS = {
@@ -101,6 +121,8 @@ class Stats:
     
     def preprocess_stats_data(self):
         """Pre-process all statistics data to avoid lag when creating charts"""
+        _import_charting()
+        
         self.processed_data = {}
         
         # Process dodge attack data
@@ -176,6 +198,9 @@ class Stats:
         if stat_type not in self.CSV_CONFIGS:
             raise ValueError(f"Unknown stat type: {stat_type}. Available types: {list(self.CSV_CONFIGS.keys())}")
         
+        if not self.enabled:
+            return
+        
         # Get file path and headers
         config = self.CSV_CONFIGS[stat_type]
         file_path = os.path.join(self.stats_dir, config['file'])
@@ -292,8 +317,7 @@ class Stats:
         Args:
             on_close_callback: Function to call when the window is closed
         """
-        import matplotlib
-        matplotlib.use('Agg')  # Use Agg backend to avoid threading issues
+        _import_charting()
         
         # Make sure we have data
         if not hasattr(self, 'processed_data') or not self.processed_data:
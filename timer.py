@@ -1,124 +1,165 @@
+import heapq
+import itertools
+import weakref
+
 class Timer:
     """
     A versatile timer class with built-in class-level management.
-    
+
     Handles timer scenarios like cooldowns, periodic events, and delayed actions.
     By default, timers count down from duration to 0.
     Can also be set to count up mode for elapsed time tracking.
+
+    Timers do not tick individually. update_all() advances one shared clock
+    and a running countdown timer only stores its deadline on that clock,
+    kept in a heap; each frame only pops the timers that are due, so the
+    cost of a frame depends on the timers completing, not on how many exist.
+    Timers hold their owner weakly and are dropped once the owner is gone.
+    Pickled timers keep their current value and are rescheduled on the
+    clock they are unpickled against.
     """
-    # Class attribute to store all timer instances
-    all_timers = []
-    
+    # Class attributes to store all timer instances and the shared clock
+    all_timers = weakref.WeakSet()
+    clock = 0.0                 # Seconds advanced by update_all()
+    EPSILON = 1e-9              # Tolerance so durations that are whole steps complete on time
+    __heap = []                 # (deadline, sequence, timer, generation) of running countdowns
+    __sequence = itertools.count()
+
     # Timer modes
     MODE_COUNTDOWN = 0  # Default mode: count down from duration to 0
     MODE_COUNTUP = 1    # Count up from 0 indefinitely
-    
+
     def __init__(self, duration, auto_reset=False, paused=False, owner=None, mode=MODE_COUNTDOWN):
         """
         Initialize a timer with configurable behavior.
-        
+
         Args:
             duration: Time duration in seconds
             auto_reset: Whether the timer should automatically restart when complete
             paused: Whether the timer starts paused
-            owner: Object that owns this timer (e.g., enemy or player instance)
+            owner: Object that owns this timer (e.g., enemy or player instance), held weakly
             mode: Timer mode (MODE_COUNTDOWN or MODE_COUNTUP)
         """
         self.duration = duration                # Time in seconds
-        self.__current = 0 if mode == Timer.MODE_COUNTUP else duration  # Start from 0 for count up mode
         self.__auto_reset = auto_reset
         self.__paused = paused
-        self.__owner = owner
+        self.__owner = weakref.ref(owner) if owner is not None else None
         self.__mode = mode
+        self.__destroyed = False
         self.completed = False                    # Tracks if timer has completed
         self.__just_completed = False             # Flag to track if timer just completed ONCE
-        
-        # Register this timer in the class-level list
-        Timer.all_timers.append(self)
-        
-    def update(self, dt):
-        """
-        Update the timer state.
-        
-        Args:
-            dt: Delta time in seconds
-            
-        Returns:
-            bool: True if timer just completed, False otherwise
-        """
-        
-        if self.__paused:
-            return False
-            
-        if self.__mode == Timer.MODE_COUNTDOWN:
-            # COUNTDOWN MODE
-            if self.duration <= 0:
-                return False
-                
-            # Store previous value to detect completion
-            prev_value = self.__current
-                
-            # Count down
-            self.__current = max(0, self.__current - dt)
-            
-            # Check if timer just completed
-            if prev_value > 0 and self.__current == 0:
-                self.completed = True
-                self.__just_completed = True
-                
-                # Handle auto-reset
-                if self.__auto_reset:
-                    self.__current = self.duration
-                    
-                return True  # Timer just completed
-        
-        elif self.__mode == Timer.MODE_COUNTUP:
-            # COUNTUP MODE - simply add time
-            self.__current += dt
-            # No completion concept for count-up timers
-            
-        return False
-    
+
+        # Current value is either stored (paused/finished) or derived from the clock
+        self.__current = 0
+        self.__deadline = None                    # Clock time a running countdown reaches 0
+        self.__started_at = None                  # Clock time a running count-up was at 0
+        self.__generation = 0                     # Invalidates stale heap entries
+        self.__set_current(0 if mode == Timer.MODE_COUNTUP else duration)  # Start from 0 for count up mode
+
+        # Register this timer in the class-level registry
+        Timer.all_timers.add(self)
+
+    def __getstate__(self):
+        """State for pickling: the owner held strongly and the current value stored, not scheduled"""
+        state = self.__dict__.copy()
+        state['_Timer__owner'] = self.owner
+        state['_Timer__current'] = self.__get_current()
+        state['_Timer__deadline'] = None
+        state['_Timer__started_at'] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restore a pickled timer, scheduling it on the current clock and registering it"""
+        self.__dict__.update(state)
+        owner = self.__owner
+        self.__owner = weakref.ref(owner) if owner is not None else None
+        self.__set_current(self.__current)
+        if not self.__destroyed:
+            Timer.all_timers.add(self)
+
+    def __get_current(self):
+        """Current value: time left for countdown, time elapsed for count-up"""
+        if self.__deadline is not None:
+            return max(0, self.__deadline - Timer.clock)
+        if self.__started_at is not None:
+            return Timer.clock - self.__started_at
+        return self.__current
+
+    def __set_current(self, value):
+        """Set the current value, scheduling the timer on the clock if it is running"""
+        self.__generation += 1
+        self.__deadline = None
+        self.__started_at = None
+        self.__current = value
+
+        if self.__paused or self.__destroyed:
+            return
+
+        if self.__mode == Timer.MODE_COUNTUP:
+            self.__started_at = Timer.clock - value
+        elif self.duration > 0 and value > 0:
+            self.__deadline = Timer.clock + value
+            heapq.heappush(Timer.__heap, (self.__deadline, next(Timer.__sequence), self, self.__generation))
+
+    def __complete(self):
+        """Handle reaching 0 on a countdown"""
+        self.completed = True
+        self.__just_completed = True
+
+        # Handle auto-reset
+        self.__set_current(self.duration if self.__auto_reset else 0)
+
     def reset(self, duration=None):
         """Reset the timer to its initial state (duration for countdown, 0 for countup)."""
         if duration is not None:
             self.duration = duration
-        self.__current = 0 if self.__mode == Timer.MODE_COUNTUP else self.duration
+        self.__set_current(0 if self.__mode == Timer.MODE_COUNTUP else self.duration)
         return self
-    
+
     def start(self, duration=None):
         """Start or restart the timer."""
         self.__paused = False
         if duration is not None:
             self.duration = duration
-        self.__current = 0 if self.__mode == Timer.MODE_COUNTUP else self.duration
+        self.__set_current(0 if self.__mode == Timer.MODE_COUNTUP else self.duration)
         return self
-    
+
     def stop(self):
         """Stop and reset the timer."""
         self.__paused = True
         self.reset()
         return self
-    
+
     def pause(self):
         """Pause the timer without resetting."""
+        current = self.__get_current()
         self.__paused = True
+        self.__set_current(current)
         return self
-    
+
     def resume(self):
         """Resume a paused timer."""
+        current = self.__get_current()
         self.__paused = False
+        self.__set_current(current)
         return self
-        
+
     def destroy(self):
-        """Remove this timer from the global list."""
-        if self in Timer.all_timers:
-            Timer.all_timers.remove(self)
+        """Remove this timer from the registry; it stops counting for good."""
+        current = self.__get_current()
+        self.__destroyed = True
+        self.__set_current(current)
+        Timer.all_timers.discard(self)
 
     @property
     def owner(self):
-        """Get the owner"""
-        return self.__owner
+        """Get the owner (None if it no longer exists)"""
+        return self.__owner() if self.__owner is not None else None
+
+    @property
+    def owner_released(self):
+        """Check if the timer had an owner that no longer exists"""
+        return self.__owner is not None and self.__owner() is None
 
     @property
     def mode(self):
@@ -129,16 +170,16 @@ class Timer:
     def remaining(self):
         """Get remaining time (only relevant for countdown timers)."""
         if self.__mode == Timer.MODE_COUNTDOWN:
-            return self.__current
+            return self.__get_current()
         return 0  # No concept of remaining time for count-up timers
-    
+
     @property
     def elapsed(self):
         """Get elapsed time."""
         if self.__mode == Timer.MODE_COUNTUP:
-            return self.__current  # For count-up, current value is the elapsed time
-        return self.duration - self.__current  # For countdown, elapsed is duration minus current
-    
+            return self.__get_current()  # For count-up, current value is the elapsed time
+        return self.duration - self.__get_current()  # For countdown, elapsed is duration minus current
+
     @property
     def progress(self):
         """Get the timer's progress as a value from 0.0 to 1.0."""
@@ -147,13 +188,13 @@ class Timer:
             # Return 0 if no duration specified, otherwise calculate progress
             if self.duration <= 0:
                 return 0.0
-            return min(1.0, self.__current / self.duration)
+            return min(1.0, self.__get_current() / self.duration)
         else:
             # Countdown timer progress
             if self.duration <= 0:
                 return 1.0
-            return 1.0 - (self.__current / self.duration)
-    
+            return 1.0 - (self.__get_current() / self.duration)
+
     @property
     def is_active(self):
         """Check if the timer is active (not paused and not complete)."""
@@ -171,8 +212,8 @@ class Timer:
         """Check if the timer has completed (only relevant for countdown timers)."""
         if self.__mode == Timer.MODE_COUNTUP:
             return False  # Count-up timers never complete
-        return self.__current == 0
-    
+        return self.__get_current() == 0
+
     @property
     def just_completed(self):
         """just like is_completed() but only trigger once."""
@@ -183,21 +224,60 @@ class Timer:
     # Class methods to manage all timers
     @classmethod
     def update_all(cls, dt):
-        """Update all timer instances."""
+        """
+        Advance the shared clock and complete every timer that is due.
+
+        Timers whose owner no longer exists are destroyed instead.
+
+        Returns:
+            list: Timers that completed during this update
+        """
+        cls.clock += dt
         completed_timers = []
-        for timer in cls.all_timers:
-            if timer.update(dt):
-                completed_timers.append(timer)
+        heap = cls.__heap
+        while heap and heap[0][0] <= cls.clock + cls.EPSILON:
+            _, _, timer, generation = heapq.heappop(heap)
+            if generation != timer.__generation:
+                continue  # Paused, restarted or stopped since it was scheduled
+            if timer.owner_released:
+                timer.destroy()
+                continue
+            timer.__complete()
+            completed_timers.append(timer)
         return completed_timers
-    
+
+    @classmethod
+    def set_clock(cls, value):
+        """
+        Move the shared clock, keeping the remaining time of every running timer.
+
+        Args:
+            value: New clock time in seconds
+        """
+        delta = value - cls.clock
+        cls.clock = value
+        heap = cls.__heap
+        heap[:] = [(deadline + delta, sequence, timer, generation) for deadline, sequence, timer, generation in heap]
+        heapq.heapify(heap)
+        for timer in list(cls.all_timers):
+            if timer.__deadline is not None:
+                timer.__deadline += delta
+            if timer.__started_at is not None:
+                timer.__started_at += delta
+
+    @classmethod
+    def scheduled_count(cls):
+        """Number of heap entries, including stale ones not yet popped"""
+        return len(cls.__heap)
+
     @classmethod
     def remove_owner_timers(cls, owner):
         """Remove all timers belonging to a specific owner."""
         for timer in list(cls.all_timers):
-            if timer.owner == owner:
-                cls.all_timers.remove(timer)
-    
+            if timer.owner is owner:
+                timer.destroy()
+
     @classmethod
     def get_by_owner(cls, owner):
         """Get all timers belonging to a specific owner."""
-        return [timer for timer in cls.all_timers if timer.owner == owner]
+        return [timer for timer in list(cls.all_timers) if timer.owner is owner]
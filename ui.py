@@ -5,6 +5,7 @@ import math
 from config import Config as C
 from timer import Timer
 from sounds import Sounds
+from fonts import Fonts
 
 class UI(pygame.sprite.Sprite):
     def __init__(self, position: Vector2, width: int, height: int):
@@ -22,11 +23,15 @@ class UI(pygame.sprite.Sprite):
         self.active = True
 
 class TextDisplay(UI):
-    """UI element that displays dynamic text with a value that can change over time"""
+    """UI element that displays dynamic text with a value that can change over time
+    
+    With glyphs=True the prefix, digits and colons are composed from a
+    pre-rendered glyph atlas instead of rendering the whole string on every change.
+    """
     def __init__(self, position: Vector2, width: int, height: int, 
                  text_prefix: str, value_getter: callable, 
                  font_path: str = None, font_size: int = 24,
-                 color=(255, 255, 255), align="left"):
+                 color=(255, 255, 255), align="left", glyphs=False):
         super().__init__(position, width, height)
         
         # Text attributes
@@ -35,12 +40,11 @@ class TextDisplay(UI):
         self.color = color
         self.align = align
         
-        # Load font
-        try:
-            self.font = pygame.font.Font(font_path, font_size)
-        except:
-            # Fallback to default font
-            self.font = pygame.font.Font(None, font_size)
+        # Font is shared through the font registry
+        self.font_path = font_path
+        self.font_size = font_size
+        self.font = Fonts.get(font_path, font_size)
+        self.glyph_atlas = Fonts.glyph_atlas(font_path, font_size, color, labels=(text_prefix,)) if glyphs else None
         
         # Setup initial render
         self.last_value = None
@@ -58,22 +62,27 @@ class TextDisplay(UI):
             # Clear the surface
             self.image.fill((0, 0, 0, 0))
             
+            # Compose from cached glyphs when every character has one
+            tokens = [self.text_prefix] + list(str(current_value))
+            if self.glyph_atlas and self.glyph_atlas.supports(tokens):
+                self.glyph_atlas.draw(self.image, self.__text_position(self.glyph_atlas.measure(tokens),
+                                                                       self.glyph_atlas.height), tokens)
+                return
+            
             # Render text
             full_text = f"{self.text_prefix}{current_value}"
-            text_surface = self.font.render(full_text, True, self.color)
-            
-            # Position text based on alignment
-            if self.align == "left":
-                text_pos = (0, self.height // 2 - text_surface.get_height() // 2)
-            elif self.align == "center":
-                text_pos = (self.width // 2 - text_surface.get_width() // 2, 
-                           self.height // 2 - text_surface.get_height() // 2)
-            elif self.align == "right":
-                text_pos = (self.width - text_surface.get_width(), 
-                           self.height // 2 - text_surface.get_height() // 2)
+            text_surface = Fonts.render(self.font_path, self.font_size, full_text, self.color)
             
             # Draw text
-            self.image.blit(text_surface, text_pos)
+            self.image.blit(text_surface, self.__text_position(text_surface.get_width(), text_surface.get_height()))
+    
+    def __text_position(self, text_width, text_height):
+        """Top-left position of text of the given size based on alignment"""
+        if self.align == "center":
+            return (self.width // 2 - text_width // 2, self.height // 2 - text_height // 2)
+        elif self.align == "right":
+            return (self.width - text_width, self.height // 2 - text_height // 2)
+        return (0, self.height // 2 - text_height // 2)
     
     def update(self):
         """Update the text display"""
@@ -84,22 +93,25 @@ class TextDisplay(UI):
         self.render()
 
 class HealthBar(UI):
+    ANIMATION = {
+        'path': 'sprites/ui_healthbar',
+        'loops': {
+            "empty": True,
+            "full": True
+        },
+        'speed': 0
+    }
+
     def __init__(self, position: Vector2, width: int, height: int, target=None):
         super().__init__(position, width, height)
         self.target = target  # Reference to the entity whose health we're tracking
         
-        # Animation states for both layers
-        animation_states = {
-            "empty": True,
-            "full": True
-        }
-        
         # Create background layer animation (empty bar)
-        self.bg_anim = Animation(self, "sprites/ui_healthbar", animation_states, animation_speed=0)
+        self.bg_anim = Animation(self, self.ANIMATION['path'], self.ANIMATION['loops'], animation_speed=self.ANIMATION['speed'])
         self.bg_anim.change_state("empty")
         
         # Create foreground layer animation (full bar)
-        self.fg_anim = Animation(self, "sprites/ui_healthbar", animation_states, animation_speed=0)
+        self.fg_anim = Animation(self, self.ANIMATION['path'], self.ANIMATION['loops'], animation_speed=self.ANIMATION['speed'])
         self.fg_anim.change_state("full")
         
         # Create mask surface for health percentage
@@ -110,6 +122,11 @@ class HealthBar(UI):
         # Initial setup
         self.__update_health_mask()
     
+    @classmethod
+    def animation_specs(cls, width, height):
+        """Animations of a health bar of the given size as (base_path, states, width, height) tuples"""
+        return [(cls.ANIMATION['path'], cls.ANIMATION['loops'], width, height)]
+
     def __update_health_mask(self):
         """Update the mask surface based on current health percentage"""
         if not self.target:
@@ -161,6 +178,7 @@ class Button(UI):
     HOVER_DURATION = 0.20
     UNHOVER_DURATION = 0.25
     HOVER_SCALE = 1.1
+    FONT_PATH = "fonts/Jua-Regular.ttf"
     
     def __init__(self, position: Vector2, width: int, height: int, text: str, 
                  callback=None, idle_color=(200, 200, 200), hover_color=(255, 255, 255),
@@ -185,18 +203,8 @@ class Button(UI):
         self.hover_timer = Timer(duration=self.HOVER_DURATION, owner=self, paused=True)
         self.unhover_timer = Timer(duration=self.UNHOVER_DURATION, owner=self, paused=True)
         
-        # Initialize font - use cached font if possible
-        if not hasattr(Button, 'font_cache'):
-            Button.font_cache = {}
-        
-        if text_size not in Button.font_cache:
-            try:
-                Button.font_cache[text_size] = pygame.font.Font("fonts/Jua-Regular.ttf", text_size)
-            except FileNotFoundError:
-                # Fallback to default font if file not found
-                Button.font_cache[text_size] = pygame.font.Font(None, text_size)
-        
-        self.font = Button.font_cache[text_size]
+        # Font is shared through the font registry
+        self.font = Fonts.get(self.FONT_PATH, text_size)
         self.was_pressed = False
         
         # Initial render
@@ -241,7 +249,7 @@ class Button(UI):
                 for i in range(3)
             ]
             
-            # Render text and center it
+            # Render text and center it; the color changes every frame, so it is not worth caching
             text_surface = self.font.render(self.text, True, current_color)
             text_rect = text_surface.get_rect(center=(current_width // 2, current_height // 2))
             button_surface.blit(text_surface, text_rect)
@@ -263,7 +271,7 @@ class Button(UI):
                 pygame.draw.rect(self.image, self.bg_color, button_rect)
             
             # Render text and center it
-            text_surface = self.font.render(self.text, True, self.idle_color)
+            text_surface = Fonts.render(self.FONT_PATH, self.text_size, self.text, self.idle_color)
             text_rect = text_surface.get_rect(center=button_rect.center)
             self.image.blit(text_surface, text_rect)
             
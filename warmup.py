@@ -0,0 +1,71 @@
+from animation import FrameCache
+
+class Warmup:
+    """
+    Preloads the animations of every entity archetype ahead of its first spawn.
+
+    An archetype is a named list of (base_path, states, width, height)
+    animation specs, as returned by the animation_specs() classmethods of
+    the entity classes. step() warms one archetype per call so the work can
+    be spread over menu frames; run() finishes whatever is left.
+    """
+    def __init__(self, archetypes):
+        """
+        Args:
+            archetypes: Dictionary of archetype name to its animation specs
+        """
+        self.archetypes = archetypes
+        self.__pending = list(archetypes.keys())
+
+    @property
+    def done(self):
+        return not self.__pending
+
+    @property
+    def progress(self):
+        """Fraction of archetypes warmed, from 0.0 to 1.0"""
+        if not self.archetypes:
+            return 1.0
+        return 1 - len(self.__pending) / len(self.archetypes)
+
+    def step(self):
+        """
+        Warm the next pending archetype.
+
+        Returns:
+            str: Name of the archetype warmed, or None if all are done
+        """
+        if not self.__pending:
+            return None
+
+        name = self.__pending.pop(0)
+        for base_path, states, width, height in self.archetypes[name]:
+            for state in states:
+                FrameCache.preload(base_path, state, width, height)
+        return name
+
+    def run(self):
+        """Warm every pending archetype"""
+        while self.step() is not None:
+            pass
+
+    def is_resident(self, name):
+        """
+        Check if all frames of an archetype are loaded in the frame cache.
+
+        Args:
+            name: Archetype name
+
+        Returns:
+            bool: True if every animation state of the archetype is resident
+        """
+        return all(FrameCache.is_resident(base_path, state, width, height)
+                   for base_path, states, width, height in self.archetypes[name]
+                   for state in states)
+
+    def resident_archetypes(self):
+        """
+        Returns:
+            list: Names of the archetypes whose frames are all resident
+        """
+        return [name for name in self.archetypes if self.is_resident(name)]